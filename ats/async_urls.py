@@ -0,0 +1,32 @@
+from django.urls import path
+
+from ats.async_views import (
+    AsyncApplicationApprovalView,
+    AsyncApplicationListView,
+    AsyncApplicationNoteCreateView,
+    AsyncJobApplicationStatsView,
+)
+
+
+urlpatterns = [
+    path(
+        "applications/",
+        AsyncApplicationListView.as_view(),
+        name="async-application-list",
+    ),
+    path(
+        "applications/<int:pk>/approval/",
+        AsyncApplicationApprovalView.as_view(),
+        name="async-application-approval",
+    ),
+    path(
+        "applications/<int:pk>/notes/",
+        AsyncApplicationNoteCreateView.as_view(),
+        name="async-applicationnote-create",
+    ),
+    path(
+        "applications/stats/",
+        AsyncJobApplicationStatsView.as_view(),
+        name="async-application-stats",
+    ),
+]
@@ -0,0 +1,176 @@
+"""
+Native async versions of the application list, stats, approval and note
+endpoints, for ASGI deployments (see ats.async_urls).
+
+They keep the permissions and response bodies of the DRF views in ats.views,
+but authenticate, query and render without handing the whole request to a
+thread: reads use the async ORM, and only the transactional writes, which
+Django cannot run asynchronously yet, go through sync_to_async.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+
+from ats.authentication import CachedTokenAuthentication
+from ats.cache import aget_cached_stats
+from ats.filters import ApplicationFilterBackend
+from ats.models import Application, ApplicationNote
+from ats.permissions import (
+    IsApplicationViewer,
+    IsApplicationDecisionMaker,
+    IsApplicationNoteWriter,
+)
+from ats.renderers import FastJSONRenderer
+from ats.routers import replica_enabled
+from ats.serializers import ApplicationSerializer, ApplicationNoteSerializer
+from ats.views import ApplicationApprovalView, JobApplicationStatsAPIView
+
+
+class AsyncAPIView(View):
+    """
+    The parts of DRF's APIView these endpoints use: token authentication,
+    permission classes, request parsing and JSON error responses
+    """
+
+    authentication_class = CachedTokenAuthentication
+    permission_classes = []
+    renderer = FastJSONRenderer()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # Token authenticated, like every DRF APIView.
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        self.request = Request(
+            request,
+            parsers=[parser() for parser in api_settings.DEFAULT_PARSER_CLASSES],
+        )
+        try:
+            await self.initial(self.request)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), None)
+            else:
+                handler = None
+            if handler is None:
+                raise exceptions.MethodNotAllowed(request.method)
+            return await handler(self.request, *args, **kwargs)
+        except Exception as exc:
+            return self.handle_exception(exc)
+
+    async def initial(self, request):
+        self.authenticator = self.authentication_class()
+        user_auth = await self.authenticator.aauthenticate(request)
+        request.user, request.auth = user_auth or (AnonymousUser(), None)
+        for permission in self.get_permissions():
+            if not permission.has_permission(request, self):
+                if user_auth is None:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(getattr(permission, "message", None))
+
+    def get_permissions(self):
+        return [permission() for permission in self.permission_classes]
+
+    def handle_exception(self, exc):
+        if isinstance(
+            exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ):
+            exc.auth_header = self.authenticator.authenticate_header(self.request)
+        response = exception_handler(exc, {"view": self, "request": self.request})
+        if response is None:
+            raise exc
+        # Keep the WWW-Authenticate and Retry-After headers DRF adds, but not
+        # the default Content-Type of the unrendered Response.
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name != "Content-Type"
+        }
+        return self.render(response.data, response.status_code, headers)
+
+    def render(self, data, status=200, headers=None):
+        response = HttpResponse(
+            self.renderer.render(data),
+            status=status,
+            content_type=self.renderer.media_type,
+        )
+        for name, value in (headers or {}).items():
+            response[name] = value
+        return response
+
+
+class AsyncApplicationListView(AsyncAPIView):
+    permission_classes = [IsApplicationViewer]
+    queryset = Application.objects.all()
+    filter_backends = [ApplicationFilterBackend]
+    pagination_class = api_settings.DEFAULT_PAGINATION_CLASS
+    read_from_replica = True
+
+    async def get(self, request):
+        fieldset = ApplicationSerializer.get_fieldset(request.query_params)
+        queryset = ApplicationSerializer.setup_eager_loading(
+            self.queryset.all(), **fieldset
+        )
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(request, queryset, self)
+
+        paginator = self.pagination_class()
+        page_queryset = paginator.get_page_queryset(queryset, request, self)
+        # Iterating a queryset asynchronously runs its prefetches too.
+        page = paginator.set_page([application async for application in page_queryset])
+        serializer = ApplicationSerializer(page, many=True, **fieldset)
+        return self.render(paginator.get_paginated_response(serializer.data).data)
+
+
+class AsyncJobApplicationStatsView(AsyncAPIView):
+    read_from_replica = True
+
+    async def get(self, request):
+        timeout = settings.ATS_REPLICA_PIN_SECONDS if replica_enabled() else None
+        stats, hit = await aget_cached_stats(self.build_stats, timeout=timeout)
+        return self.render(stats, headers={"X-Cache": "HIT" if hit else "MISS"})
+
+    async def build_stats(self):
+        queryset = JobApplicationStatsAPIView.get_queryset()
+        return JobApplicationStatsAPIView.serialize_stats(
+            [row async for row in queryset]
+        )
+
+
+class AsyncApplicationApprovalView(AsyncAPIView):
+    permission_classes = [IsApplicationDecisionMaker]
+
+    async def patch(self, request, pk):
+        body, status = await sync_to_async(ApplicationApprovalView.decide)(
+            pk, request.data
+        )
+        return self.render(body, status=status)
+
+    put = patch
+
+
+class AsyncApplicationNoteCreateView(AsyncAPIView):
+    permission_classes = [IsApplicationNoteWriter]
+
+    async def post(self, request, pk):
+        serializer = ApplicationNoteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        if not await Application.objects.filter(pk=pk).aexists():
+            raise Http404
+
+        note = await ApplicationNote.objects.acreate(
+            created_by=request.user,
+            application_id=pk,
+            note=serializer.validated_data["note"],
+        )
+        return self.render(ApplicationNoteSerializer(note).data, status=201)
@@ -0,0 +1,165 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from ats.models import Application, ApplicationNote, Job, JobApplicationStats
+
+
+@pytest.fixture
+def auth_header(user):
+    return f"Token {Token.objects.create(user=user).key}"
+
+
+@pytest.fixture
+def token_client(api_client, auth_header):
+    api_client.credentials(HTTP_AUTHORIZATION=auth_header)
+    return api_client
+
+
+def asgi_request(method, url, auth_header=None, data=None):
+    """
+    Send one request through Django's ASGI handler
+    """
+    headers = {"Authorization": auth_header} if auth_header else {}
+    kwargs = {"content_type": "application/json"} if data is not None else {}
+
+    async def send():
+        client = AsyncClient()
+        return await getattr(client, method)(url, data=data, headers=headers, **kwargs)
+
+    return async_to_sync(send)()
+
+
+def test_async_list_matches_sync_list(token_client, auth_header, user, applicant):
+    jobs = [
+        Job.objects.create(title=f"Job {i}", description="", location="NYC")
+        for i in range(3)
+    ]
+    applications = [
+        Application.objects.create(applicant=applicant, job=job) for job in jobs
+    ]
+    ApplicationNote.objects.create(
+        created_by=user, application=applications[0], note="Strong portfolio"
+    )
+
+    sync_response = token_client.get(
+        reverse("application-create-list"), {"page_size": 2}
+    )
+    async_url = reverse("async-application-list")
+    response = asgi_request("get", f"{async_url}?page_size=2", auth_header)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "application/json"
+    page = response.json()
+    assert page["results"] == sync_response.json()["results"]
+    assert page["previous"] is None
+    assert async_url in page["next"]
+
+    response = token_client.get(page["next"])
+    assert [row["id"] for row in response.json()["results"]] == [applications[0].id]
+
+    response = token_client.get(async_url, {"fields": "id,job", "expand": "job"})
+    assert response.json()["results"][0] == {
+        "id": applications[2].id,
+        "job": page["results"][0]["job"],
+    }
+
+    response = token_client.get(async_url, {"status": "pending"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert set(response.json()) == {"status"}
+
+
+def test_async_views_require_authentication_and_permissions(
+    api_client, no_permission_user, application
+):
+    urls = [
+        ("get", reverse("async-application-list")),
+        ("patch", reverse("async-application-approval", kwargs={"pk": application.id})),
+        (
+            "post",
+            reverse("async-applicationnote-create", kwargs={"pk": application.id}),
+        ),
+    ]
+    for method, url in urls:
+        response = getattr(api_client, method)(url, {}, format="json")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response["WWW-Authenticate"] == "Token"
+
+    response = api_client.get(url, HTTP_AUTHORIZATION="Token invalid")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json() == {"detail": "Invalid token."}
+
+    token = Token.objects.create(user=no_permission_user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    for method, url in urls:
+        response = getattr(api_client, method)(url, {}, format="json")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert len(response.json()) == 1
+
+
+def test_async_stats_matches_sync_stats(token_client, auth_header, application):
+    expected = token_client.get(reverse("application-stats")).json()
+
+    url = reverse("async-application-stats")
+    response = asgi_request("get", url, auth_header)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == expected
+    assert response["X-Cache"] == "HIT"
+
+    application.update_status(Application.Status.APPROVED)
+    response = asgi_request("get", url, auth_header)
+    assert response["X-Cache"] == "MISS"
+    assert response.json()[0]["approved_applications"] == 1
+
+
+def test_async_approval_view(token_client, auth_header, application):
+    url = reverse("async-application-approval", kwargs={"pk": application.id})
+
+    response = asgi_request(
+        "patch", url, auth_header, {"status": Application.Status.APPROVED}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["Success"] == "Application status updated successfully."
+    application.refresh_from_db()
+    assert application.status == Application.Status.APPROVED
+    assert response.json()["version"] == application.version == 2
+
+    response = asgi_request(
+        "patch", url, auth_header, {"status": "rejected", "version": 1}
+    )
+    assert response.status_code == status.HTTP_409_CONFLICT
+    stats = JobApplicationStats.objects.get(job=application.job)
+    assert stats.approved_applications == 1
+    assert stats.submitted_applications == 0
+
+    response = token_client.patch(url, {"status": "invalid_status"}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"Error": "Invalid status provided."}
+
+    url = reverse("async-application-approval", kwargs={"pk": application.id + 1})
+    response = token_client.patch(url, {"status": "approved"}, format="json")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json() == {"detail": "Not found."}
+
+
+def test_async_note_create_view(token_client, auth_header, user, application):
+    url = reverse("async-applicationnote-create", kwargs={"pk": application.id})
+
+    response = asgi_request("post", url, auth_header, {"note": "Strong portfolio"})
+    assert response.status_code == status.HTTP_201_CREATED
+    assert json.loads(response.content) == {"note": "Strong portfolio"}
+    note = ApplicationNote.objects.get(application=application)
+    assert note.created_by_id == user.id
+
+    response = token_client.post(url, {}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"note": ["This field is required."]}
+
+    url = reverse("async-applicationnote-create", kwargs={"pk": application.id + 1})
+    response = token_client.post(url, {"note": "Missing"}, format="json")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,137 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries also expire after `ttl` seconds
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def evict(self, predicate):
+        """
+        Drop every entry whose value matches `predicate`
+        """
+        with self._lock:
+            for key in [k for k, (_, v) in self._entries.items() if predicate(v)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# token key -> (user, token, permission names). Per process: invalidation
+# signals only reach the process that made the change, so the TTL bounds how
+# long other workers may keep serving a stale entry.
+token_cache = TTLCache(
+    maxsize=settings.ATS_AUTH_CACHE_SIZE, ttl=settings.ATS_AUTH_CACHE_TTL
+)
+
+
+def evict_users(user_ids):
+    user_ids = set(user_ids)
+    token_cache.evict(lambda entry: entry[0].pk in user_ids)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that caches the user and their resolved permissions,
+    so a warm request pays no queries for authentication or has_perm checks
+    """
+
+    def authenticate(self, request):
+        key = self.get_key(request)
+        if key is None:
+            return None
+        return self.authenticate_credentials(key)
+
+    async def aauthenticate(self, request):
+        """
+        authenticate() for async views: a warm token costs no thread hop
+        """
+        key = self.get_key(request)
+        if key is None:
+            return None
+        entry = token_cache.get(key)
+        if entry is None:
+            return await sync_to_async(self.authenticate_credentials)(key)
+        return self.from_entry(entry)
+
+    def get_key(self, request):
+        # The header parsing of TokenAuthentication.authenticate().
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) == 1:
+            msg = _("Invalid token header. No credentials provided.")
+            raise exceptions.AuthenticationFailed(msg)
+        elif len(auth) > 2:
+            msg = _("Invalid token header. Token string should not contain spaces.")
+            raise exceptions.AuthenticationFailed(msg)
+
+        try:
+            return auth[1].decode()
+        except UnicodeError:
+            msg = _(
+                "Invalid token header. "
+                "Token string should not contain invalid characters."
+            )
+            raise exceptions.AuthenticationFailed(msg)
+
+    def authenticate_credentials(self, key):
+        entry = token_cache.get(key)
+        if entry is None:
+            user, token = super().authenticate_credentials(key)
+            entry = (user, token, frozenset(user.get_all_permissions()))
+            token_cache.set(key, entry)
+        return self.from_entry(entry)
+
+    def from_entry(self, entry):
+        user, token, permissions = entry
+        # Hand each request its own copy so per-request state (cached related
+        # objects, has_perm caches) never leaks between requests or threads.
+        user = copy.copy(user)
+        # ModelBackend resolves has_perm from this attribute when it is set.
+        user._perm_cache = set(permissions)
+        return user, token
@@ -0,0 +1,94 @@
+import pytest
+from django.contrib.auth.models import Group, Permission
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from ats.authentication import TTLCache
+
+
+@pytest.fixture
+def token(user):
+    return Token.objects.create(user=user)
+
+
+@pytest.fixture
+def token_client(api_client, token):
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return api_client
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    return response, len(context.captured_queries)
+
+
+def test_warm_cache_adds_no_auth_queries(token_client, application):
+    url = reverse("application-create-list")
+
+    response, cold_queries = count_queries(token_client, url)
+    assert response.status_code == status.HTTP_200_OK
+
+    response, warm_queries = count_queries(token_client, url)
+    assert response.status_code == status.HTTP_200_OK
+    # token + user (1) and user + group permissions (2) are served from cache
+    assert warm_queries == cold_queries - 3
+    # only the page and its notes prefetch remain
+    assert warm_queries == 2
+
+
+def test_revoked_permission_is_evicted(token_client, user, application):
+    url = reverse("application-create-list")
+    assert token_client.get(url).status_code == status.HTTP_200_OK
+
+    user.user_permissions.remove(Permission.objects.get(codename="view_application"))
+    assert token_client.get(url).status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_group_permission_change_is_evicted(token_client, no_permission_user, user):
+    group = Group.objects.create(name="viewers")
+    no_permission_user.groups.add(group)
+    token = Token.objects.create(user=no_permission_user)
+    token_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    url = reverse("application-create-list")
+    assert token_client.get(url).status_code == status.HTTP_403_FORBIDDEN
+
+    group.permissions.add(Permission.objects.get(codename="view_application"))
+    assert token_client.get(url).status_code == status.HTTP_200_OK
+
+
+def test_deactivated_user_is_evicted(token_client, user):
+    url = reverse("application-create-list")
+    assert token_client.get(url).status_code == status.HTTP_200_OK
+
+    user.is_active = False
+    user.save()
+    assert token_client.get(url).status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_deleted_token_is_evicted(token_client, token):
+    url = reverse("application-create-list")
+    assert token_client.get(url).status_code == status.HTTP_200_OK
+
+    token.delete()
+    assert token_client.get(url).status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_ttl_cache_expiry_and_lru(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("ats.authentication.time.monotonic", lambda: now[0])
+    cache = TTLCache(maxsize=2, ttl=10)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    now[0] += 10
+    assert cache.get("a") is None
+    assert len(cache) == 1
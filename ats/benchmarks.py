@@ -0,0 +1,546 @@
+import asyncio
+import statistics
+import time
+import tracemalloc
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import ThreadSensitiveContext, sync_to_async
+from django.contrib.auth.models import Permission
+from django.db import connection, connections
+from django.test import AsyncClient, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from ats.fastpath import default_timezone
+from ats.management.commands.archive_applications import archive_chunk
+from ats.models import Applicant, Application, ArchivedApplication, Job, User
+from ats.renderers import FastJSONRenderer
+from ats.seeding import seed_applications
+from ats.serializers import ApplicationSerializer
+
+BenchmarkContext = namedtuple(
+    "BenchmarkContext", ["user", "applicant", "jobs", "applicants", "application_ids"]
+)
+
+
+class Scenario(namedtuple("Scenario", ["url_name", "method", "build"])):
+    """
+    One request against one route. build(context, iteration) returns the
+    (url, data) to send and runs outside the measured window.
+    """
+
+    @property
+    def name(self):
+        return f"{self.method} {self.url_name}"
+
+
+def _fresh_job(title):
+    return Job.objects.create(title=title, description="", location="NYC")
+
+
+def _application_ids(context, iteration, count):
+    ids = context.application_ids
+    start = (iteration * count) % max(1, len(ids) - count)
+    return ids[start : start + count]
+
+
+def _archived_application(context):
+    """
+    (id, job id) of an archived application, archiving a job's worth of
+    applications on first use
+    """
+    archived = ArchivedApplication.objects.order_by("id").values_list("id", "job_id")
+    if not archived.exists():
+        job = _fresh_job("Benchmark archive")
+        job.status = Job.Status.CLOSED
+        job.save(update_fields=["status"])
+        Application.objects.bulk_create(
+            Application(applicant=applicant, job=job)
+            for applicant in context.applicants[:100]
+        )
+        archive_chunk(job.id, 1000)
+    return archived.first()
+
+
+SCENARIOS = [
+    Scenario(
+        "application-create-list",
+        "get",
+        lambda context, i: (reverse("application-create-list"), None),
+    ),
+    Scenario(
+        "application-create-list",
+        "post",
+        lambda context, i: (
+            reverse("application-create-list"),
+            {"job": _fresh_job(f"Benchmark create {i}").id},
+        ),
+    ),
+    Scenario(
+        "application-bulk-create",
+        "post",
+        lambda context, i: (
+            reverse("application-bulk-create"),
+            {
+                "applications": [
+                    {"applicant": applicant.id, "job": job.id}
+                    for job in [_fresh_job(f"Benchmark bulk create {i}")]
+                    for applicant in context.applicants[:100]
+                ]
+            },
+        ),
+    ),
+    Scenario(
+        "application-bulk-approval",
+        "patch",
+        lambda context, i: (
+            reverse("application-bulk-approval"),
+            {
+                "ids": _application_ids(context, i, 100),
+                "status": Application.DECISION_STATUSES[i % 2],
+            },
+        ),
+    ),
+    Scenario(
+        "applicationnote-bulk-create",
+        "post",
+        lambda context, i: (
+            reverse("applicationnote-bulk-create"),
+            {
+                "notes": [
+                    {"application": application_id, "note": f"Benchmark note {i}"}
+                    for application_id in _application_ids(context, i, 500)
+                ]
+            },
+        ),
+    ),
+    Scenario(
+        "application-export",
+        "get",
+        lambda context, i: (reverse("application-export"), None),
+    ),
+    Scenario(
+        "application-search",
+        "get",
+        lambda context, i: (
+            f"{reverse('application-search')}?q=seed+job+{i % 10}",
+            None,
+        ),
+    ),
+    Scenario(
+        "archived-application-list",
+        "get",
+        lambda context, i: (
+            f"{reverse('archived-application-list')}"
+            f"?job={_archived_application(context)[1]}",
+            None,
+        ),
+    ),
+    Scenario(
+        "archived-application-detail",
+        "get",
+        lambda context, i: (
+            reverse(
+                "archived-application-detail",
+                kwargs={"pk": _archived_application(context)[0]},
+            ),
+            None,
+        ),
+    ),
+    Scenario(
+        "application-approval",
+        "patch",
+        lambda context, i: (
+            reverse(
+                "application-approval",
+                kwargs={"pk": _application_ids(context, i, 1)[0]},
+            ),
+            {"status": Application.DECISION_STATUSES[i % 2]},
+        ),
+    ),
+    Scenario(
+        "applicationnote-create",
+        "get",
+        lambda context, i: (
+            reverse(
+                "applicationnote-create",
+                kwargs={"pk": _application_ids(context, i, 1)[0]},
+            ),
+            None,
+        ),
+    ),
+    Scenario(
+        "applicationnote-create",
+        "post",
+        lambda context, i: (
+            reverse(
+                "applicationnote-create",
+                kwargs={"pk": _application_ids(context, i, 1)[0]},
+            ),
+            {"note": f"Benchmark note {i}"},
+        ),
+    ),
+    Scenario(
+        "application-stats",
+        "get",
+        lambda context, i: (reverse("application-stats"), None),
+    ),
+    Scenario(
+        "application-stats-series",
+        "get",
+        lambda context, i: (
+            f"{reverse('application-stats-series')}?interval=week&start=2020-01-01"
+            f"&end=2020-12-31",
+            None,
+        ),
+    ),
+    Scenario(
+        "application-stats-cache",
+        "get",
+        lambda context, i: (reverse("application-stats-cache"), None),
+    ),
+    # Native async views, driven through the WSGI test client here; see
+    # run_concurrency_benchmark() for the ASGI comparison.
+    Scenario(
+        "async-application-list",
+        "get",
+        lambda context, i: (reverse("async-application-list"), None),
+    ),
+    Scenario(
+        "async-application-approval",
+        "patch",
+        lambda context, i: (
+            reverse(
+                "async-application-approval",
+                kwargs={"pk": _application_ids(context, i, 1)[0]},
+            ),
+            {"status": Application.DECISION_STATUSES[i % 2]},
+        ),
+    ),
+    Scenario(
+        "async-applicationnote-create",
+        "post",
+        lambda context, i: (
+            reverse(
+                "async-applicationnote-create",
+                kwargs={"pk": _application_ids(context, i, 1)[0]},
+            ),
+            {"note": f"Benchmark note {i}"},
+        ),
+    ),
+    Scenario(
+        "async-application-stats",
+        "get",
+        lambda context, i: (reverse("async-application-stats"), None),
+    ),
+]
+
+# (sync route, async route) pairs compared by run_concurrency_benchmark().
+CONCURRENCY_ROUTES = [
+    ("application-create-list", "async-application-list"),
+    ("application-stats", "async-application-stats"),
+]
+
+
+def create_benchmark_user():
+    user = User.objects.create_user(
+        username="benchmark",
+        password="benchmark",
+        first_name="Bench",
+        last_name="Mark",
+        email="benchmark@example.com",
+    )
+    user.user_permissions.add(
+        *Permission.objects.filter(
+            codename__in=[
+                "view_application",
+                "add_application",
+                "change_application",
+                "add_applicationnote",
+            ]
+        )
+    )
+    applicant = Applicant.objects.create(
+        user=user,
+        phone_number="+12125550123",
+        linkedin_url="https://www.linkedin.com/in/benchmark/",
+    )
+    return user, applicant
+
+
+def send(client, method, url, data):
+    response = getattr(client, method)(url, data=data, format="json")
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+    return response
+
+
+def measure(client, scenario, context, repeat):
+    iteration = 0
+
+    def request():
+        nonlocal iteration
+        url, data = scenario.build(context, iteration)
+        iteration += 1
+        return url, data
+
+    # Warm-up: fills the token, permission and stats caches like a live worker.
+    send(client, scenario.method, *request())
+
+    timings = []
+    for _ in range(repeat):
+        url, data = request()
+        started = time.perf_counter()
+        response = send(client, scenario.method, url, data)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    # Queries and memory come from a separate run, so tracing overhead does
+    # not distort the timings.
+    url, data = request()
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            response = send(client, scenario.method, url, data)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "status": response.status_code,
+        "wall_ms": round(statistics.median(timings), 3),
+        "queries": len(queries.captured_queries),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def run_benchmarks(scales, repeat=5, notes_per_application=1, log=None):
+    """
+    Seed up to each scale (number of applications) in increasing order and
+    measure every scenario. Returns {scale: {scenario name: metrics}}.
+    """
+    user, applicant = create_benchmark_user()
+    token = Token.objects.create(user=user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+    jobs, applicants = [], []
+    seeded = 0
+    results = {}
+    for scale in sorted(scales):
+        new_jobs, new_applicants = seed_applications(
+            scale - seeded, notes_per_application=notes_per_application
+        )
+        jobs += new_jobs
+        applicants += new_applicants
+        seeded = scale
+
+        context = BenchmarkContext(
+            user=user,
+            applicant=applicant,
+            jobs=jobs,
+            applicants=applicants,
+            application_ids=list(
+                Application.objects.order_by("id").values_list("id", flat=True)
+            ),
+        )
+        results[str(scale)] = {}
+        for scenario in SCENARIOS:
+            metrics = measure(client, scenario, context, repeat)
+            results[str(scale)][scenario.name] = metrics
+            if log:
+                log(f"{scale:>9} {scenario.name:<40} {metrics}")
+    return results
+
+
+def get_benchmark_token():
+    user = User.objects.filter(username="benchmark").first()
+    if user is None:
+        user, _ = create_benchmark_user()
+    return Token.objects.get_or_create(user=user)[0]
+
+
+def run_concurrency_benchmark(requests=200, concurrency=20, log=None):
+    """
+    Send `requests` GETs, `concurrency` at a time, to each sync route through
+    the WSGI handler from a thread pool, and to its async twin through the
+    ASGI handler from one event loop. Uses whatever data is already seeded.
+    Returns {route pair: {"wsgi": metrics, "asgi": metrics}}.
+    """
+    auth = f"Token {get_benchmark_token().key}"
+    results = {}
+    for sync_name, async_name in CONCURRENCY_ROUTES:
+        pair = {
+            "wsgi": _drive_wsgi(reverse(sync_name), auth, requests, concurrency),
+            "asgi": _drive_asgi(reverse(async_name), auth, requests, concurrency),
+        }
+        results[f"{sync_name} / {async_name}"] = pair
+        if log:
+            for server, metrics in pair.items():
+                log(f"{server:>5} x{concurrency:<4} {sync_name:<40} {metrics}")
+    return results
+
+
+def _drive_wsgi(url, auth, requests, concurrency):
+    def worker(count):
+        client = Client(HTTP_AUTHORIZATION=auth)
+        latencies, errors = [], 0
+        try:
+            for _ in range(count):
+                started = time.perf_counter()
+                response = client.get(url)
+                latencies.append((time.perf_counter() - started) * 1000)
+                errors += response.status_code >= 400
+        finally:
+            connections.close_all()
+        return latencies, errors
+
+    counts = [
+        requests // concurrency + (i < requests % concurrency)
+        for i in range(concurrency)
+    ]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(worker, counts))
+    elapsed = time.perf_counter() - started
+    return _throughput(
+        [latency for latencies, _ in outcomes for latency in latencies],
+        sum(errors for _, errors in outcomes),
+        elapsed,
+        concurrency,
+    )
+
+
+def _drive_asgi(url, auth, requests, concurrency):
+    async def run():
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies, errors = [], 0
+
+        async def one():
+            nonlocal errors
+            async with semaphore:
+                # Like ASGIHandler, give each request its own thread for
+                # sync_to_async work, and close its connection afterwards.
+                async with ThreadSensitiveContext():
+                    started = time.perf_counter()
+                    response = await client.get(url, headers={"Authorization": auth})
+                    latencies.append((time.perf_counter() - started) * 1000)
+                    errors += response.status_code >= 400
+                    await sync_to_async(connections.close_all)()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        return latencies, errors, time.perf_counter() - started
+
+    latencies, errors, elapsed = asyncio.run(run())
+    return _throughput(latencies, errors, elapsed, concurrency)
+
+
+def _throughput(latencies, errors, elapsed, concurrency):
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "errors": errors,
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2], 3),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95)], 3),
+    }
+
+
+def run_serializer_benchmark(rows=1000, repeat=5, log=None):
+    """
+    Serialize and render `rows` applications, seeding any that are missing,
+    through DRF's per-field pipeline and JSONRenderer, and through the
+    compiled serializer and FastJSONRenderer over instances and over values()
+    rows. Queries run outside the measured window. Returns {variant: metrics}.
+    """
+    missing = rows - Application.objects.count()
+    if missing > 0:
+        seed_applications(missing)
+
+    serializer = ApplicationSerializer()
+    queryset = ApplicationSerializer.setup_eager_loading(
+        Application.objects.order_by("id")
+    )
+    instances = list(queryset[:rows])
+    values = list(
+        queryset.prefetch_related(None).values(*serializer.value_names())[:rows]
+    )
+    ApplicationSerializer.attach_latest_notes(values)
+
+    def drf():
+        data = [
+            serializers.ModelSerializer.to_representation(serializer, instance)
+            for instance in instances
+        ]
+        return JSONRenderer().render(data)
+
+    def compiled(items, rows):
+        represent = serializer.compiled(rows=rows)
+        tz = default_timezone()
+        data = [represent(serializer, item, tz) for item in items]
+        return FastJSONRenderer().render(data)
+
+    variants = {
+        "drf": drf,
+        "compiled": lambda: compiled(instances, False),
+        "compiled_rows": lambda: compiled(values, True),
+    }
+    results = {}
+    for name, render in variants.items():
+        render()  # warm-up
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            render()
+            timings.append(time.perf_counter() - started)
+        elapsed = statistics.median(timings)
+        results[name] = {
+            "rows": len(instances),
+            "wall_ms": round(elapsed * 1000, 3),
+            "rows_per_second": round(len(instances) / elapsed, 1),
+        }
+        if log:
+            log(f"{len(instances):>9} {name:<40} {results[name]}")
+    return results
+
+
+def compare_results(baseline, current, max_slowdown=0.25, min_delta_ms=2.0):
+    """
+    Return a description of every regression of `current` against `baseline`.
+
+    Wall time and peak memory may grow by `max_slowdown` (a fraction), and
+    wall time must also grow by at least `min_delta_ms` to count as noise-free.
+    Any increase in query count is a regression.
+    """
+    regressions = []
+    for scale, scenarios in current.items():
+        for name, metrics in scenarios.items():
+            before = baseline.get(scale, {}).get(name)
+            if before is None:
+                continue
+            label = f"[{scale}] {name}"
+            if metrics["queries"] > before["queries"]:
+                regressions.append(
+                    f"{label}: queries {before['queries']} -> {metrics['queries']}"
+                )
+            slower = metrics["wall_ms"] - before["wall_ms"]
+            if (
+                metrics["wall_ms"] > before["wall_ms"] * (1 + max_slowdown)
+                and slower >= min_delta_ms
+            ):
+                regressions.append(
+                    f"{label}: wall time {before['wall_ms']}ms -> {metrics['wall_ms']}ms"
+                )
+            if metrics["peak_kb"] > before["peak_kb"] * (1 + max_slowdown):
+                regressions.append(
+                    f"{label}: peak memory {before['peak_kb']}KB -> {metrics['peak_kb']}KB"
+                )
+    return regressions
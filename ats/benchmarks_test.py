@@ -0,0 +1,81 @@
+import pytest
+
+from ats import async_urls, urls
+from ats.benchmarks import (
+    CONCURRENCY_ROUTES,
+    SCENARIOS,
+    compare_results,
+    run_benchmarks,
+    run_concurrency_benchmark,
+    run_serializer_benchmark,
+)
+from ats.seeding import seed_applications
+
+
+def test_every_route_has_a_scenario():
+    routes = {pattern.name for pattern in urls.urlpatterns + async_urls.urlpatterns}
+    assert routes == {scenario.url_name for scenario in SCENARIOS}
+
+
+def test_run_benchmarks(db):
+    results = run_benchmarks([20, 40], repeat=1)
+
+    assert set(results) == {"20", "40"}
+    for scenarios in results.values():
+        assert set(scenarios) == {scenario.name for scenario in SCENARIOS}
+        for metrics in scenarios.values():
+            assert metrics["status"] < 400
+            assert set(metrics) == {"status", "wall_ms", "queries", "peak_kb"}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_concurrency_benchmark():
+    seed_applications(20)
+    results = run_concurrency_benchmark(requests=8, concurrency=4)
+
+    assert len(results) == len(CONCURRENCY_ROUTES)
+    for pair in results.values():
+        assert set(pair) == {"wsgi", "asgi"}
+        for metrics in pair.values():
+            assert metrics["requests"] == 8
+            assert metrics["errors"] == 0
+            assert metrics["requests_per_second"] > 0
+
+
+def test_run_serializer_benchmark(db):
+    results = run_serializer_benchmark(rows=20, repeat=1)
+
+    assert set(results) == {"drf", "compiled", "compiled_rows"}
+    for metrics in results.values():
+        assert metrics["rows"] == 20
+        assert metrics["rows_per_second"] > 0
+
+
+def test_compare_results():
+    baseline = {
+        "1000": {
+            "get application-create-list": {
+                "wall_ms": 10.0,
+                "queries": 2,
+                "peak_kb": 100.0,
+            },
+            "get application-stats": {"wall_ms": 1.0, "queries": 0, "peak_kb": 10.0},
+        }
+    }
+    current = {
+        "1000": {
+            "get application-create-list": {
+                "wall_ms": 20.0,
+                "queries": 3,
+                "peak_kb": 100.0,
+            },
+            # 50% slower but under the noise floor
+            "get application-stats": {"wall_ms": 1.5, "queries": 0, "peak_kb": 10.0},
+        }
+    }
+
+    assert compare_results(baseline, current) == [
+        "[1000] get application-create-list: queries 2 -> 3",
+        "[1000] get application-create-list: wall time 10.0ms -> 20.0ms",
+    ]
+    assert compare_results(baseline, baseline) == []
@@ -0,0 +1,150 @@
+import threading
+import time
+from collections import Counter
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+STATS_VERSION_KEY = "ats:stats:version"
+STATS_HITS_KEY = "ats:stats:hits"
+STATS_MISSES_KEY = "ats:stats:misses"
+
+
+def get_stats_cache():
+    return caches[settings.ATS_STATS_CACHE]
+
+
+def get_stats_version():
+    cache = get_stats_cache()
+    version = cache.get(STATS_VERSION_KEY)
+    if version is None:
+        # Seed from the clock rather than 1, so a version key lost to eviction
+        # or a restart never resurrects responses cached under an old version.
+        cache.add(STATS_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(STATS_VERSION_KEY)
+    return version
+
+
+def bump_stats_version():
+    cache = get_stats_cache()
+    try:
+        cache.incr(STATS_VERSION_KEY)
+    except ValueError:
+        cache.add(STATS_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def invalidate_stats():
+    """
+    Invalidate cached stats after an Application write.
+
+    Bumps now, so reads later in this transaction miss, and again on commit,
+    so a response another worker cached from pre-commit data is discarded.
+    """
+    bump_stats_version()
+    transaction.on_commit(bump_stats_version)
+
+
+def get_cached_stats(build, timeout=None):
+    """
+    Return (stats, hit), calling build() to compute stats on a miss and
+    caching the result for `timeout` seconds (ATS_STATS_CACHE_TIMEOUT by default)
+    """
+    key, stats = _lookup_stats()
+    hit = stats is not None
+    if not hit:
+        stats = build()
+        _store_stats(key, stats, timeout)
+    return stats, hit
+
+
+async def aget_cached_stats(build, timeout=None):
+    """
+    get_cached_stats() for async views; build is a coroutine function
+    """
+    key, stats = await sync_to_async(_lookup_stats)()
+    hit = stats is not None
+    if not hit:
+        stats = await build()
+        await sync_to_async(_store_stats)(key, stats, timeout)
+    return stats, hit
+
+
+def _lookup_stats():
+    cache = get_stats_cache()
+    key = f"ats:stats:{get_stats_version()}"
+    stats = cache.get(key)
+    lookup_counts.add(STATS_HITS_KEY if stats is not None else STATS_MISSES_KEY)
+    return key, stats
+
+
+def _store_stats(key, stats, timeout):
+    if timeout is None:
+        timeout = settings.ATS_STATS_CACHE_TIMEOUT
+    get_stats_cache().set(key, stats, timeout=timeout)
+
+
+class LookupCounts:
+    """
+    Stats cache hits and misses, counted in process memory and added to the
+    shared cache at most every ATS_STATS_COUNTER_FLUSH_SECONDS, so a cached
+    read does not write to the cache
+    """
+
+    def __init__(self):
+        self._counts = Counter()
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, key):
+        with self._lock:
+            self._counts[key] += 1
+            due = (
+                time.monotonic() - self._flushed_at
+                >= settings.ATS_STATS_COUNTER_FLUSH_SECONDS
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+            self._flushed_at = time.monotonic()
+        cache = get_stats_cache()
+        for key, count in counts.items():
+            _increment(cache, key, count)
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+            self._flushed_at = time.monotonic()
+
+
+lookup_counts = LookupCounts()
+
+
+def get_stats_cache_counters():
+    """
+    Hit and miss counts of the stats cache across workers. Other workers'
+    latest counts show up within ATS_STATS_COUNTER_FLUSH_SECONDS.
+    """
+    lookup_counts.flush()
+    cache = get_stats_cache()
+    counters = cache.get_many([STATS_HITS_KEY, STATS_MISSES_KEY])
+    hits = counters.get(STATS_HITS_KEY, 0)
+    misses = counters.get(STATS_MISSES_KEY, 0)
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / lookups if lookups else None,
+    }
+
+
+def _increment(cache, key, delta):
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        if not cache.add(key, delta, timeout=None):
+            cache.incr(key, delta)
@@ -0,0 +1,261 @@
+from datetime import date, datetime, timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db.models import Max, Min, Sum
+from django.utils import timezone
+
+from ats.models import (
+    Applicant,
+    Application,
+    ApplicationDailyStats,
+    ApplicationNote,
+    ArchivedApplication,
+    ArchivedApplicationNote,
+    DuplicateApplication,
+    Job,
+    JobApplicationStats,
+    User,
+)
+from ats.search import search_applications
+
+
+def test_rebuild_application_stats(applicant, job):
+    other_job = Job.objects.create(title="Other Job", description="", location="NYC")
+    Application.objects.create(applicant=applicant, job=job)
+    Application.objects.create(applicant=applicant, job=other_job).update_status(
+        Application.Status.APPROVED
+    )
+
+    # Simulate drift on one job and a missing counter row on the other.
+    JobApplicationStats.objects.filter(job=job).update(
+        total_applications=7, submitted_applications=0
+    )
+    JobApplicationStats.objects.filter(job=other_job).delete()
+
+    out = StringIO()
+    call_command("rebuild_application_stats", "--dry-run", stdout=out)
+    assert f"Job {job.id}: total_applications 7 -> 1" in out.getvalue()
+    assert JobApplicationStats.objects.get(job=job).total_applications == 7
+
+    call_command("rebuild_application_stats", stdout=StringIO())
+    counters = {
+        stats.job_id: stats for stats in JobApplicationStats.objects.order_by("job")
+    }
+    assert counters[job.id].total_applications == 1
+    assert counters[job.id].submitted_applications == 1
+    assert counters[other_job.id].total_applications == 1
+    assert counters[other_job.id].approved_applications == 1
+    assert counters[other_job.id].submitted_applications == 0
+
+    out = StringIO()
+    call_command("rebuild_application_stats", stdout=out)
+    assert "Rebuilt counters for 0 job(s)." in out.getvalue()
+
+
+def generated_rows():
+    return (
+        list(
+            Application.objects.order_by("id").values_list(
+                "applicant__user__username", "job__title", "status", "created_at"
+            )
+        ),
+        list(Applicant.objects.order_by("id").values_list("phone_number", flat=True)),
+        ApplicationNote.objects.count(),
+    )
+
+
+def test_backfill_application_rollups(applicant, job):
+    other_job = Job.objects.create(title="Other Job", description="", location="NYC")
+    application = Application.objects.create(applicant=applicant, job=job)
+    Application.objects.create(applicant=applicant, job=other_job).update_status(
+        Application.Status.REJECTED
+    )
+    # Backdate one application behind the rollups' back.
+    Application.objects.filter(pk=application.pk).update(
+        created_at=timezone.make_aware(datetime(2024, 3, 1, 23, 30))
+    )
+
+    def rollups():
+        return set(
+            ApplicationDailyStats.objects.filter(count__gt=0).values_list(
+                "job_id", "day", "status", "count"
+            )
+        )
+
+    today = timezone.localdate()
+    assert rollups() == {
+        (job.id, today, "submitted", 1),
+        (other_job.id, today, "rejected", 1),
+    }
+
+    out = StringIO()
+    call_command("backfill_application_rollups", "--job", job.id, stdout=out)
+    assert "Backfilled 1 rollup row(s) for 1 job(s)." in out.getvalue()
+    assert rollups() == {
+        (job.id, date(2024, 3, 1), "submitted", 1),
+        (other_job.id, today, "rejected", 1),
+    }
+
+    ApplicationDailyStats.objects.all().delete()
+    call_command("backfill_application_rollups", "--batch-size", 1, stdout=out)
+    assert rollups() == {
+        (job.id, date(2024, 3, 1), "submitted", 1),
+        (other_job.id, today, "rejected", 1),
+    }
+
+
+def test_archive_applications(user, applicant, job):
+    closed_job = Job.objects.create(title="Closed Job", description="", location="NYC")
+    recent_job = Job.objects.create(title="Recent Job", description="", location="NYC")
+    open_application = Application.objects.create(applicant=applicant, job=job)
+    archived = [
+        Application.objects.create(applicant=applicant, job=closed_job),
+        Application.objects.create(
+            applicant=Applicant.objects.create(
+                user=User.objects.create_user(username="other"),
+                phone_number="9172820313",
+                linkedin_url="https://www.linkedin.com/in/other/",
+            ),
+            job=closed_job,
+        ),
+    ]
+    archived[1].update_status(Application.Status.REJECTED)
+    note = ApplicationNote.objects.create(
+        created_by=user, application=archived[0], note="Strong portfolio"
+    )
+    Application.objects.create(applicant=applicant, job=recent_job)
+    for closing in (closed_job, recent_job):
+        closing.status = Job.Status.CLOSED
+        closing.save(update_fields=["status"])
+    Job.objects.filter(pk=closed_job.pk).update(
+        closed_at=timezone.now() - timedelta(days=91)
+    )
+    stats_before = list(JobApplicationStats.objects.order_by("job").values())
+
+    out = StringIO()
+    call_command("archive_applications", "--dry-run", stdout=out)
+    assert "Would archive 2 application(s) from 1 job(s)." in out.getvalue()
+    assert Application.objects.count() == 4
+
+    call_command("archive_applications", "--chunk-size", 1, stdout=out)
+    assert "Archived 2 application(s) and 1 note(s) from 1 job(s)." in out.getvalue()
+
+    assert set(Application.objects.values_list("job_id", flat=True)) == {
+        job.id,
+        recent_job.id,
+    }
+    assert not ApplicationNote.objects.exists()
+    rows = ArchivedApplication.objects.order_by("id")
+    assert [(row.id, row.status) for row in rows] == [
+        (archived[0].id, "submitted"),
+        (archived[1].id, "rejected"),
+    ]
+    assert rows[0].created_at == archived[0].created_at
+    [archived_note] = ArchivedApplicationNote.objects.all()
+    assert (archived_note.id, archived_note.application_id) == (
+        note.id,
+        archived[0].id,
+    )
+    assert Application.objects.filter(pk=open_application.pk).exists()
+
+    # Counters and rollups still cover archived applications.
+    call_command("rebuild_application_stats", stdout=StringIO())
+    call_command("backfill_application_rollups", stdout=StringIO())
+    assert list(JobApplicationStats.objects.order_by("job").values()) == stats_before
+    assert ApplicationDailyStats.objects.aggregate(Sum("count"))["count__sum"] == 4
+
+    # Nothing left to move.
+    call_command("archive_applications", stdout=out)
+    assert "Archived 0 application(s) and 0 note(s) from 0 job(s)." in out.getvalue()
+
+
+def test_reopening_a_job_restores_its_archived_applications(user, applicant, job):
+    application = Application.objects.create(applicant=applicant, job=job)
+    application.update_status(Application.Status.APPROVED)
+    application.refresh_from_db()
+    note = ApplicationNote.objects.create(
+        created_by=user, application=application, note="Strong portfolio"
+    )
+    job.status = Job.Status.CLOSED
+    job.save(update_fields=["status"])
+    Job.objects.filter(pk=job.pk).update(closed_at=timezone.now() - timedelta(days=91))
+    call_command("archive_applications", stdout=StringIO())
+    assert not Application.objects.exists()
+    stats_before = list(JobApplicationStats.objects.values())
+
+    job = Job.objects.get(pk=job.pk)
+    job.status = Job.Status.OPEN
+    job.save(update_fields=["status"])
+
+    assert not ArchivedApplication.objects.exists()
+    assert not ArchivedApplicationNote.objects.exists()
+    restored = Application.objects.get()
+    assert (restored.id, restored.status, restored.created_at, restored.updated_at) == (
+        application.id,
+        "approved",
+        application.created_at,
+        application.updated_at,
+    )
+    assert list(restored.application_notes.values_list("id", "note")) == [
+        (note.id, "Strong portfolio")
+    ]
+    # The applicant cannot apply twice, and nothing is counted twice.
+    with pytest.raises(DuplicateApplication):
+        Application.submit(applicant, job.id)
+    call_command("rebuild_application_stats", stdout=StringIO())
+    assert list(JobApplicationStats.objects.values()) == stats_before
+
+    # An open job is not archived again.
+    out = StringIO()
+    call_command("archive_applications", stdout=out)
+    assert "Archived 0 application(s)" in out.getvalue()
+
+
+def test_rebuild_search_index(applicant):
+    # bulk_create bypasses the signals that keep the index current.
+    [job] = Job.objects.bulk_create(
+        [Job(title="Data Scientist", description="", location="NYC")]
+    )
+    application = Application.objects.create(applicant=applicant, job=job)
+    assert search_applications(["scientist"]) == []
+
+    out = StringIO()
+    call_command("rebuild_search_index", stdout=out)
+    assert "Rebuilt the search index." in out.getvalue()
+    assert [pk for pk, _ in search_applications(["scientist"])] == [application.id]
+    assert [pk for pk, _ in search_applications(["cho"])] == [application.id]
+
+
+def test_generate_data(db):
+    out = StringIO()
+    args = ["--applications=300", "--jobs=20", "--notes-per-application=1.5"]
+    args += ["--status-mix=submitted=1,approved=1,rejected=0", "--end=2024-01-31"]
+    call_command("generate_data", *args, "--batch-size=70", stdout=out)
+
+    assert "Generated 150 users, 100 applicants, 20 jobs, 300 applications" in (
+        out.getvalue()
+    )
+    assert Application.objects.count() == 300
+    statuses = set(Application.objects.values_list("status", flat=True))
+    assert statuses == {Application.Status.SUBMITTED, Application.Status.APPROVED}
+    assert 350 <= ApplicationNote.objects.count() <= 550
+    for phone_number in Applicant.objects.values_list("phone_number", flat=True):
+        assert phone_number.is_valid()
+    created = Application.objects.aggregate(Min("created_at"), Max("created_at"))
+    assert created["created_at__min"].date() >= date(2023, 1, 31)
+    assert created["created_at__max"].date() < date(2024, 1, 31)
+    # Counters and rollups are rebuilt for the generated applications.
+    stats = JobApplicationStats.objects.aggregate(Sum("total_applications"))
+    assert stats["total_applications__sum"] == 300
+    assert ApplicationDailyStats.objects.aggregate(Sum("count"))["count__sum"] == 300
+
+    # The same seed generates the same data.
+    first = generated_rows()
+    with pytest.raises(CommandError, match="already exist"):
+        call_command("generate_data", *args, stdout=StringIO())
+    User.objects.filter(username__startswith="load-").delete()
+    Job.objects.all().delete()
+    call_command("generate_data", *args, stdout=StringIO())
+    assert generated_rows() == first
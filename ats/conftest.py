@@ -0,0 +1,103 @@
+import pytest
+from django.conf import settings
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from ats.authentication import token_cache
+from ats.cache import lookup_counts
+from ats.models import Job, User, Applicant, Application
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    token_cache.clear()
+    lookup_counts.clear()
+    yield
+    cache.clear()
+    token_cache.clear()
+    lookup_counts.clear()
+
+
+@pytest.fixture(scope="session")
+def django_db_modify_db_settings(django_db_modify_db_settings):
+    # Without a real replica (ATS_DB_REPLICA_HOST), add a "replica" alias that
+    # mirrors the default test database, so the routing tests always run.
+    # connections shares this dict, so the alias is visible before setup.
+    if settings.ATS_READ_REPLICA not in settings.DATABASES:
+        settings.DATABASES[settings.ATS_READ_REPLICA] = {
+            **settings.DATABASES["default"],
+            "TEST": {"MIRROR": "default"},
+        }
+
+
+@pytest.fixture(autouse=True)
+def primary_only(request, settings):
+    # Tests only get replica routing when they opt into the replica alias.
+    marker = request.node.get_closest_marker("django_db")
+    if not marker or settings.ATS_READ_REPLICA not in marker.kwargs.get(
+        "databases", []
+    ):
+        settings.ATS_READ_REPLICA = None
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def user(db):
+    user = User.objects.create_user(
+        username="testuser",
+        password="testpassword",
+        first_name="Peter",
+        last_name="Cho",
+        email="petercho42@gmail.com",
+    )
+    view_permission = Permission.objects.get(codename="view_application")
+    create_permission = Permission.objects.get(codename="add_application")
+    status_permission = Permission.objects.get(codename="change_application")
+    note_permission = Permission.objects.get(codename="add_applicationnote")
+    user.user_permissions.add(view_permission)
+    user.user_permissions.add(create_permission)
+    user.user_permissions.add(status_permission)
+    user.user_permissions.add(note_permission)
+    return user
+
+
+@pytest.fixture
+def no_permission_user(db):
+    user = User.objects.create_user(
+        username="nopermissionuser",
+        password="testpassword",
+        first_name="Peter",
+        last_name="Cho",
+        email="petercho39@gmail.com",
+    )
+    return user
+
+
+@pytest.fixture
+def applicant(db, user):
+    return Applicant.objects.create(
+        user=user,
+        phone_number="9172820312",
+        linkedin_url="https://www.linkedin.com/in/petercho42/",
+    )
+
+
+@pytest.fixture
+def job(db):
+    return Job.objects.create(
+        title="Test Job",
+        description="Test Job Description",
+        location="NYC",
+        work_model=Job.WorkModel.HYBRID,
+    )
+
+
+@pytest.fixture
+def application(db, user, applicant, job):
+    return Application.objects.create(applicant=applicant, job=job)
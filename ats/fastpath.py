@@ -0,0 +1,262 @@
+"""
+Serializers compiled to plain Python, for the application payloads rendered
+by every list, search and export request.
+
+compile_serializer() reads a serializer's fields once and generates the
+source of a function building the same dict as Serializer.to_representation,
+with every attribute lookup, conversion and nested serializer written out
+inline: no per-field get_attribute()/to_representation() calls and no
+OrderedDicts. It comes in two flavours:
+
+- over model instances, as fetched by the list and search views;
+- over values() rows, keyed by each field's source path (for example
+  "applicant__user__email"), which skip model instantiation altogether.
+  SerializerMethodFields cannot run on rows, so they are read from the row
+  under their own name and the caller supplies them.
+
+Functions are cached per serializer class and field layout (sparse fieldsets
+get their own). A field the compiler cannot render exactly like DRF does
+raises TypeError when compiling, rather than rendering differently.
+"""
+import datetime
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models.constants import LOOKUP_SEP
+from django.utils import timezone
+from rest_framework import ISO_8601, relations, serializers
+from rest_framework.fields import DateTimeField, SerializerMethodField
+from rest_framework.settings import api_settings
+
+# Serializer fields that render these model fields' values unchanged, so the
+# compiled code can copy them as they are.
+NATIVE_FIELDS = {
+    serializers.IntegerField: (
+        models.AutoField,
+        models.BigAutoField,
+        models.IntegerField,
+        models.BigIntegerField,
+        models.PositiveIntegerField,
+    ),
+    serializers.CharField: (
+        models.CharField,
+        models.TextField,
+        models.EmailField,
+        models.URLField,
+    ),
+    serializers.EmailField: (models.EmailField,),
+    serializers.URLField: (models.URLField,),
+    serializers.ChoiceField: (models.CharField,),
+    serializers.BooleanField: (models.BooleanField,),
+}
+
+_cache = {}
+
+
+def default_timezone():
+    """
+    The timezone DateTimeField renders in, looked up once per payload
+    """
+    return timezone.get_current_timezone() if settings.USE_TZ else None
+
+
+def format_datetime(value, tz):
+    """
+    DateTimeField.to_representation() with the default ISO 8601 format
+    """
+    if not value:
+        return None
+    if isinstance(value, str):
+        return value
+    if tz is not None:
+        if timezone.is_aware(value):
+            value = value.astimezone(tz)
+        else:
+            value = timezone.make_aware(value, tz)
+    elif timezone.is_aware(value):
+        value = timezone.make_naive(value, datetime.timezone.utc)
+    value = value.isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+def compile_serializer(serializer, rows=False):
+    """
+    The function (serializer, instance or row, tz) -> dict rendering
+    `serializer`'s current fields. Its value_names attribute lists the
+    values() names a row needs.
+    """
+    layout = tuple(
+        (field.field_name, type(field), field.source)
+        for field in serializer._readable_fields
+    )
+    key = (type(serializer), rows, layout)
+    if key not in _cache:
+        _cache[key] = _Compiler(rows).compile(serializer)
+    return _cache[key]
+
+
+class _Compiler:
+    def __init__(self, rows):
+        self.rows = rows
+        self.lines = []  # related objects, fetched once per call (instances)
+        self.nullable = set()  # the locals among them that may be None
+        self.namespace = {"_datetime": format_datetime}
+        self.value_names = []
+
+    def compile(self, serializer):
+        name = f"represent_{type(serializer).__name__}"
+        body = self.dict_source(serializer, "obj", [], _model(serializer))
+        source = "\n".join(
+            [f"def {name}(self, obj, tz):", *self.lines, f"    return {body}", ""]
+        )
+        code = compile(source, f"<compiled {type(serializer).__name__}>", "exec")
+        exec(code, self.namespace)
+        function = self.namespace[name]
+        function.source = source
+        function.value_names = self.value_names
+        return function
+
+    def constant(self, value):
+        name = f"_c{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def dict_source(self, serializer, obj, path, model):
+        items = [
+            f"{field.field_name!r}: {self.field_source(field, obj, path, model)}"
+            for field in serializer._readable_fields
+        ]
+        return "{" + ", ".join(items) + "}"
+
+    def field_source(self, field, obj, path, model):
+        label = f"{type(field.parent).__name__}.{field.field_name}"
+        if isinstance(field, SerializerMethodField):
+            if path or obj != "obj":
+                raise TypeError(f"{label}: only top-level method fields compile.")
+            if self.rows:
+                return f"obj[{field.field_name!r}]"
+            return f"self.{field.method_name}(obj)"
+
+        model_field = _resolve(model, field.source_attrs, label)
+        if isinstance(field, serializers.ListSerializer):
+            raise TypeError(f"{label}: nested lists do not compile.")
+        if isinstance(field, serializers.BaseSerializer):
+            return self.nested_source(field, obj, path, model_field, label)
+        if isinstance(field, relations.PrimaryKeyRelatedField):
+            if field.pk_field is not None or not model_field.many_to_one:
+                raise TypeError(f"{label}: only plain foreign keys compile.")
+            return self.value_source(
+                obj, path, [*field.source_attrs[:-1], model_field.attname]
+            )
+
+        value = self.value_source(obj, path, field.source_attrs)
+        if type(model_field) in NATIVE_FIELDS.get(type(field), ()):
+            return value
+        if isinstance(field, DateTimeField) and _is_default_format(field):
+            return f"_datetime({value}, tz)"
+        converted = f"{self.constant(field.to_representation)}({value})"
+        if not model_field.null:
+            return converted
+        return f"(None if {value} is None else {converted})"
+
+    def nested_source(self, serializer, obj, path, model_field, label):
+        if not (model_field.many_to_one or model_field.one_to_one):
+            raise TypeError(f"{label}: nested serializers need a foreign key.")
+        related_model = _model(serializer)
+        if self.rows:
+            path = [*path, *serializer.source_attrs]
+            body = self.dict_source(serializer, obj, path, related_model)
+            if not model_field.null:
+                return body
+            pk = self.value_source(obj, path, [related_model._meta.pk.attname])
+            return f"(None if {pk} is None else {body})"
+
+        value = self.value_source(obj, path, serializer.source_attrs)
+        if obj in self.nullable:
+            value = f"None if {obj} is None else {value}"
+        related = f"_{len(self.lines)}"
+        self.lines.append(f"    {related} = {value}")
+        body = self.dict_source(serializer, related, [], related_model)
+        if not model_field.null and obj not in self.nullable:
+            return body
+        self.nullable.add(related)
+        return f"(None if {related} is None else {body})"
+
+    def value_source(self, obj, path, attrs):
+        if self.rows:
+            name = LOOKUP_SEP.join([*path, *attrs])
+            if name not in self.value_names:
+                self.value_names.append(name)
+            return f"obj[{name!r}]"
+        return ".".join([obj, *attrs])
+
+
+def _model(serializer):
+    model = getattr(getattr(serializer, "Meta", None), "model", None)
+    if model is None:
+        raise TypeError(f"{type(serializer).__name__} is not a ModelSerializer.")
+    return model
+
+
+def _resolve(model, attrs, label):
+    """
+    The model field `attrs` ends on, through non-null forward relations
+    """
+    if not attrs:
+        raise TypeError(f"{label}: source='*' does not compile.")
+    for attr in attrs[:-1]:
+        field = _get_field(model, attr, label)
+        if not (field.many_to_one or field.one_to_one) or field.null:
+            raise TypeError(f"{label}: {attr!r} is not a non-null foreign key.")
+        model = field.related_model
+    return _get_field(model, attrs[-1], label)
+
+
+def _get_field(model, name, label):
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        raise TypeError(f"{label}: {name!r} is not a field of {model.__name__}.")
+    if not field.concrete:
+        raise TypeError(f"{label}: reverse relation {name!r} does not compile.")
+    return field
+
+
+def _is_default_format(field):
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    return (
+        isinstance(output_format, str)
+        and output_format.lower() == ISO_8601
+        and not hasattr(field, "timezone")
+    )
+
+
+class CompiledListSerializer(serializers.ListSerializer):
+    """
+    many=True rendering through the child's compiled function
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.Manager) else data
+        represent = self.child.compiled()
+        tz = default_timezone()
+        return [represent(self.child, item, tz) for item in iterable]
+
+
+class CompiledSerializerMixin:
+    """
+    Renders through compile_serializer() instead of DRF's per-field pipeline.
+    Set Meta.list_serializer_class = CompiledListSerializer as well.
+    """
+
+    def compiled(self, rows=False):
+        cache = self.__dict__.setdefault("_compiled", {})
+        if rows not in cache:
+            cache[rows] = compile_serializer(self, rows=rows)
+        return cache[rows]
+
+    def to_representation(self, instance):
+        return self.compiled()(self, instance, default_timezone())
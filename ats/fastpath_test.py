@@ -0,0 +1,94 @@
+import pytest
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from ats.fastpath import compile_serializer, default_timezone
+from ats.models import Application, ApplicationNote, Job
+from ats.renderers import FastJSONRenderer
+from ats.serializers import ApplicationSerializer
+
+FIELDSETS = [
+    {},
+    {"fields": ["id", "status", "job"]},
+    {"expand": ["applicant", "job"]},
+    {"expand": ["notes"]},
+    {"fields": ["applicant", "application_notes"], "expand": ["applicant", "notes"]},
+]
+
+
+def drf_representation(serializer, instance):
+    """
+    What DRF's own field-by-field pipeline renders
+    """
+    return serializers.ModelSerializer.to_representation(serializer, instance)
+
+
+@pytest.mark.parametrize("fieldset", FIELDSETS)
+def test_compiled_serializer_matches_drf(fieldset, user, application):
+    ApplicationNote.objects.bulk_create(
+        ApplicationNote(created_by=user, application=application, note=f"Note {i}")
+        for i in range(7)
+    )
+    queryset = ApplicationSerializer.setup_eager_loading(
+        Application.objects.all(), **fieldset
+    )
+    serializer = ApplicationSerializer(**fieldset)
+    [instance] = queryset
+    expected = drf_representation(serializer, instance)
+    assert serializer.to_representation(instance) == expected
+
+    # The same payload from values() rows.
+    rows = list(queryset.prefetch_related(None).values(*serializer.value_names()))
+    if "application_notes" in serializer.fields:
+        ApplicationSerializer.attach_latest_notes(rows)
+    represent = serializer.compiled(rows=True)
+    assert represent(serializer, rows[0], default_timezone()) == expected
+
+
+def test_compiled_serializer_nullable_fields(job):
+    class JobSerializer(serializers.ModelSerializer):
+        class Meta:
+            model = Job
+            fields = ["id", "title", "closed_at"]
+
+    serializer = JobSerializer()
+    represent = compile_serializer(serializer)
+    assert represent(serializer, job, None) == drf_representation(serializer, job)
+
+    job.closed_at = timezone.now()
+    assert represent(serializer, job, default_timezone()) == drf_representation(
+        serializer, job
+    )
+
+
+def test_compiled_serializer_rejects_what_it_cannot_render():
+    class NotesSerializer(serializers.ModelSerializer):
+        application_notes = serializers.PrimaryKeyRelatedField(
+            many=True, read_only=True
+        )
+
+        class Meta:
+            model = Application
+            fields = ["id", "application_notes"]
+
+    class WholeSerializer(serializers.ModelSerializer):
+        whole = serializers.CharField(source="*")
+
+        class Meta:
+            model = Job
+            fields = ["id", "whole"]
+
+    with pytest.raises(TypeError, match="application_notes"):
+        compile_serializer(NotesSerializer())
+    with pytest.raises(TypeError, match="source='\\*'"):
+        compile_serializer(WholeSerializer())
+
+
+def test_fast_json_renderer_matches_json_renderer():
+    data = {"note": "caf\u00e9 \u2028 \u2029 \U0001f600", "count": 1, "none": None}
+    for accepted in [None, "application/json", "application/json; indent=4"]:
+        assert FastJSONRenderer().render(data, accepted) == JSONRenderer().render(
+            data, accepted
+        )
+    assert FastJSONRenderer().render(None) == b""
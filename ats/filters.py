@@ -0,0 +1,171 @@
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import filters, serializers
+
+from ats.models import Application
+
+
+def index_serves(model, equal_fields, order_field):
+    """
+    Whether an index on `model` serves an equality match on `equal_fields`
+    ordered by (`order_field`, id), or a unique constraint limits the match
+    to a single row
+    """
+    equal_fields = set(equal_fields)
+    for unique in model._meta.unique_together:
+        if set(unique) <= equal_fields:
+            return True
+    prefix = len(equal_fields)
+    for index in model._meta.indexes:
+        fields = [name.lstrip("-") for name in index.fields]
+        if set(fields[:prefix]) == equal_fields and fields[prefix:] == [
+            order_field,
+            "id",
+        ]:
+            return True
+    return False
+
+
+def indexed_combinations(model, filter_fields, order_fields):
+    """
+    {order field: [equality field sets]} that index_serves() accepts
+    """
+    combinations = {field: [] for field in order_fields}
+    for index in model._meta.indexes:
+        fields = [name.lstrip("-") for name in index.fields]
+        for prefix in range(len(fields) - 1):
+            equal, order = fields[:prefix], fields[prefix]
+            if (
+                order in combinations
+                and set(equal) <= set(filter_fields)
+                and fields[prefix + 1 :] == ["id"]
+            ):
+                combinations[order].append(sorted(equal))
+    return combinations
+
+
+class ApplicationFilterBackend(filters.BaseFilterBackend):
+    """
+    Filter applications by ?job=, ?applicant=, ?status= and ?created_after=,
+    ?created_before=, ?updated_after=, ?updated_before=, ordered by ?ordering=.
+
+    Only combinations that an index on the queryset's model (Application or
+    ArchivedApplication) serves as a range scan in the requested order are
+    accepted, so no filter can cause a full scan.
+    """
+
+    id_params = ["job", "applicant"]
+    # param: (field, lookup). "after" is inclusive, "before" exclusive.
+    range_params = {
+        "created_after": ("created_at", "gte"),
+        "created_before": ("created_at", "lt"),
+        "updated_after": ("updated_at", "gte"),
+        "updated_before": ("updated_at", "lt"),
+    }
+    ordering_fields = ["created_at", "updated_at"]
+    default_ordering = "-created_at"
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        errors = {}
+        equal = {}
+        ranges = {}
+
+        for param in self.id_params:
+            value = params.get(param)
+            if value is None:
+                continue
+            # isdigit() alone also accepts digits int() rejects ("²") or
+            # reads as another number ("٣").
+            if value.isascii() and value.isdigit():
+                equal[param] = int(value)
+            else:
+                errors[param] = ["A valid integer is required."]
+
+        status = params.get("status")
+        if status is not None:
+            if status in Application.Status.values:
+                equal["status"] = status
+            else:
+                errors["status"] = [f'"{status}" is not a valid choice.']
+
+        for param, (field, lookup) in self.range_params.items():
+            value = params.get(param)
+            if value is None:
+                continue
+            value = parse_timestamp(value)
+            if value is None:
+                errors[param] = ["Enter a valid date or date/time."]
+            else:
+                ranges[f"{field}__{lookup}"] = value
+
+        try:
+            [ordering] = self.get_ordering(request, queryset, view)
+        except serializers.ValidationError as exc:
+            errors.update(exc.detail)
+
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        order_field = ordering.lstrip("-")
+        range_fields = {lookup.split("__")[0] for lookup in ranges}
+        if range_fields - {order_field}:
+            raise serializers.ValidationError(
+                {
+                    "non_field_errors": [
+                        f"Date ranges must be on the ordering field, {order_field}."
+                    ]
+                }
+            )
+        if not index_serves(queryset.model, equal, order_field):
+            message = self.unsupported_message(queryset.model, equal, order_field)
+            raise serializers.ValidationError({"non_field_errors": [message]})
+
+        return queryset.filter(**equal, **ranges)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = request.query_params.get("ordering")
+        if ordering is None:
+            return (getattr(view, "ordering", None) or self.default_ordering,)
+        if ordering.lstrip("-") not in self.ordering_fields:
+            choices = ", ".join(self.ordering_fields)
+            raise serializers.ValidationError(
+                {"ordering": [f"Order by one of {choices}, optionally with a '-'."]}
+            )
+        return (ordering,)
+
+    def unsupported_message(self, model, equal, order_field):
+        combinations = indexed_combinations(
+            model, [*self.id_params, "status"], self.ordering_fields
+        )
+        supported = "; ".join(
+            f"ordered by {field}: "
+            + ", ".join("+".join(fields) or "no filter" for fields in filter_sets)
+            for field, filter_sets in combinations.items()
+            if filter_sets
+        )
+        return (
+            f"No index serves filtering on {'+'.join(sorted(equal))} ordered by "
+            f"{order_field}. Supported filters {supported}."
+        )
+
+
+def parse_timestamp(value):
+    """
+    Parse an ISO 8601 date/time, or a date meaning its midnight, as an aware
+    datetime in the current time zone; None when invalid
+    """
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            date = parse_date(value)
+            if date is None:
+                return None
+            parsed = datetime.combine(date, time.min)
+    except ValueError:
+        return None
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
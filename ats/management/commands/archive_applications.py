@@ -0,0 +1,146 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from ats.models import (
+    Application,
+    ApplicationNote,
+    ArchivedApplication,
+    ArchivedApplicationNote,
+    Job,
+)
+
+APPLICATION_FIELDS = [
+    "id",
+    "applicant_id",
+    "job_id",
+    "status",
+    "created_at",
+    "updated_at",
+]
+NOTE_FIELDS = [
+    "id",
+    "created_by_id",
+    "application_id",
+    "note",
+    "created_at",
+    "updated_at",
+]
+
+
+def archive_chunk(job_id, chunk_size):
+    """
+    Move up to `chunk_size` of the closed job's oldest applications, and their
+    notes, to the archive tables in one transaction; returns (applications,
+    notes)
+    """
+    with transaction.atomic():
+        # Reopening a job takes its archived applications back (Job.save);
+        # lock the job so a reopen waits for this chunk, and stop if it
+        # happened first.
+        if (
+            not Job.objects.select_for_update()
+            .filter(pk=job_id, status=Job.Status.CLOSED)
+            .exists()
+        ):
+            return 0, 0
+        # A concurrent status change waits for the move and then finds the
+        # application gone, rather than updating a row we already copied.
+        applications = list(
+            Application.objects.select_for_update()
+            .filter(job_id=job_id)
+            .order_by("created_at", "id")
+            .values(*APPLICATION_FIELDS)[:chunk_size]
+        )
+        if not applications:
+            return 0, 0
+        ids = [row["id"] for row in applications]
+        notes = list(
+            ApplicationNote.objects.filter(application_id__in=ids).values(*NOTE_FIELDS)
+        )
+
+        ArchivedApplication.objects.bulk_create(
+            ArchivedApplication(**row) for row in applications
+        )
+        ArchivedApplicationNote.objects.bulk_create(
+            (ArchivedApplicationNote(**row) for row in notes), batch_size=1000
+        )
+        ApplicationNote.objects.filter(application_id__in=ids).delete()
+        Application.objects.filter(id__in=ids).delete()
+    return len(applications), len(notes)
+
+
+class Command(BaseCommand):
+    help = (
+        "Move the applications and notes of jobs closed for longer than "
+        "--older-than-days into the archive tables, a chunk per transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=settings.ATS_ARCHIVE_AFTER_DAYS,
+            help=(
+                "Archive jobs closed at least this many days ago (default: "
+                f"{settings.ATS_ARCHIVE_AFTER_DAYS})."
+            ),
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Applications moved per transaction (default: 1000).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would be archived without moving anything.",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["older_than_days"])
+        jobs = Job.objects.filter(
+            status=Job.Status.CLOSED, closed_at__lte=cutoff
+        ).order_by("id")
+
+        if options["dry_run"]:
+            pending = (
+                Application.objects.filter(job__in=jobs)
+                .values("job_id")
+                .annotate(count=Count("id"))
+                .order_by()
+            )
+            total = sum(row["count"] for row in pending)
+            self.stdout.write(
+                f"Would archive {total} application(s) from {len(pending)} job(s)."
+            )
+            return
+
+        moved_jobs = moved_applications = moved_notes = 0
+        for job_id in list(jobs.values_list("id", flat=True)):
+            job_applications = 0
+            while True:
+                applications, notes = archive_chunk(job_id, options["chunk_size"])
+                if not applications:
+                    break
+                job_applications += applications
+                moved_notes += notes
+            if job_applications:
+                moved_jobs += 1
+                moved_applications += job_applications
+                if options["verbosity"] > 1:
+                    self.stdout.write(
+                        f"Job {job_id}: {job_applications} application(s)"
+                    )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {moved_applications} application(s) and {moved_notes} "
+                f"note(s) from {moved_jobs} job(s)."
+            )
+        )
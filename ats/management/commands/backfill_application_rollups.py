@@ -0,0 +1,76 @@
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+from ats.models import Application, ApplicationDailyStats, ArchivedApplication, Job
+
+
+def count_applications_by_day(job_ids):
+    """
+    ApplicationDailyStats rows recomputed from the Application and
+    ArchivedApplication tables
+    """
+    counts = Counter()
+    for model in (Application, ArchivedApplication):
+        rows = (
+            model.objects.filter(job_id__in=job_ids)
+            .annotate(day=TruncDate("created_at"))
+            .values_list("job_id", "day", "status")
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        for job_id, day, status, count in rows:
+            counts[job_id, day, status] += count
+    return [
+        ApplicationDailyStats(job_id=job_id, day=day, status=status, count=count)
+        for (job_id, day, status), count in counts.items()
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the per-job daily application rollups from Application and "
+        "the archive, a batch of jobs per transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--job",
+            type=int,
+            action="append",
+            dest="jobs",
+            help="Only backfill this job; may be repeated.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Jobs per transaction (default: 100).",
+        )
+
+    def handle(self, *args, **options):
+        job_ids = Job.objects.order_by("id").values_list("id", flat=True)
+        if options["jobs"]:
+            job_ids = job_ids.filter(id__in=options["jobs"])
+        job_ids = list(job_ids)
+
+        rows = 0
+        batch_size = options["batch_size"]
+        for start in range(0, len(job_ids), batch_size):
+            batch = job_ids[start : start + batch_size]
+            with transaction.atomic():
+                # Deleting first locks the batch's rollups, so concurrent
+                # writers apply their deltas on top of the recomputed rows.
+                ApplicationDailyStats.objects.filter(job_id__in=batch).delete()
+                rollups = count_applications_by_day(batch)
+                ApplicationDailyStats.objects.bulk_create(rollups, batch_size=1000)
+            rows += len(rollups)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Backfilled {rows} rollup row(s) for {len(job_ids)} job(s)."
+            )
+        )
@@ -0,0 +1,133 @@
+import json
+import platform
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+from django.utils import timezone
+
+from ats.benchmarks import (
+    compare_results,
+    run_benchmarks,
+    run_concurrency_benchmark,
+    run_serializer_benchmark,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every API route against seeded datasets in a throwaway test "
+        "database, recording wall time, query count and peak memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scales",
+            default="1000,10000",
+            help="Comma-separated application counts to seed (default: 1000,10000).",
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--notes-per-application", type=int, default=1)
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+        parser.add_argument(
+            "--baseline",
+            help="Compare against a previous --output file and fail on regressions.",
+        )
+        parser.add_argument(
+            "--max-slowdown",
+            type=float,
+            default=0.25,
+            help="Allowed fractional growth in wall time and memory (default: 0.25).",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=0,
+            help=(
+                "After the scales, compare WSGI and ASGI throughput with this many "
+                "requests in flight (default: off)."
+            ),
+        )
+        parser.add_argument("--concurrent-requests", type=int, default=200)
+        parser.add_argument(
+            "--serializers",
+            type=int,
+            default=0,
+            help=(
+                "After the scales, compare DRF and compiled serialization of this "
+                "many applications in rows/second (default: off)."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        try:
+            scales = [int(scale) for scale in options["scales"].split(",")]
+        except ValueError:
+            raise CommandError("--scales must be a comma-separated list of integers.")
+
+        baseline = None
+        if options["baseline"]:
+            with open(options["baseline"]) as f:
+                baseline = json.load(f)["results"]
+
+        setup_test_environment()
+        old_config = setup_databases(
+            verbosity=0, interactive=False, aliases={"default"}
+        )
+        try:
+            results = run_benchmarks(
+                scales,
+                repeat=options["repeat"],
+                notes_per_application=options["notes_per_application"],
+                log=self.stdout.write,
+            )
+            concurrency = None
+            if options["concurrency"]:
+                concurrency = run_concurrency_benchmark(
+                    requests=options["concurrent_requests"],
+                    concurrency=options["concurrency"],
+                    log=self.stdout.write,
+                )
+            serializers = None
+            if options["serializers"]:
+                serializers = run_serializer_benchmark(
+                    rows=options["serializers"],
+                    repeat=options["repeat"],
+                    log=self.stdout.write,
+                )
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            "meta": {
+                "created_at": timezone.now().isoformat(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "repeat": options["repeat"],
+            },
+            "results": results,
+        }
+        if concurrency is not None:
+            report["concurrency"] = concurrency
+        if serializers is not None:
+            report["serializers"] = serializers
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+            self.stdout.write(f"Wrote {options['output']}")
+
+        if baseline is not None:
+            regressions = compare_results(
+                baseline, results, max_slowdown=options["max_slowdown"]
+            )
+            if regressions:
+                raise CommandError(
+                    "Performance regressions:\n" + "\n".join(regressions)
+                )
+            self.stdout.write(self.style.SUCCESS("No regressions against baseline."))
@@ -0,0 +1,114 @@
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ats.models import User
+from ats.seeding import generate_dataset, parse_status_mix
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a production-sized synthetic dataset for load testing: users, "
+        "applicants, jobs, applications and notes, deterministic for a given seed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--applications", type=int, default=1_000_000)
+        parser.add_argument(
+            "--jobs", type=int, help="Default: one job per 200 applications."
+        )
+        parser.add_argument(
+            "--applicants", type=int, help="Default: one per 3 applications."
+        )
+        parser.add_argument(
+            "--recruiters",
+            type=int,
+            default=50,
+            help="Users who write the notes (default: 50).",
+        )
+        parser.add_argument(
+            "--status-mix",
+            default="submitted=60,approved=25,rejected=15",
+            help="Relative weight of each application status.",
+        )
+        parser.add_argument(
+            "--notes-per-application",
+            type=float,
+            default=1.0,
+            help="Average number of notes per application (default: 1.0).",
+        )
+        parser.add_argument(
+            "--closed-jobs",
+            type=float,
+            default=0.1,
+            help="Fraction of jobs that are closed (default: 0.1).",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=365,
+            help="Spread applications over this many days (default: 365).",
+        )
+        parser.add_argument(
+            "--end",
+            help=(
+                "Last day of the window, YYYY-MM-DD (default: today). Pass it with "
+                "--seed to regenerate exactly the same data on another day."
+            ),
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--prefix",
+            default="load",
+            help="Username prefix, so several datasets can share a database.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        try:
+            status_mix = parse_status_mix(options["status_mix"])
+        except ValueError as exc:
+            raise CommandError(f"--status-mix: {exc}")
+
+        end = None
+        if options["end"]:
+            try:
+                end = timezone.make_aware(datetime.strptime(options["end"], "%Y-%m-%d"))
+            except ValueError:
+                raise CommandError("--end must be a date in YYYY-MM-DD format.")
+
+        prefix = options["prefix"]
+        if User.objects.filter(username__startswith=f"{prefix}-").exists():
+            raise CommandError(
+                f"Users prefixed {prefix!r} already exist; pass another --prefix."
+            )
+
+        started = time.perf_counter()
+        try:
+            counts = generate_dataset(
+                options["applications"],
+                jobs=options["jobs"],
+                applicants=options["applicants"],
+                recruiters=options["recruiters"],
+                status_mix=status_mix,
+                notes_per_application=options["notes_per_application"],
+                closed_jobs=options["closed_jobs"],
+                end=end,
+                days=options["days"],
+                seed=options["seed"],
+                prefix=prefix,
+                batch_size=options["batch_size"],
+                log=self.stdout.write if options["verbosity"] > 1 else None,
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Generated {users} users, {applicants} applicants, {jobs} jobs, "
+                "{applications} applications and {notes} notes".format(**counts)
+                + f" in {time.perf_counter() - started:.1f}s."
+            )
+        )
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from ats.outbox import process_batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Deliver queued outbox events (webhooks, applicant emails) in batches, "
+        "retrying failures with exponential backoff. Several workers can run at "
+        "once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when no event is due (default: 1).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no event is due instead of polling.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        processed = 0
+        try:
+            while True:
+                attempted = process_batch(batch_size)
+                processed += attempted
+                if attempted < batch_size:
+                    if options["once"]:
+                        break
+                    # Drop broken or expired (CONN_MAX_AGE) connections while
+                    # idle, as Django does between requests.
+                    close_old_connections()
+                    time.sleep(options["poll_interval"])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} event(s)."))
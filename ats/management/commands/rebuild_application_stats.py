@@ -0,0 +1,81 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from ats.models import Application, ArchivedApplication, Job, JobApplicationStats
+
+
+def count_applications_by_job():
+    """
+    Recompute every job's counters from the Application and
+    ArchivedApplication tables
+    """
+    counters = defaultdict(lambda: dict.fromkeys(JobApplicationStats.COUNTER_FIELDS, 0))
+    rows = [
+        row
+        for model in (Application, ArchivedApplication)
+        for row in model.objects.values("job_id", "status")
+        .annotate(count=Count("id"))
+        .order_by()
+    ]
+    for row in rows:
+        job_counters = counters[row["job_id"]]
+        job_counters["total_applications"] += row["count"]
+        job_counters[JobApplicationStats.STATUS_FIELDS[row["status"]]] += row["count"]
+    return counters
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-job application counters and report any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drift without writing the corrected counters.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            # Lock the counters first so concurrent writers queue behind the
+            # rebuild and apply their deltas on top of the recomputed values.
+            existing = {
+                stats.job_id: stats
+                for stats in JobApplicationStats.objects.select_for_update()
+            }
+            counters = count_applications_by_job()
+
+            drifted = []
+            for job_id in Job.objects.order_by("id").values_list("id", flat=True):
+                expected = counters[job_id]
+                stats = existing.get(job_id)
+                actual = {
+                    field: getattr(stats, field, 0)
+                    for field in JobApplicationStats.COUNTER_FIELDS
+                }
+                if stats is not None and actual == expected:
+                    continue
+
+                drifted.append(JobApplicationStats(job_id=job_id, **expected))
+                if actual != expected:
+                    changes = ", ".join(
+                        f"{field} {actual[field]} -> {expected[field]}"
+                        for field in JobApplicationStats.COUNTER_FIELDS
+                        if actual[field] != expected[field]
+                    )
+                    self.stdout.write(f"Job {job_id}: {changes}")
+
+            if not options["dry_run"]:
+                JobApplicationStats.objects.bulk_create(
+                    drifted,
+                    update_conflicts=True,
+                    unique_fields=["job"],
+                    update_fields=JobApplicationStats.COUNTER_FIELDS,
+                )
+
+        verb = "Would rebuild" if options["dry_run"] else "Rebuilt"
+        self.stdout.write(
+            self.style.SUCCESS(f"{verb} counters for {len(drifted)} job(s).")
+        )
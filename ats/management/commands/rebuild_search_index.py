@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from ats import search
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the job and applicant full-text search index, e.g. after a bulk "
+        "load that bypassed save()."
+    )
+
+    def handle(self, *args, **options):
+        search.rebuild()
+        self.stdout.write(self.style.SUCCESS("Rebuilt the search index."))
@@ -0,0 +1,211 @@
+import logging
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.urls import Resolver404, resolve
+
+from ats.routers import (
+    get_replica_alias,
+    is_pinned_to_primary,
+    pin_to_primary,
+    start_replica_reads,
+    stop_replica_reads,
+)
+
+logger = logging.getLogger("ats.sql")
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper that records each statement and its duration
+    """
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            self.statements.append((sql, duration_ms, context["connection"].alias))
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    @property
+    def total_ms(self):
+        return sum(duration for _, duration, _ in self.statements)
+
+    def slowest(self, limit):
+        return sorted(self.statements, key=lambda statement: -statement[1])[:limit]
+
+    def repeated(self, threshold):
+        """
+        Statements whose SQL (ignoring parameters) ran `threshold` or more
+        times, the signature of an N+1 loop
+        """
+        counts = Counter(sql for sql, _, _ in self.statements)
+        return [
+            (sql, count) for sql, count in counts.most_common() if count >= threshold
+        ]
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Count SQL statements and their time per request, report them in response
+    headers and log slow requests and repeated statements.
+
+    Enabled by ATS_SQL_INSTRUMENTATION. Streaming responses only include the
+    queries run before the first chunk, since the rest run after this returns.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.ATS_SQL_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            self.install(stack, recorder)
+            response = self.get_response(request)
+        self.report(request, response, recorder, started)
+        return response
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        # Connections are thread-local, and the async ORM queries from the
+        # request's sync_to_async thread, so install the wrappers there.
+        stack = ExitStack()
+        await sync_to_async(self.install)(stack, recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        self.report(request, response, recorder, started)
+        return response
+
+    def install(self, stack, recorder):
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+
+    def report(self, request, response, recorder, started):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        repeated = recorder.repeated(settings.ATS_SQL_REPEATED_THRESHOLD)
+        response["X-SQL-Query-Count"] = str(recorder.count)
+        response["X-SQL-Query-Time-Ms"] = f"{recorder.total_ms:.1f}"
+        response["X-SQL-Repeated-Statements"] = str(len(repeated))
+
+        if elapsed_ms >= settings.ATS_SLOW_REQUEST_MS:
+            slowest = "\n".join(
+                f"  {duration:.1f}ms [{alias}] {sql}"
+                for sql, duration, alias in recorder.slowest(
+                    settings.ATS_SLOW_REQUEST_STATEMENTS
+                )
+            )
+            logger.warning(
+                "Slow request %s %s: %.1fms, %d queries in %.1fms. Slowest:\n%s",
+                request.method,
+                request.path,
+                elapsed_ms,
+                recorder.count,
+                recorder.total_ms,
+                slowest,
+            )
+        if repeated:
+            logger.warning(
+                "Repeated statements in %s %s (possible N+1):\n%s",
+                request.method,
+                request.path,
+                "\n".join(f"  {count}x {sql}" for sql, count in repeated),
+            )
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Serve safe requests to views marked `read_from_replica = True` from the
+    read replica, unless the client wrote something in the last
+    ATS_REPLICA_PIN_SECONDS; successful writes start that window
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        request.replica_token = None
+        try:
+            response = self.get_response(request)
+        finally:
+            if request.replica_token is not None:
+                stop_replica_reads(request.replica_token)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            pin_to_primary(request)
+        return response
+
+    async def __acall__(self, request):
+        # Django runs a sync process_view() in another context, where a
+        # context variable set for the view would not stick, so decide here.
+        request.replica_token = None
+        try:
+            view_func = resolve(
+                request.path_info, getattr(request, "urlconf", None)
+            ).func
+        except Resolver404:
+            view_func = None
+        if view_func is not None and await sync_to_async(self.reads_from_replica)(
+            request, view_func
+        ):
+            request.replica_token = start_replica_reads()
+        try:
+            response = await self.get_response(request)
+        finally:
+            if request.replica_token is not None:
+                stop_replica_reads(request.replica_token)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            await sync_to_async(pin_to_primary)(request)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not iscoroutinefunction(self) and self.reads_from_replica(
+            request, view_func
+        ):
+            request.replica_token = start_replica_reads()
+
+    def reads_from_replica(self, request, view_func):
+        view_class = getattr(view_func, "view_class", None)
+        return (
+            request.method in SAFE_METHODS
+            and getattr(view_class, "read_from_replica", False)
+            and get_replica_alias() is not None
+            and not is_pinned_to_primary(request)
+        )
@@ -0,0 +1,92 @@
+import logging
+from unittest import mock
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from ats.models import Application, ApplicationNote, Job
+from ats.serializers import ApplicationSerializer
+
+
+@pytest.fixture
+def instrumented(settings):
+    settings.ATS_SQL_INSTRUMENTATION = True
+    settings.ATS_SLOW_REQUEST_MS = 60_000
+    return settings
+
+
+def test_disabled_by_default(api_client, user, application):
+    api_client.force_authenticate(user=user)
+    response = api_client.get(reverse("application-create-list"))
+    assert "X-SQL-Query-Count" not in response
+
+
+def test_reports_query_headers(instrumented, api_client, user, application, caplog):
+    api_client.force_authenticate(user=user)
+
+    with caplog.at_level(logging.WARNING, logger="ats.sql"):
+        response = api_client.get(reverse("application-create-list"))
+
+    # permissions (2) + page (1) + notes prefetch (1)
+    assert response["X-SQL-Query-Count"] == "4"
+    assert float(response["X-SQL-Query-Time-Ms"]) >= 0
+    assert response["X-SQL-Repeated-Statements"] == "0"
+    assert caplog.records == []
+
+
+def test_logs_slow_requests(instrumented, api_client, user, application, caplog):
+    instrumented.ATS_SLOW_REQUEST_MS = 0
+    api_client.force_authenticate(user=user)
+
+    with caplog.at_level(logging.WARNING, logger="ats.sql"):
+        api_client.get(reverse("application-create-list"))
+
+    [record] = caplog.records
+    assert "Slow request GET /api/applications/" in record.getMessage()
+    assert "ats_application" in record.getMessage()
+
+
+def test_flags_n_plus_one(instrumented, api_client, user, applicant, caplog):
+    for i in range(3):
+        job = Job.objects.create(title=f"Job {i}", description="", location="NYC")
+        application = Application.objects.create(applicant=applicant, job=job)
+        ApplicationNote.objects.create(
+            created_by=user, application=application, note="Note"
+        )
+    api_client.force_authenticate(user=user)
+
+    # Simulate a serializer change that drops the notes prefetch.
+    setup_eager_loading = ApplicationSerializer.setup_eager_loading
+    with mock.patch.object(
+        ApplicationSerializer,
+        "setup_eager_loading",
+        lambda queryset, **fieldset: setup_eager_loading(
+            queryset, **fieldset
+        ).prefetch_related(None),
+    ):
+        with caplog.at_level(logging.WARNING, logger="ats.sql"):
+            response = api_client.get(reverse("application-create-list"))
+
+    assert response["X-SQL-Repeated-Statements"] == "1"
+    [record] = caplog.records
+    assert "possible N+1" in record.getMessage()
+    assert 'x SELECT "ats_applicationnote"' in record.getMessage()
+
+
+def test_reports_query_headers_under_asgi(instrumented, user, application):
+    token = Token.objects.create(user=user)
+
+    async def get():
+        return await AsyncClient().get(
+            reverse("async-application-list"),
+            headers={"Authorization": f"Token {token.key}"},
+        )
+
+    response = async_to_sync(get)()
+
+    assert response.status_code == 200
+    # token + user (1), permissions (2), page (1) and notes prefetch (1)
+    assert response["X-SQL-Query-Count"] == "5"
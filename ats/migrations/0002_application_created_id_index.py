@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-18 10:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ats", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(
+                fields=["created_at", "id"], name="ats_app_created_id_idx"
+            ),
+        ),
+    ]
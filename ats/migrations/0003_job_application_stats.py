@@ -0,0 +1,58 @@
+# Generated by Django 4.2 on 2026-10-18 10:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_counters(apps, schema_editor):
+    Application = apps.get_model("ats", "Application")
+    JobApplicationStats = apps.get_model("ats", "JobApplicationStats")
+    status_fields = {
+        "submitted": "submitted_applications",
+        "approved": "approved_applications",
+        "rejected": "rejected_applications",
+    }
+
+    counters = {}
+    rows = (
+        Application.objects.values("job_id", "status")
+        .annotate(count=models.Count("id"))
+        .order_by()
+    )
+    for row in rows:
+        stats = counters.setdefault(
+            row["job_id"], JobApplicationStats(job_id=row["job_id"])
+        )
+        stats.total_applications += row["count"]
+        field = status_fields[row["status"]]
+        setattr(stats, field, getattr(stats, field) + row["count"])
+    JobApplicationStats.objects.bulk_create(counters.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ats", "0002_application_created_id_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobApplicationStats",
+            fields=[
+                (
+                    "job",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="application_stats",
+                        serialize=False,
+                        to="ats.job",
+                    ),
+                ),
+                ("total_applications", models.IntegerField(default=0)),
+                ("submitted_applications", models.IntegerField(default=0)),
+                ("approved_applications", models.IntegerField(default=0)),
+                ("rejected_applications", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 4.2 on 2026-10-18 10:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ats", "0003_job_application_stats"),
+    ]
+
+    operations = [
+        # Create the composite indexes before dropping the FK indexes they replace.
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(
+                fields=["job", "created_at", "id"], name="ats_app_job_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(
+                fields=["job", "status", "created_at", "id"],
+                name="ats_app_job_status_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(
+                fields=["status", "created_at", "id"], name="ats_app_status_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="applicationnote",
+            index=models.Index(
+                fields=["application", "created_at"], name="ats_note_app_created_idx"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="application",
+            name="applicant",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="applications_submitted",
+                to="ats.applicant",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="application",
+            name="job",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="ats.job",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="applicationnote",
+            name="application",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="application_notes",
+                to="ats.application",
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2 on 2026-10-18 10:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ats", "0004_composite_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(
+                fields=["applicant", "created_at", "id"],
+                name="ats_app_applicant_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(
+                fields=["updated_at", "id"], name="ats_app_updated_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(
+                fields=["status", "updated_at", "id"], name="ats_app_status_updated_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2 on 2026-10-18 10:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ats", "0005_filter_indexes"),
+    ]
+
+    operations = [
+        # Create the replacement before dropping the index the FK relies on.
+        migrations.AddIndex(
+            model_name="applicationnote",
+            index=models.Index(
+                fields=["application", "created_at", "id"],
+                name="ats_note_app_created_id_idx",
+            ),
+        ),
+        migrations.RemoveIndex(
+            model_name="applicationnote",
+            name="ats_note_app_created_idx",
+        ),
+    ]
@@ -0,0 +1,95 @@
+from django.db import migrations
+
+# The text indexes behind ats.search. PostgreSQL keeps a weighted tsvector per
+# job and applicant with a GIN index; SQLite, used for local development and
+# tests, keeps FTS5 tables with the same names keyed by rowid.
+CREATE_SQL = {
+    "postgresql": [
+        """
+        CREATE TABLE ats_job_search (
+            job_id bigint PRIMARY KEY
+                REFERENCES ats_job (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED,
+            document tsvector NOT NULL
+        )
+        """,
+        "CREATE INDEX ats_job_search_document_idx ON ats_job_search USING gin (document)",
+        """
+        CREATE TABLE ats_applicant_search (
+            applicant_id bigint PRIMARY KEY
+                REFERENCES ats_applicant (id) ON DELETE CASCADE
+                DEFERRABLE INITIALLY DEFERRED,
+            document tsvector NOT NULL
+        )
+        """,
+        """
+        CREATE INDEX ats_applicant_search_document_idx
+        ON ats_applicant_search USING gin (document)
+        """,
+        """
+        INSERT INTO ats_job_search (job_id, document)
+        SELECT id,
+               setweight(to_tsvector('english', title), 'A')
+               || setweight(to_tsvector('english', description), 'B')
+        FROM ats_job
+        """,
+        """
+        INSERT INTO ats_applicant_search (applicant_id, document)
+        SELECT a.id,
+               setweight(to_tsvector('simple', u.first_name || ' ' || u.last_name), 'A')
+               || setweight(
+                   to_tsvector(
+                       'simple', regexp_replace(u.email, '[^[:alnum:]]+', ' ', 'g')
+                   ),
+                   'B'
+               )
+        FROM ats_applicant a
+        JOIN ats_user u ON u.id = a.user_id
+        """,
+    ],
+    "sqlite": [
+        """
+        CREATE VIRTUAL TABLE ats_job_search
+        USING fts5 (title, description, tokenize = 'porter unicode61')
+        """,
+        """
+        CREATE VIRTUAL TABLE ats_applicant_search
+        USING fts5 (name, email, tokenize = 'unicode61')
+        """,
+        """
+        INSERT INTO ats_job_search (rowid, title, description)
+        SELECT id, title, description FROM ats_job
+        """,
+        """
+        INSERT INTO ats_applicant_search (rowid, name, email)
+        SELECT a.id, u.first_name || ' ' || u.last_name, u.email
+        FROM ats_applicant a
+        JOIN ats_user u ON u.id = a.user_id
+        """,
+    ],
+}
+
+DROP_SQL = [
+    "DROP TABLE IF EXISTS ats_job_search",
+    "DROP TABLE IF EXISTS ats_applicant_search",
+]
+
+
+def create_search_tables(apps, schema_editor):
+    for sql in CREATE_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def drop_search_tables(apps, schema_editor):
+    if schema_editor.connection.vendor in CREATE_SQL:
+        for sql in DROP_SQL:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ats", "0006_note_index_with_id"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_tables, drop_search_tables),
+    ]
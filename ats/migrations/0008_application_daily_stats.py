@@ -0,0 +1,75 @@
+# Generated by Django 4.2 on 2026-10-18 10:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models.functions import TruncDate
+
+
+def backfill_rollups(apps, schema_editor):
+    Application = apps.get_model("ats", "Application")
+    ApplicationDailyStats = apps.get_model("ats", "ApplicationDailyStats")
+    rows = (
+        Application.objects.annotate(day=TruncDate("created_at"))
+        .values("job_id", "day", "status")
+        .annotate(count=models.Count("id"))
+        .order_by()
+    )
+    ApplicationDailyStats.objects.bulk_create(
+        (ApplicationDailyStats(**row) for row in rows.iterator()), batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ats", "0007_search_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ApplicationDailyStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("submitted", "Submitted"),
+                            ("approved", "Approved"),
+                            ("rejected", "Rejected"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "job",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_application_stats",
+                        to="ats.job",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="applicationdailystats",
+            index=models.Index(
+                fields=["day", "status"], name="ats_rollup_day_status_idx"
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="applicationdailystats",
+            unique_together={("job", "day", "status")},
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
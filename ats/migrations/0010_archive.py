@@ -0,0 +1,121 @@
+# Generated by Django 4.2 on 2026-10-18 11:06
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import F
+import django.utils.timezone
+
+
+def backfill_closed_at(apps, schema_editor):
+    # The last update is the best estimate of when an already closed job closed.
+    Job = apps.get_model("ats", "Job")
+    Job.objects.filter(status="closed").update(closed_at=F("updated_at"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ats", "0009_outbox"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedApplication",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("submitted", "Submitted"),
+                            ("approved", "Approved"),
+                            ("rejected", "Rejected"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                (
+                    "archived_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "applicant",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_applications",
+                        to="ats.applicant",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="closed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name="ArchivedApplicationNote",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("note", models.TextField()),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                (
+                    "application",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="notes",
+                        to="ats.archivedapplication",
+                    ),
+                ),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="archivedapplication",
+            name="job",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="archived_applications",
+                to="ats.job",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedapplicationnote",
+            index=models.Index(
+                fields=["application", "created_at", "id"],
+                name="ats_archived_note_app_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedapplication",
+            index=models.Index(
+                fields=["created_at", "id"], name="ats_archived_app_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedapplication",
+            index=models.Index(
+                fields=["job", "created_at", "id"], name="ats_archived_app_job_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedapplication",
+            index=models.Index(
+                fields=["applicant", "created_at", "id"],
+                name="ats_archived_app_applicant_idx",
+            ),
+        ),
+        migrations.RunPython(backfill_closed_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-18 11:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ats", "0010_archive"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="application",
+            name="version",
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
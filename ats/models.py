@@ -1,8 +1,16 @@
+from collections import Counter, defaultdict
+from functools import reduce
+from operator import or_
+
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import NotSupportedError, connections, models, router, transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from phonenumber_field.modelfields import PhoneNumberField
 
+from ats.cache import invalidate_stats
+
 
 class TimestampMixin(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -11,6 +19,14 @@ class TimestampMixin(models.Model):
     class Meta:
         abstract = True
 
+    def save(self, *args, **kwargs):
+        # auto_now sets updated_at on the instance, but a partial save only
+        # writes it when it is listed.
+        update_fields = kwargs.get("update_fields")
+        if update_fields:
+            kwargs["update_fields"] = {*update_fields, "updated_at"}
+        super().save(*args, **kwargs)
+
 
 class Job(TimestampMixin, models.Model):
     title = models.CharField(max_length=200)
@@ -52,6 +68,28 @@ class Job(TimestampMixin, models.Model):
         choices=Status.choices,
         default=Status.OPEN,
     )
+    # When the job was last closed; archive_applications moves the
+    # applications of jobs closed long enough ago out of the hot tables.
+    closed_at = models.DateTimeField(null=True, blank=True)
+
+    def save(self, *args, **kwargs):
+        reopened = self.status != self.Status.CLOSED and self.closed_at is not None
+        if self.status == self.Status.CLOSED:
+            if self.closed_at is None:
+                self.closed_at = timezone.now()
+        else:
+            self.closed_at = None
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "status" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "closed_at"}
+        if not reopened:
+            super().save(*args, **kwargs)
+            return
+        # A reopened job takes its archived applications back, so they are
+        # live again and (applicant, job) stays unique across both tables.
+        with transaction.atomic(using=router.db_for_write(Job, instance=self)):
+            super().save(*args, **kwargs)
+            ArchivedApplication.restore(self.pk)
 
 
 class User(AbstractUser, TimestampMixin):
@@ -67,10 +105,15 @@ class Applicant(TimestampMixin, models.Model):
 
 
 class Application(TimestampMixin, models.Model):
+    # Both foreign keys are served by composite indexes (see Meta) that lead
+    # with the key, so the default single-column indexes would be redundant.
     applicant = models.ForeignKey(
-        "ats.Applicant", on_delete=models.CASCADE, related_name="applications_submitted"
+        "ats.Applicant",
+        on_delete=models.CASCADE,
+        related_name="applications_submitted",
+        db_index=False,
     )
-    job = models.ForeignKey("ats.Job", on_delete=models.CASCADE)
+    job = models.ForeignKey("ats.Job", on_delete=models.CASCADE, db_index=False)
 
     class Status(models.TextChoices):
         SUBMITTED = (
@@ -92,17 +135,738 @@ class Application(TimestampMixin, models.Model):
         default=Status.SUBMITTED,
     )
 
-    def update_status(self, status):
+    # Bumped by every status change; clients send it back to make sure they
+    # decide on the application they last saw.
+    version = models.PositiveIntegerField(default=1)
+
+    # Statuses a decision maker may move an application to.
+    DECISION_STATUSES = [Status.APPROVED, Status.REJECTED]
+    # The statuses each status may change to. A decision can be reversed, but
+    # nothing returns to submitted.
+    TRANSITIONS = {
+        Status.SUBMITTED: [Status.APPROVED, Status.REJECTED],
+        Status.APPROVED: [Status.REJECTED],
+        Status.REJECTED: [Status.APPROVED],
+    }
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            return super().save(*args, **kwargs)
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.apply_counter_changes(
+                [(self.job_id, self.created_at, None, self.status, 1)]
+            )
+
+    @classmethod
+    def submit(cls, applicant, job_id):
+        """
+        Create `applicant`'s application to job `job_id` with one conditional
+        INSERT that only succeeds while the job is open and the applicant has
+        not applied to it yet. Returns the application with its applicant and
+        job loaded. Raises Job.DoesNotExist, JobClosed or DuplicateApplication
+        when nothing was inserted.
+        """
+        connection = connections[router.db_for_write(cls)]
+        now = timezone.now()
+        with transaction.atomic(using=connection.alias):
+            application_id, job = _for_vendor(_SUBMISSIONS, connection)(
+                connection, applicant.pk, job_id, now
+            )
+            if job is None:
+                raise Job.DoesNotExist
+            if application_id is None:
+                if job.status == Job.Status.CLOSED:
+                    raise JobClosed
+                raise DuplicateApplication
+            cls.apply_counter_changes([(job.id, now, None, cls.Status.SUBMITTED, 1)])
+
+        application = cls(
+            id=application_id,
+            applicant=applicant,
+            job=job,
+            status=cls.Status.SUBMITTED,
+            created_at=now,
+            updated_at=now,
+        )
+        application._state.adding = False
+        application._state.db = connection.alias
+        return application
+
+    def update_status(self, status, version=None):
+        """
+        Move this application to `status` with one conditional UPDATE, provided
+        the transition is allowed and, when given, `version` is still current.
+        Raises StatusConflict otherwise and Application.DoesNotExist if the
+        application is gone. Setting the current status again is a no-op.
+        """
+        changed = self.transition([self.pk], status, version)
+        if not changed:
+            current = (
+                Application.objects.filter(pk=self.pk)
+                .values_list("status", "version", "updated_at")
+                .first()
+            )
+            if current is None:
+                raise Application.DoesNotExist
+            if version not in (None, current[1]):
+                raise StatusConflict(
+                    f"Application {self.pk} is at version {current[1]}, "
+                    f"not {version}."
+                )
+            if current[0] != status:
+                raise StatusConflict(
+                    f"Application {self.pk} cannot move from {current[0]} "
+                    f"to {status}."
+                )
+            self.status, self.version, self.updated_at = current
+            return
         self.status = status
-        self.save(update_fields=["status"])
+        self.version, self.updated_at = changed[0][5:]
+
+    @classmethod
+    def bulk_update_status(cls, ids, status):
+        """
+        Set-based update_status for many applications; returns the ids found
+        """
+        found = {row[0] for row in cls.transition(ids, status)}
+        if len(found) < len(set(ids)):
+            # Unchanged because they already have the status, or gone.
+            found.update(
+                cls.objects.filter(id__in=set(ids) - found).values_list("id", flat=True)
+            )
+        return sorted(found)
+
+    @classmethod
+    def transition(cls, ids, status, version=None):
+        """
+        Move the applications in `ids` that may change to `status` (and, when
+        given, are at `version`) with one conditional UPDATE, bumping their
+        version and updated_at, and record the counter changes and outbox
+        events. Returns the changed rows as (id, job_id, applicant_id,
+        created_at, previous_status, version, updated_at) tuples.
+        """
+        sources = [
+            source for source, targets in cls.TRANSITIONS.items() if status in targets
+        ]
+        if not ids or not sources:
+            return []
+        connection = connections[router.db_for_write(cls)]
+        with transaction.atomic(using=connection.alias):
+            changed = _for_vendor(_TRANSITIONS, connection)(
+                connection, ids, sources, status, version
+            )
+            if changed:
+                cls.apply_counter_changes(
+                    (job_id, created_at, previous, status, 1)
+                    for _, job_id, _, created_at, previous, _, _ in changed
+                )
+                OutboxEvent.enqueue(
+                    OutboxEvent.Topic.STATUS_CHANGED,
+                    [
+                        status_changed_payload(
+                            pk, job_id, applicant_id, previous, status
+                        )
+                        for pk, job_id, applicant_id, _, previous, _, _ in changed
+                    ],
+                )
+        return changed
+
+    @staticmethod
+    def apply_counter_changes(changes):
+        """
+        Apply (job_id, created_at, old_status, new_status, count) changes to
+        the counters derived from Application and invalidate the cached stats.
+        old_status is None for newly created applications.
+        Must run in the same transaction as the Application writes.
+        """
+        changes = list(changes)
+        JobApplicationStats.apply_changes(
+            (job_id, old_status, new_status, count)
+            for job_id, _, old_status, new_status, count in changes
+        )
+        ApplicationDailyStats.apply_changes(changes)
+        invalidate_stats()
 
     class Meta:
         unique_together = ["applicant", "job"]
+        # ApplicationFilterBackend derives the accepted filter and ordering
+        # combinations from these indexes.
+        indexes = [
+            # Keyset pagination of the application list and export.
+            models.Index(fields=["created_at", "id"], name="ats_app_created_id_idx"),
+            # ?job= pages, and the ON DELETE CASCADE from Job.
+            models.Index(
+                fields=["job", "created_at", "id"], name="ats_app_job_created_idx"
+            ),
+            # ?job=&status= pages, and the per-job status counts rebuilt by
+            # rebuild_application_stats (index-only).
+            models.Index(
+                fields=["job", "status", "created_at", "id"],
+                name="ats_app_job_status_created_idx",
+            ),
+            # ?status= pages.
+            models.Index(
+                fields=["status", "created_at", "id"],
+                name="ats_app_status_created_idx",
+            ),
+            # ?applicant= pages.
+            models.Index(
+                fields=["applicant", "created_at", "id"],
+                name="ats_app_applicant_created_idx",
+            ),
+            # ?ordering=updated_at pages, with or without ?status=.
+            models.Index(fields=["updated_at", "id"], name="ats_app_updated_id_idx"),
+            models.Index(
+                fields=["status", "updated_at", "id"],
+                name="ats_app_status_updated_idx",
+            ),
+        ]
+
+
+class JobApplicationStats(models.Model):
+    """
+    Per-job application counters, kept in step with Application writes so the
+    stats endpoint never has to aggregate over Application
+    """
+
+    job = models.OneToOneField(
+        Job,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="application_stats",
+    )
+    total_applications = models.IntegerField(default=0)
+    submitted_applications = models.IntegerField(default=0)
+    approved_applications = models.IntegerField(default=0)
+    rejected_applications = models.IntegerField(default=0)
+
+    COUNTER_FIELDS = [
+        "total_applications",
+        "submitted_applications",
+        "approved_applications",
+        "rejected_applications",
+    ]
+    STATUS_FIELDS = {
+        Application.Status.SUBMITTED: "submitted_applications",
+        Application.Status.APPROVED: "approved_applications",
+        Application.Status.REJECTED: "rejected_applications",
+    }
+
+    @classmethod
+    def apply_changes(cls, changes):
+        """
+        Apply (job_id, old_status, new_status, count) changes to the counters.
+        old_status is None for newly created applications.
+        Must run in the same transaction as the Application writes.
+        """
+        deltas = defaultdict(Counter)
+        for job_id, old_status, new_status, count in changes:
+            if old_status is None:
+                deltas[job_id]["total_applications"] += count
+            else:
+                deltas[job_id][cls.STATUS_FIELDS[old_status]] -= count
+            deltas[job_id][cls.STATUS_FIELDS[new_status]] += count
+
+        deltas = {
+            job_id: {field: delta for field, delta in job_deltas.items() if delta}
+            for job_id, job_deltas in deltas.items()
+        }
+        deltas = {
+            job_id: job_deltas for job_id, job_deltas in deltas.items() if job_deltas
+        }
+        if len(deltas) == 1:
+            [(job_id, job_deltas)] = deltas.items()
+            updates = {field: F(field) + delta for field, delta in job_deltas.items()}
+            if not cls.objects.filter(job_id=job_id).update(**updates):
+                cls.objects.get_or_create(job_id=job_id)
+                cls.objects.filter(job_id=job_id).update(**updates)
+        elif deltas:
+            # Batches touch many jobs: make sure every row exists, then apply
+            # all deltas in one UPDATE with a CASE per counter column.
+            cls.objects.bulk_create(
+                [cls(job_id=job_id) for job_id in sorted(deltas)], ignore_conflicts=True
+            )
+            fields = {field for job_deltas in deltas.values() for field in job_deltas}
+            cls.objects.filter(job_id__in=deltas).update(
+                **{
+                    field: F(field)
+                    + Case(
+                        *[
+                            When(job_id=job_id, then=Value(job_deltas[field]))
+                            for job_id, job_deltas in deltas.items()
+                            if field in job_deltas
+                        ],
+                        default=Value(0),
+                    )
+                    for field in fields
+                }
+            )
+
+
+class ApplicationDailyStats(models.Model):
+    """
+    Applications per job, creation day (in TIME_ZONE) and current status, kept
+    in step with Application writes like JobApplicationStats, so trend series
+    never have to aggregate over Application
+    """
+
+    # The unique key leads with job, so no separate index is needed.
+    job = models.ForeignKey(
+        Job,
+        on_delete=models.CASCADE,
+        related_name="daily_application_stats",
+        db_index=False,
+    )
+    day = models.DateField()
+    status = models.CharField(max_length=20, choices=Application.Status.choices)
+    count = models.IntegerField(default=0)
+
+    @classmethod
+    def apply_changes(cls, changes):
+        """
+        Apply (job_id, created_at, old_status, new_status, count) changes to
+        the rollups. old_status is None for newly created applications.
+        Must run in the same transaction as the Application writes.
+        """
+        deltas = Counter()
+        for job_id, created_at, old_status, new_status, count in changes:
+            day = timezone.localdate(created_at)
+            if old_status is not None:
+                deltas[job_id, day, old_status] -= count
+            deltas[job_id, day, new_status] += count
+
+        deltas = {key: delta for key, delta in sorted(deltas.items()) if delta}
+        if not deltas:
+            return
+        # Make sure every row exists, then apply all deltas in one UPDATE.
+        cls.objects.bulk_create(
+            [
+                cls(job_id=job_id, day=day, status=status)
+                for job_id, day, status in deltas
+            ],
+            ignore_conflicts=True,
+        )
+        keys = {
+            (job_id, day, status): Q(job_id=job_id, day=day, status=status)
+            for job_id, day, status in deltas
+        }
+        if len(deltas) == 1:
+            [(key, delta)] = deltas.items()
+            cls.objects.filter(keys[key]).update(count=F("count") + delta)
+        else:
+            cls.objects.filter(reduce(or_, keys.values())).update(
+                count=F("count")
+                + Case(
+                    *[
+                        When(keys[key], then=Value(delta))
+                        for key, delta in deltas.items()
+                    ],
+                    default=Value(0),
+                )
+            )
+
+    class Meta:
+        unique_together = ["job", "day", "status"]
+        indexes = [
+            # Series over all jobs.
+            models.Index(fields=["day", "status"], name="ats_rollup_day_status_idx"),
+        ]
 
 
 class ApplicationNote(TimestampMixin, models.Model):
     created_by = models.ForeignKey(User, on_delete=models.CASCADE)
     application = models.ForeignKey(
-        Application, on_delete=models.CASCADE, related_name="application_notes"
+        Application,
+        on_delete=models.CASCADE,
+        related_name="application_notes",
+        db_index=False,
+    )
+    note = models.TextField()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            return super().save(*args, **kwargs)
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            OutboxEvent.enqueue(OutboxEvent.Topic.NOTE_CREATED, [self.event_payload()])
+
+    def event_payload(self):
+        return {
+            "id": self.pk,
+            "application": self.application_id,
+            "created_by": self.created_by_id,
+            "note": self.note,
+        }
+
+    class Meta:
+        indexes = [
+            # Notes listing and the latest-notes prefetch, newest first, and
+            # the per-application note count (index-only).
+            models.Index(
+                fields=["application", "created_at", "id"],
+                name="ats_note_app_created_id_idx",
+            ),
+        ]
+
+
+class ArchivedApplication(models.Model):
+    """
+    An application moved out of the hot tables by archive_applications after
+    its job was closed. Keeps the original id, columns and timestamps.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    applicant = models.ForeignKey(
+        "ats.Applicant",
+        on_delete=models.CASCADE,
+        related_name="archived_applications",
+        db_index=False,
+    )
+    job = models.ForeignKey(
+        "ats.Job",
+        on_delete=models.CASCADE,
+        related_name="archived_applications",
+        db_index=False,
+    )
+    status = models.CharField(max_length=20, choices=Application.Status.choices)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        # The archive endpoint filters with ApplicationFilterBackend, which
+        # accepts the combinations these indexes serve.
+        indexes = [
+            models.Index(
+                fields=["created_at", "id"], name="ats_archived_app_created_idx"
+            ),
+            models.Index(
+                fields=["job", "created_at", "id"],
+                name="ats_archived_app_job_idx",
+            ),
+            models.Index(
+                fields=["applicant", "created_at", "id"],
+                name="ats_archived_app_applicant_idx",
+            ),
+        ]
+
+    @classmethod
+    def restore(cls, job_id):
+        """
+        Move the job's archived applications and notes back to the live
+        tables, keeping their ids and timestamps; returns how many
+        applications moved. Must run in a transaction.
+        """
+        connection = connections[router.db_for_write(Application)]
+        ids = list(
+            cls.objects.select_for_update()
+            .filter(job_id=job_id)
+            .values_list("id", flat=True)
+        )
+        if not ids:
+            return 0
+        # INSERT ... SELECT rather than bulk_create(), which would overwrite
+        # the auto_now timestamps.
+        qn = connection.ops.quote_name
+        archived = qn(cls._meta.db_table)
+        job = qn(cls._meta.get_field("job").column)
+        columns = _column_list(connection, cls, exclude=["archived_at"])
+        note_columns = _column_list(connection, ArchivedApplicationNote)
+        note_application = ArchivedApplicationNote._meta.get_field("application")
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {qn(Application._meta.db_table)} "
+                f"({columns}, {qn(Application._meta.get_field('version').column)}) "
+                f"SELECT {columns}, 1 FROM {archived} WHERE {job} = %s",
+                [job_id],
+            )
+            cursor.execute(
+                f"INSERT INTO {qn(ApplicationNote._meta.db_table)} ({note_columns}) "
+                f"SELECT {note_columns} "
+                f"FROM {qn(ArchivedApplicationNote._meta.db_table)} "
+                f"WHERE {qn(note_application.column)} IN "
+                f"(SELECT {qn(cls._meta.pk.column)} FROM {archived} WHERE {job} = %s)",
+                [job_id],
+            )
+        ArchivedApplicationNote.objects.filter(application_id__in=ids).delete()
+        cls.objects.filter(id__in=ids).delete()
+        return len(ids)
+
+
+def _column_list(connection, model, exclude=()):
+    return ", ".join(
+        connection.ops.quote_name(field.column)
+        for field in model._meta.concrete_fields
+        if field.name not in exclude
+    )
+
+
+class ArchivedApplicationNote(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE)
+    application = models.ForeignKey(
+        ArchivedApplication,
+        on_delete=models.CASCADE,
+        related_name="notes",
+        db_index=False,
     )
     note = models.TextField()
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["application", "created_at", "id"],
+                name="ats_archived_note_app_idx",
+            ),
+        ]
+
+
+class StatusConflict(Exception):
+    """
+    A status change whose transition or version precondition failed
+    """
+
+
+def _transition_postgresql(connection, ids, sources, status, version):
+    # The CTE locks the rows in id order and captures their previous status,
+    # which RETURNING cannot see otherwise; rows changed concurrently are
+    # re-checked against the WHERE clause before being updated.
+    ids = list(ids)
+    params = [*ids, *sources]
+    id_placeholders = ", ".join(["%s"] * len(ids))
+    status_placeholders = ", ".join(["%s"] * len(sources))
+    version_sql = ""
+    if version is not None:
+        version_sql = " AND version = %s"
+        params.append(version)
+    now = timezone.now()
+    table = connection.ops.quote_name(Application._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH previous AS (
+                SELECT id, status FROM {table}
+                WHERE id IN ({id_placeholders})
+                AND status IN ({status_placeholders}){version_sql}
+                ORDER BY id FOR UPDATE
+            )
+            UPDATE {table}
+            SET status = %s, version = {table}.version + 1, updated_at = %s
+            FROM previous
+            WHERE {table}.id = previous.id
+            RETURNING {table}.id, job_id, applicant_id, created_at,
+                previous.status, version, updated_at
+            """,
+            [*params, status, now],
+        )
+        return sorted(cursor.fetchall())
+
+
+def _transition_sqlite(connection, ids, sources, status, version):
+    # SQLite's RETURNING cannot report the previous status, so it is read
+    # first. SQLite serializes writers, so nothing can change in between.
+    rows = Application.objects.using(connection.alias).filter(
+        id__in=ids, status__in=sources
+    )
+    if version is not None:
+        rows = rows.filter(version=version)
+    rows = list(
+        rows.order_by("id").values_list(
+            "id", "job_id", "applicant_id", "created_at", "status", "version"
+        )
+    )
+    if not rows:
+        return []
+    now = timezone.now()
+    Application.objects.using(connection.alias).filter(
+        id__in=[row[0] for row in rows]
+    ).update(status=status, version=F("version") + 1, updated_at=now)
+    return [(*row[:5], row[5] + 1, now) for row in rows]
+
+
+_TRANSITIONS = {
+    "postgresql": _transition_postgresql,
+    "sqlite": _transition_sqlite,
+}
+
+
+def _for_vendor(implementations, connection):
+    try:
+        return implementations[connection.vendor]
+    except KeyError:
+        raise NotSupportedError(
+            f"Application writes are not supported on {connection.vendor}; "
+            f"use PostgreSQL or SQLite."
+        )
+
+
+class JobClosed(Exception):
+    """
+    An application to a job that is no longer open
+    """
+
+
+class DuplicateApplication(Exception):
+    """
+    A second application by the same applicant to the same job
+    """
+
+
+# Inserts the application only if the job is open, and skips it if the
+# applicant already applied, instead of failing on the unique constraint.
+_SUBMIT_SQL = """
+    INSERT INTO {application}
+        (applicant_id, job_id, status, version, created_at, updated_at)
+    SELECT %s, id, %s, 1, %s, %s FROM {source} WHERE id = %s AND status = %s
+    ON CONFLICT (applicant_id, job_id) DO NOTHING
+    RETURNING id
+"""
+
+
+def _submit_postgresql(connection, applicant_id, job_id, now):
+    # One round trip: the job row, for the response and to tell a closed job
+    # from a duplicate, comes back with the id of the inserted application.
+    qn = connection.ops.quote_name
+    columns = ", ".join(qn(field.column) for field in Job._meta.concrete_fields)
+    now = connection.ops.adapt_datetimefield_value(now)
+    insert = _SUBMIT_SQL.format(
+        application=qn(Application._meta.db_table), source="job"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH job AS (
+                SELECT {columns} FROM {qn(Job._meta.db_table)} WHERE id = %s
+            ),
+            inserted AS ({insert})
+            SELECT inserted.id, job.* FROM job LEFT JOIN inserted ON true
+            """,
+            [
+                job_id,
+                applicant_id,
+                Application.Status.SUBMITTED,
+                now,
+                now,
+                job_id,
+                Job.Status.OPEN,
+            ],
+        )
+        row = cursor.fetchone()
+    if row is None:
+        return None, None
+    return row[0], Job.from_db(
+        connection.alias,
+        [field.attname for field in Job._meta.concrete_fields],
+        row[1:],
+    )
+
+
+def _submit_sqlite(connection, applicant_id, job_id, now):
+    # SQLite has no data-modifying CTEs, so the job is read separately.
+    qn = connection.ops.quote_name
+    now = connection.ops.adapt_datetimefield_value(now)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            _SUBMIT_SQL.format(
+                application=qn(Application._meta.db_table),
+                source=qn(Job._meta.db_table),
+            ),
+            [
+                applicant_id,
+                Application.Status.SUBMITTED,
+                now,
+                now,
+                job_id,
+                Job.Status.OPEN,
+            ],
+        )
+        row = cursor.fetchone()
+    job = Job.objects.using(connection.alias).filter(pk=job_id).first()
+    return (row[0] if row else None), job
+
+
+_SUBMISSIONS = {
+    "postgresql": _submit_postgresql,
+    "sqlite": _submit_sqlite,
+}
+
+
+def status_changed_payload(application_id, job_id, applicant_id, previous, status):
+    return {
+        "application": application_id,
+        "job": job_id,
+        "applicant": applicant_id,
+        "previous_status": previous,
+        "status": status,
+    }
+
+
+class OutboxEvent(models.Model):
+    """
+    A side effect of an application write (webhook call, applicant
+    notification), queued in the same transaction as the write and delivered
+    later by the process_outbox worker (see ats.outbox)
+    """
+
+    class Topic(models.TextChoices):
+        STATUS_CHANGED = (
+            "application.status_changed",
+            _("Application status changed"),
+        )
+        NOTE_CREATED = (
+            "application.note_created",
+            _("Application note created"),
+        )
+
+    class Status(models.TextChoices):
+        PENDING = (
+            "pending",
+            _("Pending"),
+        )
+        DELIVERED = (
+            "delivered",
+            _("Delivered"),
+        )
+        FAILED = (
+            "failed",
+            _("Failed"),
+        )
+
+    topic = models.CharField(max_length=50, choices=Topic.choices)
+    payload = models.JSONField()
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    attempts = models.IntegerField(default=0)
+    # Not delivered before this time; pushed back after each failed attempt.
+    available_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+
+    @classmethod
+    def enqueue(cls, topic, payloads):
+        """
+        Queue one event per payload with a single INSERT. Must run in the same
+        transaction as the write the events describe.
+        """
+        cls.objects.bulk_create(
+            [cls(topic=topic, payload=payload) for payload in payloads]
+        )
+
+    class Meta:
+        indexes = [
+            # The worker's queue: only pending events, in delivery order.
+            models.Index(
+                fields=["available_at", "id"],
+                condition=Q(status="pending"),
+                name="ats_outbox_pending_idx",
+            ),
+        ]
@@ -0,0 +1,157 @@
+import re
+
+import pytest
+from django.db import NotSupportedError, connection
+
+from ats.filters import ApplicationFilterBackend, indexed_combinations
+from ats.models import Applicant, Application, ApplicationNote, Job, User
+from ats.serializers import ApplicationSerializer
+from ats.views import ApplicationCreateListView, ApplicationExportView
+
+PAGE = 51  # a default page plus the look-ahead row
+
+
+def explain(queryset):
+    """
+    Return the database's plan for `queryset` as text
+    """
+    return queryset.explain()
+
+
+def sequential_scans(plan, tables):
+    """
+    Return the tables in `tables` that `plan` reads with a full table scan
+    """
+    if connection.vendor == "postgresql":
+        pattern = r"Seq Scan on (\w+)"
+    elif connection.vendor == "sqlite":
+        # "SCAN t" is a table scan; "SCAN t USING [COVERING] INDEX i" is not.
+        pattern = r"\bSCAN (\w+)(?! USING)(?:\s|$)"
+    else:
+        pytest.skip(f"No plan parser for {connection.vendor}")
+    return sorted({table for table in re.findall(pattern, plan) if table in tables})
+
+
+def assert_no_seq_scan(queryset, tables=None):
+    tables = tables or {queryset.model._meta.db_table}
+    plan = explain(queryset)
+    scanned = sequential_scans(plan, tables)
+    assert not scanned, f"Sequential scan on {', '.join(scanned)}:\n{plan}"
+
+
+@pytest.fixture
+def large_dataset(db):
+    """
+    Enough rows that the planner prefers indexes, with fresh statistics
+    """
+    users = User.objects.bulk_create(
+        User(username=f"seed{i}", email=f"seed{i}@example.com") for i in range(200)
+    )
+    applicants = Applicant.objects.bulk_create(
+        Applicant(
+            user=user,
+            phone_number="+12125550100",
+            linkedin_url="https://www.linkedin.com/in/seed/",
+        )
+        for user in users
+    )
+    jobs = Job.objects.bulk_create(
+        Job(title=f"Job {i}", description="", location="NYC") for i in range(50)
+    )
+    statuses = Application.Status.values
+    applications = Application.objects.bulk_create(
+        Application(
+            applicant=applicant, job=job, status=statuses[(i + j) % len(statuses)]
+        )
+        for i, applicant in enumerate(applicants)
+        for j, job in enumerate(jobs)
+    )
+    ApplicationNote.objects.bulk_create(
+        ApplicationNote(created_by=users[0], application=application, note="Seed")
+        for application in applications[::2]
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    return {"jobs": jobs, "applicants": applicants, "applications": applications}
+
+
+def test_list_queries_use_indexes(large_dataset):
+    job = large_dataset["jobs"][7]
+    queryset = ApplicationCreateListView.queryset.order_by("-created_at", "-id")
+
+    assert_no_seq_scan(queryset[:PAGE])
+    assert_no_seq_scan(queryset.filter(job=job)[:PAGE])
+    assert_no_seq_scan(queryset.filter(status="approved")[:PAGE])
+    assert_no_seq_scan(queryset.filter(job=job, status="approved")[:PAGE])
+
+    # A later page: the keyset predicate must stay an index range.
+    last = large_dataset["applications"][-100]
+    assert_no_seq_scan(
+        queryset.filter(created_at__lte=last.created_at, id__lt=last.id)[:PAGE]
+    )
+
+
+def test_export_query_uses_indexes(large_dataset):
+    job = large_dataset["jobs"][3]
+    queryset = ApplicationExportView.queryset.order_by("created_at", "id")
+
+    assert_no_seq_scan(queryset.filter(job=job))
+    assert_no_seq_scan(queryset.filter(job=job, status="rejected"))
+
+
+def test_notes_prefetch_uses_index(large_dataset):
+    page = [a.id for a in large_dataset["applications"][:PAGE]]
+    assert_no_seq_scan(ApplicationNote.objects.filter(application_id__in=page))
+
+
+def test_bulk_create_duplicate_check_uses_index(large_dataset):
+    applicant_ids = [a.id for a in large_dataset["applicants"][:20]]
+    job_ids = [j.id for j in large_dataset["jobs"][:5]]
+    assert_no_seq_scan(
+        Application.objects.filter(
+            applicant_id__in=applicant_ids, job_id__in=job_ids
+        ).values_list("applicant_id", "job_id")
+    )
+
+
+def test_seq_scan_detection(large_dataset):
+    # The helper must actually catch an unindexed access path.
+    queryset = ApplicationNote.objects.filter(note="Seed")
+    assert sequential_scans(explain(queryset), {"ats_applicationnote"})
+
+
+def test_serializer_eager_loading_has_no_seq_scan(large_dataset):
+    queryset = ApplicationSerializer.setup_eager_loading(Application.objects.all())
+    job = large_dataset["jobs"][0]
+    assert_no_seq_scan(
+        queryset.filter(job=job).order_by("-created_at", "-id")[:PAGE],
+        {"ats_application", "ats_applicant", "ats_user", "ats_job"},
+    )
+
+
+def test_filter_combinations_use_indexes(large_dataset):
+    backend = ApplicationFilterBackend
+    values = {
+        "job": large_dataset["jobs"][5].id,
+        "applicant": large_dataset["applicants"][5].id,
+        "status": "approved",
+    }
+    combinations = indexed_combinations(
+        Application, [*backend.id_params, "status"], backend.ordering_fields
+    )
+    assert combinations["updated_at"]
+
+    for order_field, filter_sets in combinations.items():
+        for fields in filter_sets:
+            queryset = Application.objects.filter(
+                **{field: values[field] for field in fields}
+            ).order_by(f"-{order_field}", "-id")
+            assert_no_seq_scan(queryset[:PAGE])
+
+
+def test_writes_on_an_unsupported_backend(monkeypatch, applicant, job, application):
+    monkeypatch.setattr(connection, "vendor", "oracle")
+    with pytest.raises(NotSupportedError, match="not supported on oracle"):
+        application.update_status(Application.Status.APPROVED)
+    with pytest.raises(NotSupportedError, match="not supported on oracle"):
+        Application.submit(applicant, job.id)
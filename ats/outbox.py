@@ -0,0 +1,154 @@
+"""
+Delivery of OutboxEvent rows, run by `manage.py process_outbox`.
+
+Events are delivered at least once: a retry repeats every handler of the
+event, so webhook receivers should deduplicate on the X-ATS-Event-Id header.
+"""
+import json
+import logging
+import urllib.request
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from ats.models import Job, OutboxEvent, User
+
+logger = logging.getLogger("ats.outbox")
+
+
+def post_webhook(event):
+    if not settings.ATS_WEBHOOK_URL:
+        return
+    body = {
+        "id": event.id,
+        "topic": event.topic,
+        "created_at": event.created_at.isoformat(),
+        "data": event.payload,
+    }
+    request = urllib.request.Request(
+        settings.ATS_WEBHOOK_URL,
+        data=json.dumps(body).encode(),
+        method="POST",
+        headers={
+            "Content-Type": "application/json",
+            "X-ATS-Event-Id": str(event.id),
+        },
+    )
+    # Raises HTTPError for 4xx/5xx responses.
+    with urllib.request.urlopen(request, timeout=settings.ATS_WEBHOOK_TIMEOUT):
+        pass
+
+
+def notify_applicant(event):
+    data = event.payload
+    email = (
+        User.objects.filter(applicant=data["applicant"])
+        .values_list("email", flat=True)
+        .first()
+    )
+    title = Job.objects.filter(pk=data["job"]).values_list("title", flat=True).first()
+    if not email or title is None:
+        return  # Deleted since, or nobody to tell.
+    send_mail(
+        f"Your application for {title}",
+        f"Your application for {title} has been {data['status']}.",
+        None,
+        [email],
+    )
+
+
+# Run in order. The webhook goes first so that a webhook failure does not
+# repeat the applicant's email on retry.
+HANDLERS = {
+    OutboxEvent.Topic.STATUS_CHANGED: [post_webhook, notify_applicant],
+    OutboxEvent.Topic.NOTE_CREATED: [post_webhook],
+}
+
+
+def retry_delay(attempts):
+    """
+    Exponential backoff after the given number of failed attempts
+    """
+    seconds = settings.ATS_OUTBOX_RETRY_SECONDS * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, settings.ATS_OUTBOX_MAX_RETRY_SECONDS))
+
+
+def process_batch(batch_size=100):
+    """
+    Deliver up to `batch_size` due events; returns how many were attempted
+    """
+    events, lease_until = claim_batch(batch_size)
+    attempted = 0
+    for event in events:
+        # Past the lease another worker may claim the rest; leave them to it.
+        if timezone.now() >= lease_until:
+            break
+        attempted += 1
+        deliver(event, lease_until)
+    return attempted
+
+
+def claim_batch(batch_size):
+    """
+    Lease up to `batch_size` due events to this worker by pushing their
+    available_at to the end of the lease; returns (events, lease end)
+    """
+    connection = connections[router.db_for_write(OutboxEvent)]
+    lease_until = timezone.now() + timedelta(seconds=settings.ATS_OUTBOX_LEASE_SECONDS)
+    with transaction.atomic(using=connection.alias):
+        # Concurrent workers skip the rows locked here rather than wait for
+        # them. The locks only last for the claim: delivery happens after the
+        # commit, and a crashed worker's events come due again with its lease.
+        events = list(
+            OutboxEvent.objects.select_for_update(
+                skip_locked=connection.features.has_select_for_update_skip_locked
+            )
+            .filter(status=OutboxEvent.Status.PENDING, available_at__lte=timezone.now())
+            .order_by("available_at", "id")[:batch_size]
+        )
+        OutboxEvent.objects.filter(id__in=[event.id for event in events]).update(
+            available_at=lease_until
+        )
+    return events, lease_until
+
+
+def deliver(event, lease_until):
+    """
+    Run the event's handlers outside any transaction and record the outcome,
+    unless the lease was lost and another worker has claimed the event since
+    """
+    event.attempts += 1
+    event.available_at = lease_until
+    try:
+        for handler in HANDLERS[event.topic]:
+            handler(event)
+    except Exception as exc:
+        event.last_error = f"{type(exc).__name__}: {exc}"
+        if event.attempts >= settings.ATS_OUTBOX_MAX_ATTEMPTS:
+            event.status = OutboxEvent.Status.FAILED
+            logger.error("Giving up on outbox event %s: %s", event.id, exc)
+        else:
+            event.available_at = timezone.now() + retry_delay(event.attempts)
+            logger.warning(
+                "Outbox event %s failed, attempt %s: %s",
+                event.id,
+                event.attempts,
+                exc,
+            )
+    else:
+        event.status = OutboxEvent.Status.DELIVERED
+        event.delivered_at = timezone.now()
+        event.last_error = ""
+
+    OutboxEvent.objects.filter(
+        id=event.id, status=OutboxEvent.Status.PENDING, available_at=lease_until
+    ).update(
+        status=event.status,
+        attempts=event.attempts,
+        available_at=event.available_at,
+        last_error=event.last_error,
+        delivered_at=event.delivered_at,
+    )
@@ -0,0 +1,210 @@
+import json
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.utils import timezone
+
+from ats import outbox
+from ats.models import Application, ApplicationNote, OutboxEvent
+from ats.outbox import process_batch
+
+
+class StubReceiver(ThreadingHTTPServer):
+    """
+    Local webhook receiver: records every POST and answers 500 to the first
+    `failures` of them
+    """
+
+    def __init__(self):
+        self.received = []
+        self.failures = 0
+        super().__init__(("127.0.0.1", 0), StubHandler)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}/hooks/"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.received.append((self.headers, json.loads(body)))
+        if self.server.failures:
+            self.server.failures -= 1
+            self.send_response(500)
+        else:
+            self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def receiver(settings):
+    server = StubReceiver()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    settings.ATS_WEBHOOK_URL = server.url
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_writes_enqueue_events(user, applicant, job, application):
+    application.update_status(Application.Status.APPROVED)
+    application.update_status(Application.Status.APPROVED)  # no change, no event
+    note = ApplicationNote.objects.create(
+        created_by=user, application=application, note="Strong portfolio"
+    )
+    with pytest.raises(RuntimeError), transaction.atomic():
+        application.update_status(Application.Status.REJECTED)
+        raise RuntimeError  # rolls the event back with the write
+
+    events = list(OutboxEvent.objects.order_by("id").values("topic", "payload"))
+    assert events == [
+        {
+            "topic": OutboxEvent.Topic.STATUS_CHANGED,
+            "payload": {
+                "application": application.id,
+                "job": job.id,
+                "applicant": applicant.id,
+                "previous_status": "submitted",
+                "status": "approved",
+            },
+        },
+        {
+            "topic": OutboxEvent.Topic.NOTE_CREATED,
+            "payload": {
+                "id": note.id,
+                "application": application.id,
+                "created_by": user.id,
+                "note": "Strong portfolio",
+            },
+        },
+    ]
+
+    Application.bulk_update_status([application.id], Application.Status.REJECTED)
+    event = OutboxEvent.objects.latest("id")
+    assert event.payload["previous_status"] == "approved"
+    assert event.payload["status"] == "rejected"
+
+
+def test_process_outbox_delivers_events(receiver, user, application):
+    application.update_status(Application.Status.APPROVED)
+    ApplicationNote.objects.create(
+        created_by=user, application=application, note="Strong portfolio"
+    )
+
+    out = StringIO()
+    call_command("process_outbox", "--once", stdout=out)
+    assert "Processed 2 event(s)." in out.getvalue()
+
+    events = list(OutboxEvent.objects.order_by("id"))
+    assert [event.status for event in events] == ["delivered", "delivered"]
+    assert [body["topic"] for _, body in receiver.received] == [
+        "application.status_changed",
+        "application.note_created",
+    ]
+    headers, body = receiver.received[0]
+    assert headers["X-ATS-Event-Id"] == str(events[0].id)
+    assert body["data"]["status"] == "approved"
+
+    # Only decisions are emailed to the applicant.
+    [email] = mail.outbox
+    assert email.to == ["petercho42@gmail.com"]
+    assert email.subject == "Your application for Test Job"
+    assert "approved" in email.body
+
+    assert process_batch() == 0
+
+
+def test_process_outbox_retries_with_backoff(receiver, settings, application):
+    settings.ATS_OUTBOX_MAX_ATTEMPTS = 3
+    application.update_status(Application.Status.APPROVED)
+    event = OutboxEvent.objects.get()
+    receiver.failures = 1
+
+    before = timezone.now()
+    assert process_batch() == 1
+    event.refresh_from_db()
+    assert event.status == OutboxEvent.Status.PENDING
+    assert event.attempts == 1
+    assert event.last_error == "HTTPError: HTTP Error 500: Internal Server Error"
+    assert event.available_at >= before + timedelta(seconds=10)
+    assert mail.outbox == []  # the email waits for the webhook
+
+    # Not due yet.
+    assert process_batch() == 0
+
+    OutboxEvent.objects.update(available_at=timezone.now())
+    assert process_batch() == 1
+    event.refresh_from_db()
+    assert event.status == OutboxEvent.Status.DELIVERED
+    assert event.attempts == 2
+    assert len(receiver.received) == 2
+    assert len(mail.outbox) == 1
+
+    # A receiver that keeps failing exhausts the attempts.
+    application.update_status(Application.Status.REJECTED)
+    receiver.failures = 3
+    for _ in range(3):
+        OutboxEvent.objects.update(available_at=timezone.now())
+        assert process_batch() == 1
+    event = OutboxEvent.objects.latest("id")
+    assert event.status == OutboxEvent.Status.FAILED
+    assert event.attempts == 3
+    assert process_batch() == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_process_outbox_delivers_outside_the_claim(monkeypatch, user, application):
+    for note in ["First", "Second", "Third"]:
+        ApplicationNote.objects.create(
+            created_by=user, application=application, note=note
+        )
+    delivered = []
+
+    def handler(event):
+        # No transaction or row lock is held, and the leased events are not
+        # due for another worker.
+        assert not connection.in_atomic_block
+        assert process_batch() == 0
+        if event.payload["note"] == "Second":
+            raise KeyboardInterrupt  # the worker dies mid-batch
+        delivered.append(event.payload["note"])
+
+    monkeypatch.setitem(outbox.HANDLERS, OutboxEvent.Topic.NOTE_CREATED, [handler])
+    with pytest.raises(KeyboardInterrupt):
+        process_batch()
+    events = OutboxEvent.objects.order_by("id")
+    assert [event.status for event in events] == ["delivered", "pending", "pending"]
+    assert events[1].attempts == 0
+
+    # Once the lease has run out, another worker picks up the rest.
+    OutboxEvent.objects.filter(status="pending").update(available_at=timezone.now())
+    monkeypatch.setitem(
+        outbox.HANDLERS,
+        OutboxEvent.Topic.NOTE_CREATED,
+        [lambda event: delivered.append(event.payload["note"])],
+    )
+    assert process_batch() == 2
+    assert delivered == ["First", "Second", "Third"]
+    assert set(OutboxEvent.objects.values_list("status", flat=True)) == {"delivered"}
+
+
+def test_process_outbox_stops_at_the_end_of_the_lease(settings, user, application):
+    settings.ATS_OUTBOX_LEASE_SECONDS = 0
+    ApplicationNote.objects.create(
+        created_by=user, application=application, note="Strong portfolio"
+    )
+    assert process_batch() == 0
+    event = OutboxEvent.objects.get()
+    assert event.status == OutboxEvent.Status.PENDING
+    assert event.attempts == 0
@@ -0,0 +1,204 @@
+import json
+from base64 import b64decode, b64encode
+from collections import namedtuple
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import models
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+Keyset = namedtuple("Keyset", ["reverse", "position"])
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination keyed on the full ordering tuple, e.g. (created_at, id).
+
+    DRF's CursorPagination only encodes the first ordering field and falls back
+    to an OFFSET for ties. Here the cursor carries a value for every ordering
+    field and the next page is fetched with a keyset predicate, so every page
+    is a bounded index range scan no matter how deep the client pages.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        The queryset for the requested page, left unevaluated so async views
+        can fetch it with the async ORM before calling set_page()
+        """
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.fields = [self._get_field(queryset.model, name) for name in self.ordering]
+        self.cursor = self.decode_cursor(request)
+
+        self.reverse = self.cursor is not None and self.cursor.reverse
+        ordering = _invert(self.ordering) if self.reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            queryset = queryset.filter(_keyset_filter(ordering, self.cursor.position))
+
+        # Fetch one extra row to find out whether there is a following page.
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, results):
+        has_following = len(results) > self.page_size
+        self.page = results[: self.page_size]
+
+        if self.reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = self.cursor is not None
+
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        # The keyset must be unique, so always break ties on the primary key.
+        if not {"id", "-id", "pk", "-pk"} & set(ordering):
+            tiebreaker = "-id" if ordering[-1].startswith("-") else "id"
+            ordering = ordering + (tiebreaker,)
+        return ordering
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        position = self._get_position_from_instance(self.page[-1], self.ordering)
+        return self.encode_cursor(Keyset(reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        position = self._get_position_from_instance(self.page[0], self.ordering)
+        return self.encode_cursor(Keyset(reverse=True, position=position))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            tokens = json.loads(b64decode(encoded.encode("ascii"), validate=True))
+            raw_position = tokens["p"]
+            if len(raw_position) != len(self.fields):
+                raise ValueError("Cursor does not match the ordering.")
+            position = [
+                field.to_python(value)
+                for field, value in zip(self.fields, raw_position)
+            ]
+            reverse = bool(tokens.get("r", 0))
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Keyset(reverse=reverse, position=position)
+
+    def encode_cursor(self, cursor):
+        tokens = {"p": [_jsonable(value) for value in cursor.position]}
+        if cursor.reverse:
+            tokens["r"] = 1
+
+        encoded = b64encode(json.dumps(tokens, separators=(",", ":")).encode("ascii"))
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded.decode("ascii")
+        )
+
+    def _get_position_from_instance(self, instance, ordering):
+        position = []
+        for field in self.fields:
+            if isinstance(instance, dict):
+                position.append(instance[field.attname])
+            else:
+                position.append(getattr(instance, field.attname))
+        return position
+
+    def _get_field(self, model, ordering_name):
+        name = ordering_name.lstrip("-")
+        if name == "pk":
+            return model._meta.pk
+        try:
+            return model._meta.get_field(name)
+        except FieldDoesNotExist:
+            raise AssertionError(
+                f"Keyset pagination cannot order by {name!r}: it is not a field on "
+                f"{model.__name__}."
+            )
+
+
+class SearchCursorPagination(KeysetCursorPagination):
+    """
+    Forward-only keyset pagination over ranked search hits, keyed on the
+    (rank, id) pairs returned by ats.search.search_applications()
+    """
+
+    ordering = ("-rank", "-id")
+    fields = [models.FloatField(), models.BigIntegerField()]
+
+    def paginate_search(self, search, request):
+        """
+        Fetch a page of hits with search(after=keyset, limit=rows)
+        """
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is not None and self.cursor.reverse:
+            raise NotFound(self.invalid_cursor_message)
+
+        self.reverse = False
+        after = self.cursor.position if self.cursor is not None else None
+        return self.set_page(search(after=after, limit=self.page_size + 1))
+
+    def get_previous_link(self):
+        return None
+
+    def _get_position_from_instance(self, instance, ordering):
+        application_id, rank = instance
+        return [rank, application_id]
+
+
+def _invert(ordering):
+    return tuple(name[1:] if name.startswith("-") else f"-{name}" for name in ordering)
+
+
+def _keyset_filter(ordering, position):
+    """
+    Rows strictly after `position` in `ordering`, i.e. the row-value comparison
+    (f1, f2, ...) > (v1, v2, ...) spelled out so it works with mixed directions.
+    """
+    keyset = Q()
+    for index, name in enumerate(ordering):
+        lookup = "lt" if name.startswith("-") else "gt"
+        clause = Q(**{f"{name.lstrip('-')}__{lookup}": position[index]})
+        for previous, value in zip(ordering[:index], position[:index]):
+            clause &= Q(**{previous.lstrip("-"): value})
+        keyset |= clause
+
+    # Redundant bound on the leading column, so the planner can turn it into
+    # an index range condition instead of evaluating the OR for every row.
+    leading = ordering[0]
+    bound = "lte" if leading.startswith("-") else "gte"
+    return Q(**{f"{leading.lstrip('-')}__{bound}": position[0]}) & keyset
+
+
+def _jsonable(value):
+    if hasattr(value, "isoformat"):
+        # Keep full microsecond precision; DjangoJSONEncoder truncates to
+        # milliseconds, which would skip or repeat rows on the page boundary.
+        return value.isoformat()
+    return value
@@ -0,0 +1,35 @@
+from functools import lru_cache
+
+from rest_framework.compat import LONG_SEPARATORS, SHORT_SEPARATORS
+from rest_framework.renderers import JSONRenderer
+
+
+@lru_cache
+def _encoder(encoder_class, ensure_ascii, allow_nan, separators):
+    return encoder_class(
+        ensure_ascii=ensure_ascii, allow_nan=allow_nan, separators=separators
+    )
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer with one shared encoder for unindented responses, instead of
+    a json.dumps() call building a new one each time. The output is the same.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if data is None or indent is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        encoder = _encoder(
+            self.encoder_class,
+            self.ensure_ascii,
+            not self.strict,
+            SHORT_SEPARATORS if self.compact else LONG_SEPARATORS,
+        )
+        ret = encoder.encode(data)
+        # Like JSONRenderer: U+2028 and U+2029 are valid JSON but not valid
+        # JavaScript string literals.
+        if "\u2028" in ret or "\u2029" in ret:
+            ret = ret.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029")
+        return ret.encode()
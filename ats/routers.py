@@ -0,0 +1,97 @@
+import hashlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+
+# Set for the duration of a request whose view may read from the replica.
+_read_from_replica = ContextVar("ats_read_from_replica", default=False)
+
+
+def get_replica_alias():
+    """
+    The configured replica alias, or None when no replica is configured
+    """
+    alias = settings.ATS_READ_REPLICA
+    return alias if alias in connections.databases else None
+
+
+def replica_enabled():
+    return _read_from_replica.get() and get_replica_alias() is not None
+
+
+def start_replica_reads():
+    """
+    Route reads in the current context to the replica; returns a token for
+    stop_replica_reads()
+    """
+    return _read_from_replica.set(True)
+
+
+def stop_replica_reads(token):
+    _read_from_replica.reset(token)
+
+
+@contextmanager
+def read_from_replica():
+    token = start_replica_reads()
+    try:
+        yield
+    finally:
+        stop_replica_reads(token)
+
+
+def _pin_key(request):
+    # Pin on the credential rather than request.user: DRF authenticates inside
+    # the view, after the routing decision has to be made.
+    credential = request.META.get("HTTP_AUTHORIZATION") or request.COOKIES.get(
+        settings.SESSION_COOKIE_NAME
+    )
+    if not credential:
+        return None
+    return "ats:pin:" + hashlib.sha256(credential.encode()).hexdigest()
+
+
+def _pin_cache():
+    return caches[settings.ATS_REPLICA_PIN_CACHE]
+
+
+def pin_to_primary(request):
+    """
+    Send this client's reads to the primary for ATS_REPLICA_PIN_SECONDS, so it
+    sees its own writes while the replica catches up
+    """
+    key = _pin_key(request)
+    if key is not None:
+        _pin_cache().set(key, True, timeout=settings.ATS_REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(request):
+    key = _pin_key(request)
+    return key is not None and _pin_cache().get(key, False)
+
+
+class PrimaryReplicaRouter:
+    """
+    Route reads to ATS_READ_REPLICA inside read_from_replica(); everything
+    else, including all writes, goes to the default database
+    """
+
+    def db_for_read(self, model, **hints):
+        if replica_enabled():
+            return get_replica_alias()
+        return None
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == settings.ATS_READ_REPLICA:
+            return False
+        return None
@@ -0,0 +1,103 @@
+import pytest
+from django.db import connections
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from ats.models import Application
+from ats.routers import (
+    PrimaryReplicaRouter,
+    is_pinned_to_primary,
+    pin_to_primary,
+    read_from_replica,
+)
+
+
+def test_router_only_reads_from_replica_when_asked(settings, monkeypatch):
+    settings.ATS_READ_REPLICA = "replica"
+    monkeypatch.setattr("ats.routers.get_replica_alias", lambda: "replica")
+    router = PrimaryReplicaRouter()
+
+    assert router.db_for_read(Application) is None
+    with read_from_replica():
+        assert router.db_for_read(Application) == "replica"
+        assert router.db_for_write(Application) is None
+    assert router.db_for_read(Application) is None
+
+    assert router.allow_migrate("replica", "ats") is False
+    assert router.allow_migrate("default", "ats") is None
+
+
+def test_pin_to_primary_is_per_credential(settings):
+    settings.ATS_REPLICA_PIN_SECONDS = 5
+    factory = RequestFactory()
+    writer = factory.post("/", HTTP_AUTHORIZATION="Token abc")
+    reader = factory.get("/", HTTP_AUTHORIZATION="Token abc")
+    other_reader = factory.get("/", HTTP_AUTHORIZATION="Token xyz")
+    anonymous = factory.post("/")
+
+    assert not is_pinned_to_primary(reader)
+    pin_to_primary(writer)
+    pin_to_primary(anonymous)
+    assert is_pinned_to_primary(reader)
+    assert not is_pinned_to_primary(other_reader)
+    assert not is_pinned_to_primary(factory.get("/"))
+
+
+def test_pin_to_primary_is_seen_by_other_workers(settings, tmp_path):
+    # Two cache instances over the same storage, as two worker processes
+    # would have.
+    shared = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": str(tmp_path),
+    }
+    settings.CACHES = {"default": shared, "worker_a": shared, "worker_b": shared}
+    request = RequestFactory().post("/", HTTP_AUTHORIZATION="Token abc")
+
+    settings.ATS_REPLICA_PIN_CACHE = "worker_a"
+    pin_to_primary(request)
+    settings.ATS_REPLICA_PIN_CACHE = "worker_b"
+    assert is_pinned_to_primary(request)
+
+
+@pytest.fixture
+def token_client(api_client, user):
+    token = Token.objects.create(user=user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return api_client
+
+
+# The replica is a separate connection, so test data must be committed.
+@pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+def test_list_reads_from_replica_until_the_client_writes(
+    token_client, applicant, application, job
+):
+    url = reverse("application-create-list")
+
+    with CaptureQueriesContext(connections["replica"]) as replica:
+        response = token_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert any("ats_application" in q["sql"] for q in replica.captured_queries)
+
+    approval_url = reverse("application-approval", kwargs={"pk": application.id})
+    with CaptureQueriesContext(connections["replica"]) as replica:
+        response = token_client.patch(approval_url, {"status": "approved"})
+    assert response.status_code == status.HTTP_200_OK
+    assert replica.captured_queries == []
+
+    # Pinned: the client's next reads see its own write on the primary.
+    with CaptureQueriesContext(connections["replica"]) as replica:
+        response = token_client.get(url)
+    assert response.data["results"][0]["status"] == "approved"
+    assert replica.captured_queries == []
+
+
+# The replica is a separate connection, so test data must be committed.
+@pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+def test_stats_read_from_replica(token_client, application):
+    with CaptureQueriesContext(connections["replica"]) as replica:
+        response = token_client.get(reverse("application-stats"))
+    assert response.status_code == status.HTTP_200_OK
+    assert any("ats_jobapplicationstats" in q["sql"] for q in replica.captured_queries)
@@ -0,0 +1,258 @@
+"""
+Full-text search over job titles and descriptions and applicant names and
+emails, used by the application search endpoint.
+
+Each vendor keeps its own text index next to the source tables (created by
+migration 0007):
+
+- PostgreSQL: ats_job_search and ats_applicant_search hold a weighted
+  tsvector per job and per applicant, each with a GIN index.
+- SQLite: FTS5 virtual tables of the same names, keyed by rowid, so the
+  feature can be developed and tested locally.
+
+The signals in ats.signals refresh a document whenever its job, applicant or
+user is saved. Bulk loads that bypass save() call rebuild() afterwards (the
+rebuild_search_index command).
+"""
+import re
+
+from django.db import NotSupportedError, connections, router, transaction
+
+from ats.models import Applicant, Application, Job, User
+
+MAX_TERMS = 8
+
+TABLES = {"jobs": "ats_job_search", "applicants": "ats_applicant_search"}
+
+# The statements below name the search tables, which migration 0007 owns,
+# literally; {job}, {applicant}, {user} and {application} are the models'
+# tables (see _model_tables()).
+
+# Upsert the documents of the jobs/applicants matched by {where}.
+_INDEX_SQL = {
+    "postgresql": {
+        "jobs": """
+            INSERT INTO ats_job_search (job_id, document)
+            SELECT j.id,
+                   setweight(to_tsvector('english', j.title), 'A')
+                   || setweight(to_tsvector('english', j.description), 'B')
+            FROM {job} j
+            {where}
+            ON CONFLICT (job_id) DO UPDATE SET document = EXCLUDED.document
+        """,
+        "applicants": """
+            INSERT INTO ats_applicant_search (applicant_id, document)
+            SELECT a.id,
+                   setweight(
+                       to_tsvector('simple', u.first_name || ' ' || u.last_name),
+                       'A'
+                   )
+                   || setweight(
+                       to_tsvector(
+                           'simple', regexp_replace(u.email, '[^[:alnum:]]+', ' ', 'g')
+                       ),
+                       'B'
+                   )
+            FROM {applicant} a
+            JOIN {user} u ON u.id = a.user_id
+            {where}
+            ON CONFLICT (applicant_id) DO UPDATE SET document = EXCLUDED.document
+        """,
+    },
+    "sqlite": {
+        "jobs": """
+            INSERT INTO ats_job_search (rowid, title, description)
+            SELECT j.id, j.title, j.description
+            FROM {job} j
+            {where}
+        """,
+        "applicants": """
+            INSERT INTO ats_applicant_search (rowid, name, email)
+            SELECT a.id, u.first_name || ' ' || u.last_name, u.email
+            FROM {applicant} a
+            JOIN {user} u ON u.id = a.user_id
+            {where}
+        """,
+    },
+}
+
+# Delete the documents of the jobs/applicants with the given {ids}.
+_REMOVE_SQL = {
+    "postgresql": {
+        "jobs": "DELETE FROM ats_job_search WHERE job_id IN ({ids})",
+        "applicants": "DELETE FROM ats_applicant_search WHERE applicant_id IN ({ids})",
+    },
+    "sqlite": {
+        "jobs": "DELETE FROM ats_job_search WHERE rowid IN ({ids})",
+        "applicants": "DELETE FROM ats_applicant_search WHERE rowid IN ({ids})",
+    },
+}
+
+# Applications whose job or applicant matches every term, best match first.
+# A match on both adds the two ranks. {after} is the keyset of the last row
+# of the previous page.
+_SEARCH_SQL = {
+    "postgresql": """
+        WITH hits AS (
+            SELECT a.id, ts_rank(s.document, q.query) AS rank
+            FROM ats_job_search s
+            CROSS JOIN to_tsquery('english', %s) AS q (query)
+            JOIN {application} a ON a.job_id = s.job_id
+            WHERE s.document @@ q.query
+            UNION ALL
+            SELECT a.id, ts_rank(s.document, q.query)
+            FROM ats_applicant_search s
+            CROSS JOIN to_tsquery('simple', %s) AS q (query)
+            JOIN {application} a ON a.applicant_id = s.applicant_id
+            WHERE s.document @@ q.query
+        ), ranked AS (
+            SELECT id, SUM(rank)::float8 AS rank FROM hits GROUP BY id
+        )
+        SELECT id, rank FROM ranked
+        {after}
+        ORDER BY rank DESC, id DESC
+        LIMIT %s
+    """,
+    "sqlite": """
+        WITH hits AS (
+            SELECT a.id AS id, -bm25(ats_job_search, 10.0, 1.0) AS rank
+            FROM ats_job_search
+            JOIN {application} a ON a.job_id = ats_job_search.rowid
+            WHERE ats_job_search MATCH %s
+            UNION ALL
+            SELECT a.id, -bm25(ats_applicant_search, 10.0, 5.0)
+            FROM ats_applicant_search
+            JOIN {application} a ON a.applicant_id = ats_applicant_search.rowid
+            WHERE ats_applicant_search MATCH %s
+        ), ranked AS (
+            SELECT id, SUM(rank) AS rank FROM hits GROUP BY id
+        )
+        SELECT id, rank FROM ranked
+        {after}
+        ORDER BY rank DESC, id DESC
+        LIMIT %s
+    """,
+}
+
+
+def search_terms(query):
+    """
+    The lowercased words of a search box query, at most MAX_TERMS of them
+    """
+    return re.findall(r"[^\W_]+", query.lower())[:MAX_TERMS]
+
+
+def search_applications(terms, after=None, limit=20):
+    """
+    [(application id, rank)] for applications whose job or applicant matches
+    every term as a prefix, ordered by rank then id, both descending, and
+    starting after the (rank, id) keyset `after`
+    """
+    connection = connections[router.db_for_read(Application)]
+    sql = _get_sql(_SEARCH_SQL, connection)
+    tables = _model_tables(connection)
+    if connection.vendor == "postgresql":
+        query = " & ".join(f"{term}:*" for term in terms)
+    else:
+        query = " ".join(f'"{term}"*' for term in terms)
+
+    params = [query, query]
+    if after is not None:
+        sql = sql.format(after="WHERE (rank, id) < (%s, %s)", **tables)
+        params.extend(after)
+    else:
+        sql = sql.format(after="", **tables)
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def index_jobs(ids, using="default"):
+    """
+    Refresh the search documents of the given jobs
+    """
+    _refresh("jobs", "WHERE j.id IN ({ids})", ids, using)
+
+
+def index_applicants(ids=None, user_ids=None, using="default"):
+    """
+    Refresh the search documents of the given applicants, or of the
+    applicants of the given users
+    """
+    if user_ids is not None:
+        column, ids = "a.user_id", user_ids
+    else:
+        column = "a.id"
+    _refresh("applicants", f"WHERE {column} IN ({{ids}})", ids, using)
+
+
+def remove_documents(kind, ids, using="default"):
+    """
+    Drop the search documents of deleted "jobs" or "applicants"
+    """
+    ids = list(ids)
+    if not ids:
+        return
+    connection = connections[using]
+    sql = _get_sql(_REMOVE_SQL, connection)[kind]
+    with connection.cursor() as cursor:
+        cursor.execute(sql.format(ids=_placeholders(ids)), ids)
+
+
+def rebuild(using="default"):
+    """
+    Rebuild every search document from the source tables
+    """
+    connection = connections[using]
+    tables = _model_tables(connection)
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        for kind, sql in _get_sql(_INDEX_SQL, connection).items():
+            cursor.execute(f"DELETE FROM {TABLES[kind]}")
+            cursor.execute(sql.format(where="", **tables))
+
+
+def _refresh(kind, where, ids, using):
+    ids = list(ids)
+    if not ids:
+        return
+    connection = connections[using]
+    sql = _get_sql(_INDEX_SQL, connection)[kind]
+    tables = _model_tables(connection)
+    where = where.format(ids=_placeholders(ids))
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            # FTS5 tables have no upsert: replace the rows instead.
+            if kind == "jobs":
+                source, key = f"{tables['job']} j", "j.id"
+            else:
+                source, key = f"{tables['applicant']} a", "a.id"
+            remove = _REMOVE_SQL["sqlite"][kind].format(
+                ids=f"SELECT {key} FROM {source} {where}"
+            )
+            cursor.execute(remove, ids)
+        cursor.execute(sql.format(where=where, **tables), ids)
+
+
+def _get_sql(statements, connection):
+    try:
+        return statements[connection.vendor]
+    except KeyError:
+        raise NotSupportedError(
+            f"Full-text search is not supported on {connection.vendor}."
+        )
+
+
+def _model_tables(connection):
+    qn = connection.ops.quote_name
+    return {
+        "job": qn(Job._meta.db_table),
+        "applicant": qn(Applicant._meta.db_table),
+        "user": qn(User._meta.db_table),
+        "application": qn(Application._meta.db_table),
+    }
+
+
+def _placeholders(values):
+    return ", ".join(["%s"] * len(values))
@@ -0,0 +1,434 @@
+import math
+import random
+from bisect import bisect
+from contextlib import contextmanager
+from datetime import timedelta
+from io import StringIO
+from itertools import islice
+
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+from ats.cache import bump_stats_version
+from ats.models import Applicant, Application, ApplicationNote, Job, User
+
+
+def seed_applications(applications, notes_per_application=1, batch_size=2000):
+    """
+    Bulk-insert `applications` applications with the jobs, applicants, users
+    and notes they need. Returns the created jobs and applicants.
+    """
+    job_count = max(10, applications // 100)
+    applicant_count = max(1, math.ceil(applications / job_count))
+    offset = User.objects.count()
+
+    with transaction.atomic():
+        users = User.objects.bulk_create(
+            (
+                User(
+                    username=f"seed-{offset + i}",
+                    email=f"seed-{offset + i}@example.com",
+                    first_name="Seed",
+                    last_name=f"User {offset + i}",
+                    password="!",
+                )
+                for i in range(applicant_count)
+            ),
+            batch_size=batch_size,
+        )
+        applicants = Applicant.objects.bulk_create(
+            (
+                Applicant(
+                    user=user,
+                    phone_number=f"+1212{2000000 + i:07d}",
+                    linkedin_url=f"https://www.linkedin.com/in/{user.username}/",
+                )
+                for i, user in enumerate(users)
+            ),
+            batch_size=batch_size,
+        )
+        jobs = Job.objects.bulk_create(
+            (
+                Job(
+                    title=f"Seed Job {i}",
+                    description="Seeded for benchmarking.",
+                    location="NYC",
+                )
+                for i in range(job_count)
+            ),
+            batch_size=batch_size,
+        )
+
+        statuses = Application.Status.values
+        author = users[0]
+        # Each applicant applies to consecutive jobs, so (applicant, job)
+        # pairs never collide with unique_together.
+        for start in range(0, applications, batch_size):
+            batch = Application.objects.bulk_create(
+                Application(
+                    applicant=applicants[i // job_count],
+                    job=jobs[i % job_count],
+                    status=statuses[i % len(statuses)],
+                )
+                for i in range(start, min(start + batch_size, applications))
+            )
+            ApplicationNote.objects.bulk_create(
+                ApplicationNote(
+                    created_by=author, application=application, note=f"Seed note {n}"
+                )
+                for application in batch
+                for n in range(notes_per_application)
+            )
+
+    # bulk_create skips save() and its signals, so recompute the derived
+    # counters and the search index.
+    call_command("rebuild_application_stats", stdout=StringIO())
+    call_command("backfill_application_rollups", stdout=StringIO())
+    call_command("rebuild_search_index", stdout=StringIO())
+    bump_stats_version()
+    return jobs, applicants
+
+
+# Real NANP area codes, so generated numbers pass PhoneNumberField validation.
+AREA_CODES = [
+    "202",
+    "206",
+    "212",
+    "213",
+    "303",
+    "305",
+    "310",
+    "312",
+    "347",
+    "404",
+    "415",
+    "512",
+    "602",
+    "617",
+    "646",
+    "650",
+    "702",
+    "718",
+    "773",
+    "917",
+]
+FIRST_NAMES = [
+    "Ada",
+    "Ben",
+    "Chloe",
+    "Daniel",
+    "Elena",
+    "Farid",
+    "Grace",
+    "Hiro",
+    "Ines",
+    "Jamal",
+    "Kara",
+    "Liam",
+    "Maya",
+    "Noah",
+    "Olga",
+    "Priya",
+    "Quinn",
+    "Rosa",
+    "Sam",
+    "Tariq",
+    "Uma",
+    "Victor",
+    "Wen",
+    "Yara",
+    "Zoe",
+]
+LAST_NAMES = [
+    "Adams",
+    "Baker",
+    "Chen",
+    "Diaz",
+    "Evans",
+    "Garcia",
+    "Huang",
+    "Ito",
+    "Kim",
+    "Lopez",
+    "Miller",
+    "Nguyen",
+    "Okafor",
+    "Patel",
+    "Rossi",
+    "Silva",
+    "Smith",
+    "Tanaka",
+    "Walker",
+    "Young",
+]
+JOB_TITLES = [
+    "Backend Engineer",
+    "Frontend Engineer",
+    "Data Engineer",
+    "Site Reliability Engineer",
+    "Product Manager",
+    "Product Designer",
+    "Data Scientist",
+    "Engineering Manager",
+    "QA Engineer",
+    "Security Engineer",
+    "Technical Writer",
+    "Solutions Architect",
+]
+LOCATIONS = ["NYC", "San Francisco", "Chicago", "Austin", "Seattle", "Remote"]
+NOTES = [
+    "Strong portfolio.",
+    "Schedule a phone screen.",
+    "Great culture fit.",
+    "Missing required experience.",
+    "Follow up on references.",
+    "Passed the technical interview.",
+    "Salary expectations above range.",
+]
+DEFAULT_STATUS_MIX = {
+    Application.Status.SUBMITTED: 60,
+    Application.Status.APPROVED: 25,
+    Application.Status.REJECTED: 15,
+}
+
+
+def parse_status_mix(value):
+    """
+    Parse "submitted=60,approved=25,rejected=15" into {status: weight}
+    """
+    mix = {}
+    for part in value.split(","):
+        status, _, weight = part.partition("=")
+        status = status.strip()
+        if status not in Application.Status.values:
+            raise ValueError(f"Unknown application status {status!r}.")
+        mix[status] = float(weight)
+        if mix[status] < 0:
+            raise ValueError(f"Negative weight for {status!r}.")
+    if not sum(mix.values()):
+        raise ValueError("The status mix needs a positive weight.")
+    return mix
+
+
+def generate_dataset(
+    applications,
+    jobs=None,
+    applicants=None,
+    recruiters=50,
+    status_mix=None,
+    notes_per_application=1.0,
+    closed_jobs=0.1,
+    end=None,
+    days=365,
+    seed=0,
+    prefix="load",
+    batch_size=5000,
+    log=None,
+):
+    """
+    Generate a production-shaped dataset: users, applicants with valid phone
+    numbers, jobs, applications with the given status mix spread over `days`
+    days before `end`, and on average `notes_per_application` notes each.
+
+    Rows are inserted with bulk_create, one transaction per batch, and the
+    same seed (and end) always generates the same data. Returns the number
+    of rows created per model.
+    """
+    # One stream per kind of row, so the data does not depend on how the
+    # inserts are batched.
+    rng = {
+        kind: random.Random(f"{seed}:{kind}")
+        for kind in ["users", "applicants", "jobs", "applications", "notes"]
+    }
+    jobs = jobs or max(10, applications // 200)
+    applicants = applicants or max(1, math.ceil(applications / 3))
+    if applications > jobs * applicants:
+        raise ValueError(
+            f"{applicants} applicants cannot apply {applications} times to "
+            f"{jobs} jobs: each applicant applies to a job at most once."
+        )
+    status_mix = status_mix or DEFAULT_STATUS_MIX
+    statuses = list(status_mix)
+    cumulative = [0.0]
+    for status in statuses:
+        cumulative.append(cumulative[-1] + status_mix[status])
+    cumulative = cumulative[1:]
+    end = end or timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    start = end - timedelta(days=days)
+    span = (end - start).total_seconds()
+
+    def progress(label, done, total):
+        if log:
+            log(f"{label}: {done}/{total}")
+
+    def user(i, kind):
+        first, last = rng["users"].choice(FIRST_NAMES), rng["users"].choice(LAST_NAMES)
+        joined = start - timedelta(seconds=rng["users"].uniform(0, span))
+        return User(
+            username=f"{prefix}-{kind}-{i}",
+            email=f"{first}.{last}.{i}@example.com".lower(),
+            first_name=first,
+            last_name=last,
+            password="!",
+            date_joined=joined,
+            created_at=joined,
+            updated_at=joined,
+        )
+
+    counts = {}
+    with _manual_timestamps(User, Applicant, Job, Application, ApplicationNote):
+        recruiter_ids = _insert(
+            User, (user(i, "recruiter") for i in range(recruiters)), batch_size
+        )
+        applicant_ids = []
+        users = (user(i, "applicant") for i in range(applicants))
+        for batch in _batches(users, batch_size):
+            with transaction.atomic():
+                batch = User.objects.bulk_create(batch)
+                applicant_ids += [
+                    applicant.pk
+                    for applicant in Applicant.objects.bulk_create(
+                        Applicant(
+                            user_id=user.id,
+                            phone_number="+1{}{}{:04d}".format(
+                                rng["applicants"].choice(AREA_CODES),
+                                rng["applicants"].randint(200, 999),
+                                rng["applicants"].randint(0, 9999),
+                            ),
+                            linkedin_url=(
+                                f"https://www.linkedin.com/in/"
+                                f"{user.first_name}-{user.last_name}-{user.id}/".lower()
+                            ),
+                            created_at=user.created_at,
+                            updated_at=user.created_at,
+                        )
+                        for user in batch
+                    )
+                ]
+            progress("Applicants", len(applicant_ids), applicants)
+
+        def job(i):
+            # Jobs open in the month before the first application; closed
+            # ones close at the end of the window.
+            opened = start - timedelta(days=rng["jobs"].uniform(0, 30))
+            title = rng["jobs"].choice(JOB_TITLES)
+            location = rng["jobs"].choice(LOCATIONS)
+            work_model = rng["jobs"].choice(Job.WorkModel.values)
+            closed = rng["jobs"].random() < closed_jobs
+            return Job(
+                title=title,
+                description=f"Generated job {i}.",
+                location=location,
+                work_model=work_model,
+                status=Job.Status.CLOSED if closed else Job.Status.OPEN,
+                closed_at=end if closed else None,
+                created_at=opened,
+                updated_at=opened,
+            )
+
+        job_ids = _insert(Job, (job(i) for i in range(jobs)), batch_size)
+        counts["users"] = recruiters + applicants
+        counts["applicants"] = applicants
+        counts["jobs"] = jobs
+
+        # Applicant a's k-th application goes to job (offset[a] + k) % jobs, so
+        # (applicant, job) pairs never repeat.
+        job_offsets = [rng["applications"].randrange(jobs) for _ in range(applicants)]
+
+        def application(i):
+            a, k = i % applicants, i // applicants
+            # Spread over the window in id order, like production traffic.
+            created = start + timedelta(
+                seconds=span * (i + rng["applications"].random()) / applications
+            )
+            status = statuses[
+                bisect(cumulative, rng["applications"].random() * cumulative[-1])
+            ]
+            updated = created
+            if status != Application.Status.SUBMITTED:
+                updated = min(
+                    end, created + timedelta(days=rng["applications"].uniform(0.1, 14))
+                )
+            return Application(
+                applicant_id=applicant_ids[a],
+                job_id=job_ids[(job_offsets[a] + k) % jobs],
+                status=status,
+                created_at=created,
+                updated_at=updated,
+            )
+
+        def notes(batch):
+            whole, fraction = divmod(notes_per_application, 1)
+            for application in batch:
+                for _ in range(int(whole) + (rng["notes"].random() < fraction)):
+                    written = min(
+                        end,
+                        application.created_at
+                        + timedelta(days=rng["notes"].uniform(0, 7)),
+                    )
+                    yield ApplicationNote(
+                        created_by_id=rng["notes"].choice(recruiter_ids),
+                        application_id=application.id,
+                        note=rng["notes"].choice(NOTES),
+                        created_at=written,
+                        updated_at=written,
+                    )
+
+        counts["applications"] = counts["notes"] = 0
+        rows = (application(i) for i in range(applications))
+        for batch in _batches(rows, batch_size):
+            with transaction.atomic():
+                batch = Application.objects.bulk_create(batch)
+                counts["notes"] += len(
+                    ApplicationNote.objects.bulk_create(
+                        notes(batch), batch_size=batch_size
+                    )
+                )
+            counts["applications"] += len(batch)
+            progress("Applications", counts["applications"], applications)
+
+    # bulk_create skips save() and its signals, so recompute the derived
+    # counters and the search index.
+    call_command("rebuild_application_stats", stdout=StringIO())
+    call_command("backfill_application_rollups", stdout=StringIO())
+    call_command("rebuild_search_index", stdout=StringIO())
+    bump_stats_version()
+    return counts
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _insert(model, rows, batch_size):
+    """
+    bulk_create `rows` one transaction per batch; returns the new ids
+    """
+    ids = []
+    for batch in _batches(rows, batch_size):
+        with transaction.atomic():
+            ids += [obj.pk for obj in model.objects.bulk_create(batch)]
+    return ids
+
+
+@contextmanager
+def _manual_timestamps(*models):
+    """
+    Let created_at/updated_at be set explicitly instead of to now()
+    """
+    fields = [
+        model._meta.get_field(name)
+        for model in models
+        for name in ("created_at", "updated_at")
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
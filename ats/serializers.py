@@ -1,20 +1,81 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, F, OuterRef, Prefetch, Subquery, Window
+from django.db.models.functions import Coalesce, RowNumber
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.fields import empty
 
-from ats.models import Job, User, Applicant, Application, ApplicationNote
+from ats.fastpath import (
+    CompiledListSerializer,
+    CompiledSerializerMixin,
+    default_timezone,
+)
+from ats.models import (
+    Job,
+    User,
+    Applicant,
+    Application,
+    ApplicationNote,
+    ArchivedApplication,
+    ArchivedApplicationNote,
+)
 
 
 class ApplicationStatsSerializer(serializers.Serializer):
     id = serializers.IntegerField()
     title = serializers.CharField()
     total_applications = serializers.IntegerField()
+    submitted_applications = serializers.IntegerField()
     approved_applications = serializers.IntegerField()
     rejected_applications = serializers.IntegerField()
 
 
+class ApplicationSeriesQuerySerializer(serializers.Serializer):
+    """
+    Query parameters of the application series endpoint. Weekly periods run
+    Monday to Sunday, so start and end are widened to whole weeks.
+    """
+
+    INTERVAL_DAYS = {"day": 1, "week": 7}
+    DEFAULT_PERIODS = 30
+    MAX_PERIODS = 366
+
+    interval = serializers.ChoiceField(choices=list(INTERVAL_DAYS), default="day")
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    job = serializers.IntegerField(min_value=1, required=False)
+
+    def validate(self, data):
+        step = self.INTERVAL_DAYS[data["interval"]]
+        end = data.get("end") or timezone.localdate()
+        start = data.get("start") or end - timedelta(
+            days=step * self.DEFAULT_PERIODS - 1
+        )
+        if start > end:
+            raise serializers.ValidationError(
+                {"start": ["Must not be after the end date."]}
+            )
+        if step == 7:
+            start -= timedelta(days=start.weekday())
+            end += timedelta(days=6 - end.weekday())
+        if (end - start).days // step + 1 > self.MAX_PERIODS:
+            raise serializers.ValidationError(
+                {
+                    "non_field_errors": [
+                        f"At most {self.MAX_PERIODS} periods of one "
+                        f"{data['interval']} per request."
+                    ]
+                }
+            )
+        return {**data, "start": start, "end": end, "step": step}
+
+
 class JobSerializer(serializers.ModelSerializer):
     class Meta:
         model = Job
-        fields = ["title", "status", "location", "work_model"]
+        fields = ["id", "title", "status", "location", "work_model"]
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -25,65 +86,301 @@ class UserSerializer(serializers.ModelSerializer):
 
 class ApplicantSerializer(serializers.ModelSerializer):
     user = UserSerializer()
+    applicant_id = serializers.IntegerField(source="id", read_only=True)
 
     class Meta:
         model = Applicant
-        fields = ["id", "user", "phone_number", "linkedin_url"]
+        fields = ["user", "applicant_id", "linkedin_url", "phone_number"]
 
 
-class ApplicationNoteSerializer(serializers.ModelSerializer):
+class ApplicationNoteSerializer(CompiledSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = ApplicationNote
         fields = ["note"]
+        list_serializer_class = CompiledListSerializer
+
 
+class ApplicationNoteListSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ApplicationNote
+        fields = ["id", "created_by", "note", "created_at", "updated_at"]
 
-class ApplicationSerializer(serializers.ModelSerializer):
+
+class ApplicationSerializer(CompiledSerializerMixin, serializers.ModelSerializer):
     applicant = ApplicantSerializer()
     job = JobSerializer()
-    application_notes = ApplicationNoteSerializer(many=True, read_only=True)
+    # The latest ATS_INLINE_NOTES notes and the total; the rest are paged
+    # through the notes listing.
+    application_notes = serializers.SerializerMethodField()
+    application_notes_count = serializers.SerializerMethodField()
+
+    # ?expand= names and the fields they expand.
+    EXPANDABLE = {
+        "applicant": "applicant",
+        "job": "job",
+        "notes": "application_notes",
+    }
+    NOTES_FIELDS = ["application_notes", "application_notes_count"]
 
     class Meta:
         model = Application
         fields = "__all__"
+        read_only_fields = ["version"]
+        list_serializer_class = CompiledListSerializer
+        # Application.submit enforces (applicant, job) uniqueness in its
+        # INSERT; a separate existence check would only race it.
+        validators = []
 
     def __init__(self, *args, **kwargs):
+        """
+        `fields` limits the output to those fields. When `fields` or `expand`
+        is given, relations are rendered as ids unless named in `expand`, and
+        the notes fields only appear with expand=notes.
+        """
         self.request = kwargs.pop("context", {}).get("request")
+        fields = kwargs.pop("fields", None)
+        expand = kwargs.pop("expand", None)
         super().__init__(*args, **kwargs)
 
-    def to_representation(self, instance):
+        self.expand = None
+        if fields is None and expand is None:
+            return
+        self.expand = set(expand or ())
+        for name in list(self.fields):
+            if fields is not None and name not in fields:
+                self.fields.pop(name)
+        for name, field in self.EXPANDABLE.items():
+            if name in self.expand or field not in self.fields:
+                continue
+            if field == "application_notes":
+                for notes_field in self.NOTES_FIELDS:
+                    self.fields.pop(notes_field, None)
+            else:
+                self.fields[field] = serializers.PrimaryKeyRelatedField(read_only=True)
+
+    @classmethod
+    def get_fieldset(cls, query_params):
         """
-        Serialize for list view
+        The fields/expand serializer kwargs requested by ?fields= and ?expand=
         """
-        representation = super().to_representation(instance)
-
-        representation["applicant"] = {
-            "user": {
-                "id": instance.applicant.user.id,
-                "first_name": instance.applicant.user.first_name,
-                "last_name": instance.applicant.user.last_name,
-                "email": instance.applicant.user.email,
-            },
-            "applicant_id": instance.applicant.id,
-            "linkedin_url": instance.applicant.linkedin_url,
-            "phone_number": str(instance.applicant.phone_number),
-        }
-        representation["job"] = {
-            "id": instance.job.id,
-            "title": instance.job.title,
-            "status": instance.job.status,
-            "location": instance.job.location,
-            "work_model": instance.job.work_model,
-        }
-
-        representation["application_notes"] = ApplicationNoteSerializer(
-            instance.application_notes.all(), many=True
-        ).data
-
-        return representation
+        fieldset = {}
+        errors = {}
+        for param, allowed in [
+            ("fields", set(cls().fields)),
+            ("expand", set(cls.EXPANDABLE)),
+        ]:
+            value = query_params.get(param)
+            if value is None:
+                continue
+            names = [name.strip() for name in value.split(",") if name.strip()]
+            unknown = [name for name in names if name not in allowed]
+            if unknown:
+                errors[param] = [f"Unknown {param}: {', '.join(unknown)}."]
+            fieldset[param] = names
+
+        requested_notes = set(cls.NOTES_FIELDS) & set(fieldset.get("fields", []))
+        if requested_notes and "notes" not in fieldset.get("expand", []):
+            errors.setdefault("fields", []).append(
+                f"{', '.join(sorted(requested_notes))} requires expand=notes."
+            )
+        if errors:
+            raise serializers.ValidationError(errors)
+        return fieldset
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, fields=None, expand=None):
+        """
+        Join and prefetch everything to_representation reads, so serializing
+        a page costs a constant number of queries. With a sparse fieldset only
+        the expanded relations are loaded.
+        """
+        if fields is None and expand is None:
+            return cls.with_latest_notes(
+                queryset.select_related("applicant__user", "job")
+            )
+
+        def wanted(name, field_names):
+            return name in (expand or ()) and (
+                fields is None or set(field_names) & set(fields)
+            )
+
+        if wanted("applicant", ["applicant"]):
+            queryset = queryset.select_related("applicant__user")
+        if wanted("job", ["job"]):
+            queryset = queryset.select_related("job")
+        if wanted("notes", cls.NOTES_FIELDS):
+            queryset = cls.with_latest_notes(queryset)
+        return queryset
+
+    @staticmethod
+    def with_latest_notes(queryset):
+        """
+        Prefetch each application's latest notes (one windowed query for the
+        page) and annotate its note count
+        """
+        latest = ApplicationNote.objects.order_by("-created_at", "-id")
+        count = (
+            ApplicationNote.objects.filter(application=OuterRef("pk"))
+            .order_by()
+            .values("application")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+        return queryset.prefetch_related(
+            Prefetch(
+                "application_notes",
+                queryset=latest[: settings.ATS_INLINE_NOTES],
+                to_attr="latest_notes",
+            )
+        ).annotate(application_notes_count=Coalesce(Subquery(count), 0))
+
+    def value_names(self):
+        """
+        The values() names of the rows compiled(rows=True) renders; the notes
+        themselves come from attach_latest_notes()
+        """
+        names = list(self.compiled(rows=True).value_names)
+        if "application_notes_count" in self.fields:
+            names.append("application_notes_count")
+        if "application_notes" in self.fields and "id" not in names:
+            names.append("id")
+        return names
+
+    @staticmethod
+    def attach_latest_notes(rows):
+        """
+        Set application_notes on values() rows rendered by compiled(rows=True),
+        with one windowed query for the rows
+        """
+        rank = Window(
+            RowNumber(),
+            partition_by=F("application_id"),
+            order_by=[F("created_at").desc(), F("id").desc()],
+        )
+        serializer = ApplicationNoteSerializer()
+        represent = serializer.compiled(rows=True)
+        notes = (
+            ApplicationNote.objects.filter(
+                application_id__in=[row["id"] for row in rows]
+            )
+            .annotate(rank=rank)
+            .filter(rank__lte=settings.ATS_INLINE_NOTES)
+            .order_by("application_id", "rank")
+            .values("application_id", *represent.value_names)
+        )
+        tz = default_timezone()
+        by_application = {row["id"]: [] for row in rows}
+        for note in notes:
+            by_application[note["application_id"]].append(
+                represent(serializer, note, tz)
+            )
+        for row in rows:
+            row["application_notes"] = by_application[row["id"]]
+
+    def get_application_notes(self, instance):
+        notes = getattr(instance, "latest_notes", None)
+        if notes is None:
+            notes = instance.application_notes.order_by("-created_at", "-id")[
+                : settings.ATS_INLINE_NOTES
+            ]
+        # One note serializer per ApplicationSerializer, rather than one (and
+        # its fields) per application.
+        if not hasattr(self, "note_serializer"):
+            self.note_serializer = ApplicationNoteSerializer()
+        represent = self.note_serializer.compiled()
+        tz = default_timezone()
+        return [represent(self.note_serializer, note, tz) for note in notes]
+
+    def get_application_notes_count(self, instance):
+        count = getattr(instance, "application_notes_count", None)
+        if count is None:
+            count = instance.application_notes.count()
+        return count
 
     def to_internal_value(self, data):
         """
         Deserialize for create view
         """
         request_user = self.request.user if self.request else None
-        return {"job": data.get("job"), "applicant": request_user.applicant}
+        try:
+            job = serializers.IntegerField(min_value=1).run_validation(
+                data.get("job", empty)
+            )
+        except serializers.ValidationError as exc:
+            raise serializers.ValidationError({"job": exc.detail})
+        return {"job": job, "applicant": request_user.applicant}
+
+
+class ApplicationBulkItemSerializer(serializers.Serializer):
+    applicant = serializers.IntegerField(min_value=1)
+    job = serializers.IntegerField(min_value=1)
+
+
+class ApplicationBulkCreateSerializer(serializers.Serializer):
+    applications = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False, max_length=1000
+    )
+
+
+class ApplicationDecisionSerializer(serializers.Serializer):
+    status = serializers.CharField()
+    # The version the client last saw; the decision fails with a 409 if the
+    # application has changed since.
+    version = serializers.IntegerField(min_value=1, required=False)
+
+
+class ApplicationBulkDecisionSerializer(serializers.Serializer):
+    ids = serializers.ListField(allow_empty=False, max_length=1000)
+    status = serializers.CharField()
+
+
+class ApplicationNoteBulkItemSerializer(serializers.Serializer):
+    application = serializers.IntegerField(min_value=1)
+    note = serializers.CharField()
+
+
+class ApplicationNoteBulkCreateSerializer(serializers.Serializer):
+    # A whole sync run in one request; the view inserts it in batches.
+    MAX_NOTES = 50000
+
+    notes = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=MAX_NOTES,
+        error_messages={
+            "max_length": (
+                f"At most {MAX_NOTES} notes per request; split larger syncs "
+                "into several requests."
+            )
+        },
+    )
+
+
+class ArchivedApplicationNoteSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedApplicationNote
+        fields = ["id", "created_by", "note", "created_at", "updated_at"]
+
+
+class ArchivedApplicationSerializer(serializers.ModelSerializer):
+    notes = ArchivedApplicationNoteSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = ArchivedApplication
+        fields = [
+            "id",
+            "applicant",
+            "job",
+            "status",
+            "created_at",
+            "updated_at",
+            "archived_at",
+            "notes",
+        ]
+
+
+# Compile the default layouts at import; sparse fieldsets compile on first use.
+ApplicationSerializer().compiled()
+ApplicationSerializer().compiled(rows=True)
+ApplicationNoteSerializer().compiled()
+ApplicationNoteSerializer().compiled(rows=True)
@@ -0,0 +1,76 @@
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from ats import search
+from ats.authentication import evict_users, token_cache
+from ats.models import Applicant, Job, User
+
+
+@receiver(post_delete, sender=Token)
+def evict_deleted_token(sender, instance, **kwargs):
+    token_cache.pop(instance.key)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def evict_changed_user(sender, instance, **kwargs):
+    # Covers deactivation as well as superuser/staff flag changes.
+    evict_users([instance.pk])
+
+
+@receiver(m2m_changed, sender=User.user_permissions.through)
+@receiver(m2m_changed, sender=User.groups.through)
+def evict_user_permissions(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        evict_users([instance.pk])
+    elif pk_set is not None:
+        # Changed from the Permission/Group side: pk_set holds the user ids.
+        evict_users(pk_set)
+    else:
+        # A reverse clear() does not say which users were affected.
+        token_cache.clear()
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+@receiver(post_delete, sender=Group)
+def clear_group_permissions(sender, **kwargs):
+    # A group change can affect any number of users.
+    if kwargs.get("action", "post_").startswith("post_"):
+        token_cache.clear()
+
+
+def _touches(update_fields, fields):
+    return update_fields is None or not fields.isdisjoint(update_fields)
+
+
+@receiver(post_save, sender=Job)
+def index_job(sender, instance, update_fields, using, **kwargs):
+    if _touches(update_fields, {"title", "description"}):
+        search.index_jobs([instance.pk], using=using)
+
+
+@receiver(post_save, sender=Applicant)
+def index_applicant(sender, instance, created, update_fields, using, **kwargs):
+    if created or _touches(update_fields, {"user"}):
+        search.index_applicants([instance.pk], using=using)
+
+
+@receiver(post_save, sender=User)
+def index_user_applicant(sender, instance, created, update_fields, using, **kwargs):
+    # New users have no applicant yet; logins only update last_login.
+    if not created and _touches(update_fields, {"first_name", "last_name", "email"}):
+        search.index_applicants(user_ids=[instance.pk], using=using)
+
+
+@receiver(post_delete, sender=Job)
+def remove_job_document(sender, instance, using, **kwargs):
+    search.remove_documents("jobs", [instance.pk], using=using)
+
+
+@receiver(post_delete, sender=Applicant)
+def remove_applicant_document(sender, instance, using, **kwargs):
+    search.remove_documents("applicants", [instance.pk], using=using)
@@ -2,9 +2,18 @@ from django.urls import path
 
 from ats.views import (
     ApplicationCreateListView,
+    ApplicationExportView,
     ApplicationApprovalView,
-    ApplicationNoteCreateView,
+    ApplicationBulkApprovalView,
+    ApplicationBulkCreateView,
+    ApplicationNoteBulkCreateView,
+    ApplicationNoteCreateListView,
+    ApplicationSearchView,
+    ApplicationSeriesView,
+    ArchivedApplicationDetailView,
+    ArchivedApplicationListView,
     JobApplicationStatsAPIView,
+    JobApplicationStatsCacheView,
 )
 
 
@@ -14,6 +23,41 @@ urlpatterns = [
         ApplicationCreateListView.as_view(),
         name="application-create-list",
     ),
+    path(
+        "applications/bulk/",
+        ApplicationBulkCreateView.as_view(),
+        name="application-bulk-create",
+    ),
+    path(
+        "applications/approval/",
+        ApplicationBulkApprovalView.as_view(),
+        name="application-bulk-approval",
+    ),
+    path(
+        "applications/notes/",
+        ApplicationNoteBulkCreateView.as_view(),
+        name="applicationnote-bulk-create",
+    ),
+    path(
+        "applications/export/",
+        ApplicationExportView.as_view(),
+        name="application-export",
+    ),
+    path(
+        "applications/search/",
+        ApplicationSearchView.as_view(),
+        name="application-search",
+    ),
+    path(
+        "applications/archive/",
+        ArchivedApplicationListView.as_view(),
+        name="archived-application-list",
+    ),
+    path(
+        "applications/archive/<int:pk>/",
+        ArchivedApplicationDetailView.as_view(),
+        name="archived-application-detail",
+    ),
     path(
         "applications/<int:pk>/approval/",
         ApplicationApprovalView.as_view(),
@@ -21,7 +65,7 @@ urlpatterns = [
     ),
     path(
         "applications/<int:pk>/notes/",
-        ApplicationNoteCreateView.as_view(),
+        ApplicationNoteCreateListView.as_view(),
         name="applicationnote-create",
     ),
     path(
@@ -29,4 +73,14 @@ urlpatterns = [
         JobApplicationStatsAPIView.as_view(),
         name="application-stats",
     ),
+    path(
+        "applications/stats/series/",
+        ApplicationSeriesView.as_view(),
+        name="application-stats-series",
+    ),
+    path(
+        "applications/stats/cache/",
+        JobApplicationStatsCacheView.as_view(),
+        name="application-stats-cache",
+    ),
 ]
@@ -1,45 +1,185 @@
-from django.db.models import Count, Q
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Prefetch, Sum
+from django.db.models.functions import Coalesce
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework import generics, serializers
+from rest_framework.utils.encoders import JSONEncoder
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from ats.models import Application, ApplicationNote, Job
+from ats.cache import get_cached_stats, get_stats_cache_counters
+from ats.fastpath import default_timezone
+from ats.filters import ApplicationFilterBackend
+from ats.models import (
+    Applicant,
+    Application,
+    ApplicationDailyStats,
+    ApplicationNote,
+    ArchivedApplication,
+    ArchivedApplicationNote,
+    DuplicateApplication,
+    Job,
+    JobApplicationStats,
+    JobClosed,
+    OutboxEvent,
+    StatusConflict,
+)
+from ats.pagination import SearchCursorPagination
 from ats.permissions import (
     IsApplicationViewer,
     IsApplicationCreator,
     IsApplicationDecisionMaker,
     IsApplicationNoteWriter,
 )
+from ats.routers import replica_enabled
+from ats.search import search_applications, search_terms
 from ats.serializers import (
+    ApplicationBulkCreateSerializer,
+    ApplicationBulkDecisionSerializer,
+    ApplicationDecisionSerializer,
+    ApplicationBulkItemSerializer,
+    ApplicationNoteBulkCreateSerializer,
+    ApplicationNoteBulkItemSerializer,
+    ApplicationNoteListSerializer,
     ApplicationSerializer,
+    ApplicationSeriesQuerySerializer,
     ApplicationNoteSerializer,
     ApplicationStatsSerializer,
+    ArchivedApplicationSerializer,
 )
 
+DUPLICATE_MESSAGE = "The fields applicant, job must make a unique set."
+
 
 class JobApplicationStatsAPIView(APIView):
+    read_from_replica = True
+
     def get(self, request):
-        jobs_with_stats = Job.objects.annotate(
-            total_applications=Count("application"),
-            approved_applications=Count(
-                "application", filter=Q(application__status="approved")
-            ),
-            rejected_applications=Count(
-                "application", filter=Q(application__status="rejected")
-            ),
+        # A replica may lag the write that bumped the stats version, so only
+        # keep what it returns for the replication window.
+        timeout = settings.ATS_REPLICA_PIN_SECONDS if replica_enabled() else None
+        stats, hit = get_cached_stats(self.build_stats, timeout=timeout)
+        response = Response(stats)
+        response["X-Cache"] = "HIT" if hit else "MISS"
+        return response
+
+    def build_stats(self):
+        return self.serialize_stats(self.get_queryset())
+
+    @staticmethod
+    def get_queryset():
+        # Counters are maintained on write (see JobApplicationStats), so this is
+        # a primary key join rather than an aggregation over Application.
+        return (
+            Job.objects.annotate(
+                **{
+                    field: Coalesce(F(f"application_stats__{field}"), 0)
+                    for field in JobApplicationStats.COUNTER_FIELDS
+                }
+            )
+            .values("id", "title", *JobApplicationStats.COUNTER_FIELDS)
+            .order_by("id")
         )
-        print(jobs_with_stats[0].title)
 
+    @staticmethod
+    def serialize_stats(jobs_with_stats):
         job_serializer = ApplicationStatsSerializer(jobs_with_stats, many=True)
-        stats = job_serializer.data
+        # Cache plain data, not the ReturnList bound to the serializer.
+        return [dict(row) for row in job_serializer.data]
+
+
+class ApplicationSeriesView(APIView):
+    """
+    Daily or weekly application counts, by status, for one job or for all
+    jobs, read from the ApplicationDailyStats rollups
+    """
+
+    permission_classes = [IsApplicationViewer]
+    read_from_replica = True
+
+    def get(self, request):
+        serializer = ApplicationSeriesQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        start, end, step = params["start"], params["end"], params["step"]
+
+        rollups = ApplicationDailyStats.objects.filter(day__gte=start, day__lte=end)
+        job_id = params.get("job")
+        if job_id is not None:
+            if not Job.objects.filter(pk=job_id).exists():
+                raise Http404
+            rollups = rollups.filter(job_id=job_id)
+        rows = rollups.values("day", "status").annotate(count=Sum("count")).order_by()
+
+        # Every period is present, so charts need not fill gaps.
+        series = {
+            start
+            + timedelta(days=offset): dict.fromkeys(
+                JobApplicationStats.COUNTER_FIELDS, 0
+            )
+            for offset in range(0, (end - start).days + 1, step)
+        }
+        for row in rows:
+            period = start + timedelta(days=(row["day"] - start).days // step * step)
+            counters = series[period]
+            counters["total_applications"] += row["count"]
+            counters[JobApplicationStats.STATUS_FIELDS[row["status"]]] += row["count"]
+
+        return Response(
+            {
+                "interval": params["interval"],
+                "start": start,
+                "end": end,
+                "job": job_id,
+                "series": [
+                    {"period": period, **counters}
+                    for period, counters in series.items()
+                ],
+            }
+        )
+
+
+class JobApplicationStatsCacheView(APIView):
+    permission_classes = [IsApplicationViewer]
+
+    def get(self, request):
+        return Response(get_stats_cache_counters())
 
-        return Response(stats)
 
+class SparseFieldsetMixin:
+    """
+    ?fields= and ?expand= for views serializing with ApplicationSerializer:
+    only the requested relations are joined, prefetched and rendered
+    """
 
-class ApplicationCreateListView(generics.CreateAPIView, generics.ListAPIView):
+    def get_fieldset(self):
+        if not hasattr(self, "_fieldset"):
+            self._fieldset = ApplicationSerializer.get_fieldset(
+                self.request.query_params
+            )
+        return self._fieldset
+
+    def get_queryset(self):
+        return ApplicationSerializer.setup_eager_loading(
+            super().get_queryset(), **self.get_fieldset()
+        )
+
+    def get_serializer(self, *args, **kwargs):
+        return super().get_serializer(*args, **kwargs, **self.get_fieldset())
+
+
+class ApplicationCreateListView(
+    SparseFieldsetMixin, generics.CreateAPIView, generics.ListAPIView
+):
     queryset = Application.objects.all()
     serializer_class = ApplicationSerializer
+    filter_backends = [ApplicationFilterBackend]
+    read_from_replica = True  # GET only; writes always go to the primary
 
     def get_permissions(self):
         if self.request.method == "POST":  # Create
@@ -49,38 +189,322 @@ class ApplicationCreateListView(generics.CreateAPIView, generics.ListAPIView):
 
         return [permission() for permission in permission_classes]
 
-    def perform_create(self, serializer):
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
         job_id = serializer.validated_data["job"]
-        applicant = self.request.user.applicant
-        job = Job.objects.get(id=job_id)
-        if job.status == Job.Status.CLOSED:
+        try:
+            application = Application.submit(
+                serializer.validated_data["applicant"], job_id
+            )
+        except Job.DoesNotExist:
+            raise serializers.ValidationError(
+                {"job": [f'Invalid pk "{job_id}" - object does not exist.']}
+            )
+        except JobClosed:
             raise serializers.ValidationError(
                 {"job": ["The job is closed. Cannot create an application."]}
             )
+        except DuplicateApplication:
+            return Response({"non_field_errors": [DUPLICATE_MESSAGE]}, status=409)
 
-        serializer.save(job=job, applicant=applicant)
+        # Serialized from the rows already in hand: the applicant's user is
+        # request.user, and a new application has no notes yet.
+        application.latest_notes = []
+        application.application_notes_count = 0
+        serializer.instance = application
+        return Response(serializer.data, status=201)
 
 
-class ApplicationApprovalView(generics.UpdateAPIView):
+class ApplicationBulkCreateView(generics.GenericAPIView):
+    """
+    Create many applications at once, reporting per-item errors
+    """
+
+    serializer_class = ApplicationBulkCreateSerializer
+    permission_classes = [IsApplicationCreator]
+    max_insert_attempts = 3
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        errors = {}
+        pairs = {}
+        for index, item in enumerate(serializer.validated_data["applications"]):
+            item_serializer = ApplicationBulkItemSerializer(data=item)
+            if item_serializer.is_valid():
+                pairs[index] = (
+                    item_serializer.validated_data["applicant"],
+                    item_serializer.validated_data["job"],
+                )
+            else:
+                errors[index] = item_serializer.errors
+
+        applicant_ids = {applicant_id for applicant_id, _ in pairs.values()}
+        job_ids = {job_id for _, job_id in pairs.values()}
+        existing_applicants = set(
+            Applicant.objects.filter(id__in=applicant_ids).values_list("id", flat=True)
+        )
+        job_statuses = dict(
+            Job.objects.filter(id__in=job_ids).values_list("id", "status")
+        )
+
+        candidates = {}
+        for index, (applicant_id, job_id) in pairs.items():
+            if applicant_id not in existing_applicants:
+                errors[index] = {
+                    "applicant": [
+                        f'Invalid pk "{applicant_id}" - object does not exist.'
+                    ]
+                }
+            elif job_id not in job_statuses:
+                errors[index] = {
+                    "job": [f'Invalid pk "{job_id}" - object does not exist.']
+                }
+            elif job_statuses[job_id] == Job.Status.CLOSED:
+                errors[index] = {
+                    "job": ["The job is closed. Cannot create an application."]
+                }
+            else:
+                candidates[index] = (applicant_id, job_id)
+
+        created = self.insert(candidates, applicant_ids, job_ids, errors)
+
+        return Response(
+            {
+                "created": [
+                    {
+                        "index": index,
+                        "id": application.id,
+                        "applicant": application.applicant_id,
+                        "job": application.job_id,
+                        "status": application.status,
+                    }
+                    for index, application in sorted(created.items())
+                ],
+                "errors": [
+                    {"index": index, "errors": item_errors}
+                    for index, item_errors in sorted(errors.items())
+                ],
+            },
+            status=201 if created else 400,
+        )
+
+    def insert(self, candidates, applicant_ids, job_ids, errors):
+        for attempt in range(self.max_insert_attempts):
+            existing = set(
+                Application.objects.filter(
+                    applicant_id__in=applicant_ids, job_id__in=job_ids
+                ).values_list("applicant_id", "job_id")
+            )
+            to_create = {}
+            for index, pair in candidates.items():
+                if pair in existing:
+                    errors[index] = {"non_field_errors": [DUPLICATE_MESSAGE]}
+                else:
+                    existing.add(pair)
+                    to_create[index] = Application(applicant_id=pair[0], job_id=pair[1])
+            candidates = {index: candidates[index] for index in to_create}
+            if not to_create:
+                return to_create
+
+            try:
+                with transaction.atomic():
+                    Application.objects.bulk_create(to_create.values())
+                    Application.apply_counter_changes(
+                        (
+                            application.job_id,
+                            application.created_at,
+                            None,
+                            application.status,
+                            1,
+                        )
+                        for application in to_create.values()
+                    )
+                return to_create
+            except IntegrityError:
+                # A concurrent request inserted one of our pairs between the
+                # duplicate check and the insert; re-check and try again.
+                if attempt == self.max_insert_attempts - 1:
+                    raise
+
+
+class ApplicationExportView(SparseFieldsetMixin, generics.GenericAPIView):
+    """
+    Stream every matching application as newline-delimited JSON
+    """
+
     queryset = Application.objects.all()
     serializer_class = ApplicationSerializer
+    filter_backends = [ApplicationFilterBackend]
+    permission_classes = [IsApplicationViewer]
+    ordering = "created_at"  # unless ?ordering= is given
+    chunk_size = 2000
+
+    def get(self, request):
+        # The filter backend only accepts orderings an index serves, and the
+        # id tiebreaker follows the ordering column in each of those indexes.
+        queryset = self.filter_queryset(self.get_queryset())
+        [ordering] = ApplicationFilterBackend().get_ordering(request, queryset, self)
+        tiebreaker = "-id" if ordering.startswith("-") else "id"
+        queryset = queryset.order_by(ordering, tiebreaker)
+        response = StreamingHttpResponse(
+            self.stream_rows(queryset), content_type="application/x-ndjson"
+        )
+        response["Content-Disposition"] = 'attachment; filename="applications.ndjson"'
+        return response
+
+    def stream_rows(self, queryset):
+        serializer = self.get_serializer()
+        represent = serializer.compiled(rows=True)
+        notes = "application_notes" in serializer.fields
+        # values() rows skip model instantiation, and iterator() reads through
+        # a server-side cursor on Postgres, so only one chunk is ever held in
+        # memory. Notes are fetched per chunk instead of prefetched.
+        rows = (
+            queryset.prefetch_related(None)
+            .values(*serializer.value_names())
+            .iterator(chunk_size=self.chunk_size)
+        )
+        encode = JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        tz = default_timezone()
+        while chunk := list(islice(rows, self.chunk_size)):
+            if notes:
+                ApplicationSerializer.attach_latest_notes(chunk)
+            yield "".join(
+                encode(represent(serializer, row, tz)) + "\n" for row in chunk
+            )
+
+
+class ApplicationSearchView(SparseFieldsetMixin, generics.GenericAPIView):
+    """
+    Applications whose job title/description or applicant name/email match
+    ?q=, best match first
+    """
+
+    queryset = Application.objects.all()
+    serializer_class = ApplicationSerializer
+    permission_classes = [IsApplicationViewer]
+    pagination_class = SearchCursorPagination
+    read_from_replica = True
+
+    def get(self, request):
+        terms = search_terms(request.query_params.get("q", ""))
+        if not terms:
+            raise serializers.ValidationError({"q": ["Enter a search term."]})
+
+        hits = self.paginator.paginate_search(
+            lambda after, limit: search_applications(terms, after=after, limit=limit),
+            request,
+        )
+        applications = self.get_queryset().in_bulk([pk for pk, _ in hits])
+        serializer = self.get_serializer(
+            [applications[pk] for pk, _ in hits if pk in applications], many=True
+        )
+        return self.get_paginated_response(serializer.data)
+
+
+class ApplicationApprovalView(generics.UpdateAPIView):
+    serializer_class = ApplicationDecisionSerializer
     permission_classes = [IsApplicationDecisionMaker]
 
     def update(self, request, *args, **kwargs):
-        instance = self.get_object()
-        status = request.data.get("status", None)
+        body, status = self.decide(self.kwargs["pk"], request.data)
+        return Response(body, status=status)
+
+    @staticmethod
+    def decide(pk, data):
+        """
+        Apply a decision request body to application `pk`; returns the
+        response body and status code. Shared with the async view.
+        """
+        serializer = ApplicationDecisionSerializer(data=data)
+        if not serializer.is_valid() and "status" not in serializer.errors:
+            return serializer.errors, 400
+        status = serializer.validated_data.get("status")
+        if status not in Application.DECISION_STATUSES:
+            return {"Error": "Invalid status provided."}, 400
+
+        # No get_object(): the conditional UPDATE is the only statement on the
+        # success path, and finds out whether the application exists.
+        application = Application(pk=pk)
+        try:
+            application.update_status(status, serializer.validated_data.get("version"))
+        except Application.DoesNotExist:
+            raise Http404
+        except StatusConflict as exc:
+            return {"Error": str(exc)}, 409
+        body = {
+            "Success": "Application status updated successfully.",
+            "version": application.version,
+            "updated_at": application.updated_at,
+        }
+        return body, 200
+
 
-        if status in [Application.Status.APPROVED, Application.Status.REJECTED]:
-            instance.update_status(status)
-            return Response({"Success": "Application status updated successfully."})
-        else:
+class ApplicationBulkApprovalView(generics.GenericAPIView):
+    """
+    Approve or reject many applications with set-based updates
+    """
+
+    serializer_class = ApplicationBulkDecisionSerializer
+    permission_classes = [IsApplicationDecisionMaker]
+
+    def patch(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        status = serializer.validated_data["status"]
+        if status not in Application.DECISION_STATUSES:
             return Response({"Error": "Invalid status provided."}, status=400)
 
+        ids, invalid = [], []
+        for value in serializer.validated_data["ids"]:
+            if isinstance(value, int) and not isinstance(value, bool) and value > 0:
+                ids.append(value)
+            else:
+                invalid.append(value)
+
+        updated = Application.bulk_update_status(ids, status) if ids else []
+        found = set(updated)
+        return Response(
+            {
+                "updated": updated,
+                "missing": sorted({pk for pk in ids if pk not in found}),
+                "invalid": invalid,
+            }
+        )
+
+
+class ApplicationNoteCreateListView(generics.CreateAPIView, generics.ListAPIView):
+    """
+    Add a note to an application, or page through its notes newest first
+    """
 
-class ApplicationNoteCreateView(generics.CreateAPIView):
     queryset = ApplicationNote.objects.all()
-    serializer_class = ApplicationNoteSerializer
-    permission_classes = [IsApplicationNoteWriter]
+    read_from_replica = True  # GET only; writes always go to the primary
+
+    def get_permissions(self):
+        if self.request.method == "POST":  # Create
+            permission_classes = [IsApplicationNoteWriter]
+        else:  # List
+            permission_classes = [IsApplicationViewer]
+
+        return [permission() for permission in permission_classes]
+
+    def get_serializer_class(self):
+        if self.request.method == "POST":
+            return ApplicationNoteSerializer
+        return ApplicationNoteListSerializer
+
+    def get_queryset(self):
+        # Served by the (application, created_at, id) index in keyset order.
+        return super().get_queryset().filter(application_id=self.kwargs["pk"])
+
+    def list(self, request, *args, **kwargs):
+        if not Application.objects.filter(pk=self.kwargs["pk"]).exists():
+            raise Http404
+        return super().list(request, *args, **kwargs)
 
     def perform_create(self, serializer):
         application_id = self.kwargs.get("pk")
@@ -89,3 +513,97 @@ class ApplicationNoteCreateView(generics.CreateAPIView):
         serializer.save(
             created_by=self.request.user, application=application, note=note
         )
+
+
+class ApplicationNoteBulkCreateView(generics.GenericAPIView):
+    """
+    Attach notes to many applications at once, reporting per-item errors
+    """
+
+    serializer_class = ApplicationNoteBulkCreateSerializer
+    permission_classes = [IsApplicationNoteWriter]
+    insert_batch_size = 1000
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        # One item serializer for the whole batch: its fields are built once.
+        item_serializer = ApplicationNoteBulkItemSerializer()
+        errors = {}
+        items = {}
+        for index, item in enumerate(serializer.validated_data["notes"]):
+            try:
+                items[index] = item_serializer.run_validation(item)
+            except serializers.ValidationError as exc:
+                errors[index] = exc.detail
+
+        application_ids = {item["application"] for item in items.values()}
+        existing = set(
+            Application.objects.filter(id__in=application_ids).values_list(
+                "id", flat=True
+            )
+        )
+
+        notes = {}
+        for index, item in items.items():
+            if item["application"] in existing:
+                notes[index] = ApplicationNote(
+                    created_by=request.user,
+                    application_id=item["application"],
+                    note=item["note"],
+                )
+            else:
+                application_id = item["application"]
+                errors[index] = {
+                    "application": [
+                        f'Invalid pk "{application_id}" - object does not exist.'
+                    ]
+                }
+
+        with transaction.atomic():
+            ApplicationNote.objects.bulk_create(
+                notes.values(), batch_size=self.insert_batch_size
+            )
+            OutboxEvent.enqueue(
+                OutboxEvent.Topic.NOTE_CREATED,
+                [note.event_payload() for note in notes.values()],
+            )
+
+        return Response(
+            {
+                "created": [
+                    {"index": index, "id": note.id}
+                    for index, note in sorted(notes.items())
+                ],
+                "errors": [
+                    {"index": index, "errors": item_errors}
+                    for index, item_errors in sorted(errors.items())
+                ],
+            },
+            status=201 if notes else 400,
+        )
+
+
+class ArchivedApplicationMixin:
+    """
+    Read-only access to applications moved out by archive_applications
+    """
+
+    queryset = ArchivedApplication.objects.prefetch_related(
+        Prefetch(
+            "notes",
+            queryset=ArchivedApplicationNote.objects.order_by("-created_at", "-id"),
+        )
+    )
+    serializer_class = ArchivedApplicationSerializer
+    permission_classes = [IsApplicationViewer]
+    read_from_replica = True
+
+
+class ArchivedApplicationListView(ArchivedApplicationMixin, generics.ListAPIView):
+    filter_backends = [ApplicationFilterBackend]
+
+
+class ArchivedApplicationDetailView(ArchivedApplicationMixin, generics.RetrieveAPIView):
+    pass
@@ -1,90 +1,453 @@
+import json
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta, timezone
+from unittest import mock
+
 import pytest
-from django.contrib.auth.models import Permission
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import localdate
 from rest_framework import status
-from rest_framework.test import APIClient
 
-from ats.models import Job, User, Applicant, Application
+from ats.cache import get_stats_cache
+from ats.management.commands.archive_applications import archive_chunk
+from ats.models import (
+    Applicant,
+    Application,
+    ApplicationNote,
+    Job,
+    JobApplicationStats,
+    OutboxEvent,
+    StatusConflict,
+    User,
+)
+from ats.serializers import ApplicationNoteBulkCreateSerializer
+
+
+@contextmanager
+def assert_max_queries(budget, using=DEFAULT_DB_ALIAS):
+    """
+    Fail if the block runs more than `budget` queries, listing what ran
+    """
+    with CaptureQueriesContext(connections[using]) as context:
+        yield context
+
+    executed = len(context.captured_queries)
+    assert executed <= budget, (
+        f"Query budget exceeded: {executed} queries run, budget is {budget}.\n"
+        + "\n".join(query["sql"] for query in context.captured_queries)
+    )
 
 
-@pytest.fixture
-def api_client():
-    return APIClient()
+def test_application_list_view(api_client, user, no_permission_user, application):
+    api_client.force_authenticate(user=user)
+    url = reverse("application-create-list")
+    response = api_client.get(url)
 
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["next"] is None
+    assert response.data["previous"] is None
+    assert len(response.data["results"]) == 1
+    assert response.data["results"][0]["id"] == application.id
+    assert response.data["results"][0]["applicant"]["phone_number"] == "9172820312"
+    assert response.data["results"][0]["job"]["status"] == "open"
+    assert response.data["results"][0]["status"] == "submitted"
 
-@pytest.fixture
-def user(db):
-    user = User.objects.create_user(
-        username="testuser",
-        password="testpassword",
-        first_name="Peter",
-        last_name="Cho",
-        email="petercho42@gmail.com",
-    )
-    view_permission = Permission.objects.get(codename="view_application")
-    create_permission = Permission.objects.get(codename="add_application")
-    status_permission = Permission.objects.get(codename="change_application")
-    note_permission = Permission.objects.get(codename="add_applicationnote")
-    user.user_permissions.add(view_permission)
-    user.user_permissions.add(create_permission)
-    user.user_permissions.add(status_permission)
-    user.user_permissions.add(note_permission)
-    return user
+    # Test with user without permission
+    api_client.force_authenticate(user=no_permission_user)
+    response = api_client.get(url)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert len(response.data) == 1
 
 
-@pytest.fixture
-def no_permission_user(db):
-    user = User.objects.create_user(
-        username="nopermissionuser",
-        password="testpassword",
-        first_name="Peter",
-        last_name="Cho",
-        email="petercho39@gmail.com",
+def test_application_list_view_pagination(api_client, user, applicant):
+    jobs = [
+        Job.objects.create(title=f"Job {i}", description="", location="NYC")
+        for i in range(5)
+    ]
+    applications = [
+        Application.objects.create(applicant=applicant, job=job) for job in jobs
+    ]
+    # Identical timestamps force the id tiebreaker to keep pages disjoint.
+    Application.objects.filter(id__in=[a.id for a in applications[1:4]]).update(
+        created_at=applications[1].created_at
     )
-    return user
+    expected_ids = [
+        a.id for a in Application.objects.order_by("-created_at", "-id").only("id")
+    ]
 
+    api_client.force_authenticate(user=user)
+    url = reverse("application-create-list")
+
+    seen_ids = []
+    next_url = f"{url}?page_size=2"
+    while next_url:
+        response = api_client.get(next_url)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) <= 2
+        seen_ids += [row["id"] for row in response.data["results"]]
+        last_page = response.data
+        next_url = response.data["next"]
+    assert seen_ids == expected_ids
+
+    # Walking back from the last page returns the preceding page.
+    response = api_client.get(last_page["previous"])
+    assert response.status_code == status.HTTP_200_OK
+    assert [row["id"] for row in response.data["results"]] == expected_ids[2:4]
 
-@pytest.fixture
-def applicant(db, user):
-    return Applicant.objects.create(
-        user=user,
-        phone_number="9172820312",
-        linkedin_url="https://www.linkedin.com/in/petercho42/",
+    response = api_client.get(url, {"cursor": "not-a-cursor"})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_application_list_view_query_budget(api_client, user, applicant):
+    api_client.force_authenticate(user=user)
+    url = reverse("application-create-list")
+
+    def add_applications(count):
+        for i in range(count):
+            job = Job.objects.create(title=f"Job {i}", description="", location="NYC")
+            application = Application.objects.create(applicant=applicant, job=job)
+            ApplicationNote.objects.create(
+                created_by=user, application=application, note="Looks good"
+            )
+            ApplicationNote.objects.create(
+                created_by=user, application=application, note="Phone screen"
+            )
+
+    # permissions (2) + page with joined applicant/user/job (1) + notes (1)
+    add_applications(1)
+    with assert_max_queries(4):
+        response = api_client.get(url)
+    assert len(response.data["results"]) == 1
+
+    # The cost must not grow with the number of rows on the page.
+    add_applications(20)
+    with assert_max_queries(4):
+        response = api_client.get(url)
+    assert len(response.data["results"]) == 21
+    assert all(len(row["application_notes"]) == 2 for row in response.data["results"])
+
+
+def test_application_list_view_sparse_fieldsets(api_client, user, application):
+    ApplicationNote.objects.create(
+        created_by=user, application=application, note="Strong portfolio"
     )
+    api_client.force_authenticate(user=user)
+    url = reverse("application-create-list")
+    full = api_client.get(url).data["results"][0]
+
+    # permissions (2) + page without joins or the notes prefetch (1)
+    with assert_max_queries(3) as queries:
+        response = api_client.get(url, {"fields": "id,status,job"})
+    assert response.data["results"] == [
+        {"id": application.id, "job": application.job_id, "status": "submitted"}
+    ]
+    page_sql = queries.captured_queries[-1]["sql"]
+    assert "JOIN" not in page_sql
+    assert "ats_applicationnote" not in page_sql
+
+    response = api_client.get(url, {"expand": "job"})
+    [row] = response.data["results"]
+    assert row["job"] == full["job"]
+    assert row["applicant"] == application.applicant_id
+    assert "application_notes" not in row
+
+    with assert_max_queries(4):
+        response = api_client.get(
+            url, {"fields": "id,applicant,application_notes", "expand": "notes"}
+        )
+    assert response.data["results"] == [
+        {
+            "id": application.id,
+            "applicant": application.applicant_id,
+            "application_notes": [{"note": "Strong portfolio"}],
+        }
+    ]
+
+    response = api_client.get(url, {"expand": "applicant,job,notes"})
+    assert response.data["results"] == [full]
+
+    response = api_client.get(url, {"fields": "id,salary", "expand": "owner"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data == {
+        "fields": ["Unknown fields: salary."],
+        "expand": ["Unknown expand: owner."],
+    }
 
+    response = api_client.get(url, {"fields": "application_notes"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data == {"fields": ["application_notes requires expand=notes."]}
+
+    response = api_client.get(reverse("application-export"), {"fields": "id"})
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert [json.loads(line) for line in lines] == [{"id": application.id}]
 
-@pytest.fixture
-def job(db):
-    return Job.objects.create(
-        title="Test Job",
-        description="Test Job Description",
-        location="NYC",
-        work_model=Job.WorkModel.HYBRID,
+
+def test_application_list_view_filters(api_client, user, applicant, job):
+    other_job = Job.objects.create(title="Other Job", description="", location="NYC")
+    submitted = Application.objects.create(applicant=applicant, job=job)
+    approved = Application.objects.create(
+        applicant=applicant, job=other_job, status=Application.Status.APPROVED
     )
+    api_client.force_authenticate(user=user)
+    url = reverse("application-create-list")
 
+    response = api_client.get(url, {"job": job.id})
+    assert [row["id"] for row in response.data["results"]] == [submitted.id]
 
-@pytest.fixture
-def application(db, user, applicant, job):
-    return Application.objects.create(applicant=applicant, job=job)
+    response = api_client.get(url, {"status": "approved"})
+    assert [row["id"] for row in response.data["results"]] == [approved.id]
 
+    response = api_client.get(url, {"job": job.id, "status": "approved"})
+    assert response.data["results"] == []
 
-def test_application_list_view(api_client, user, no_permission_user, application):
+    response = api_client.get(url, {"job": "abc", "status": "pending"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert set(response.data) == {"job", "status"}
+    for value in ["\u00b2", "\u0663"]:  # superscript two, Arabic-Indic three
+        response = api_client.get(url, {"job": value})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert set(response.data) == {"job"}
+
+    response = api_client.get(url, {"applicant": applicant.id})
+    assert [row["id"] for row in response.data["results"]] == [
+        approved.id,
+        submitted.id,
+    ]
+
+    # (applicant, job) is unique, so any filter including both is served.
+    response = api_client.get(
+        url, {"applicant": applicant.id, "job": job.id, "status": "submitted"}
+    )
+    assert [row["id"] for row in response.data["results"]] == [submitted.id]
+
+
+def test_application_list_view_ranges_and_ordering(api_client, user, applicant):
+    jobs = [
+        Job.objects.create(title=f"Job {i}", description="", location="NYC")
+        for i in range(3)
+    ]
+    applications = [
+        Application.objects.create(applicant=applicant, job=job) for job in jobs
+    ]
+    days = [date(2024, 1, 10), date(2024, 1, 20), date(2024, 1, 30)]
+    for application, day in zip(applications, days):
+        Application.objects.filter(id=application.id).update(
+            created_at=datetime.combine(day, time(12), tzinfo=timezone.utc),
+            # Updated in the opposite order to creation.
+            updated_at=datetime.combine(
+                days[2 - days.index(day)], time(12), tzinfo=timezone.utc
+            ),
+        )
     api_client.force_authenticate(user=user)
     url = reverse("application-create-list")
+
+    def ids(params):
+        response = api_client.get(url, params)
+        assert response.status_code == status.HTTP_200_OK, response.data
+        return [row["id"] for row in response.data["results"]]
+
+    first, second, third = [application.id for application in applications]
+    assert ids({"created_after": "2024-01-15"}) == [third, second]
+    assert ids({"created_before": "2024-01-20T12:00:00Z"}) == [first]
+    assert ids({"ordering": "created_at", "created_after": "2024-01-15"}) == [
+        second,
+        third,
+    ]
+    assert ids({"ordering": "-updated_at"}) == [first, second, third]
+    assert ids({"ordering": "updated_at", "updated_before": "2024-01-25"}) == [
+        third,
+        second,
+    ]
+    assert ids({"ordering": "updated_at", "status": "submitted"}) == [
+        third,
+        second,
+        first,
+    ]
+
+    # Cursor pages follow the requested ordering.
+    response = api_client.get(url, {"ordering": "updated_at", "page_size": 2})
+    response = api_client.get(response.data["next"])
+    assert [row["id"] for row in response.data["results"]] == [first]
+
+    response = api_client.get(url, {"ordering": "status", "created_after": "x"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert set(response.data) == {"ordering", "created_after"}
+
+    response = api_client.get(url, {"updated_after": "2024-01-01"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data["non_field_errors"] == [
+        "Date ranges must be on the ordering field, created_at."
+    ]
+
+    # No index leads with (applicant, status) or (job, updated_at).
+    for params in [
+        {"applicant": applicant.id, "status": "submitted"},
+        {"job": jobs[0].id, "ordering": "updated_at"},
+    ]:
+        response = api_client.get(url, params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["non_field_errors"][0].startswith("No index serves")
+
+    response = api_client.get(
+        reverse("application-export"), {"ordering": "-updated_at"}
+    )
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [first, second, third]
+
+
+def test_application_export_view(api_client, user, no_permission_user, applicant):
+    jobs = [
+        Job.objects.create(title=f"Job {i}", description="", location="NYC")
+        for i in range(3)
+    ]
+    applications = [
+        Application.objects.create(applicant=applicant, job=job) for job in jobs
+    ]
+    applications[1].update_status(Application.Status.REJECTED)
+    ApplicationNote.objects.create(
+        created_by=user, application=applications[0], note="Strong portfolio"
+    )
+
+    api_client.force_authenticate(user=user)
+    url = reverse("application-export")
     response = api_client.get(url)
 
     assert response.status_code == status.HTTP_200_OK
-    assert len(response.data) == 1
-    assert response.data[0]["id"] == 1
-    assert response.data[0]["applicant"]["phone_number"] == "9172820312"
-    assert response.data[0]["job"]["status"] == "open"
-    assert response.data[0]["status"] == "submitted"
+    assert response["Content-Type"] == "application/x-ndjson"
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert [row["id"] for row in rows] == [a.id for a in applications]
+    assert rows[0]["application_notes"] == [{"note": "Strong portfolio"}]
+    assert rows[0]["applicant"]["phone_number"] == "9172820312"
+    assert rows[1]["status"] == "rejected"
+
+    response = api_client.get(url, {"status": "rejected", "job": jobs[1].id})
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [applications[1].id]
 
     # Test with user without permission
     api_client.force_authenticate(user=no_permission_user)
     response = api_client.get(url)
     assert response.status_code == status.HTTP_403_FORBIDDEN
-    assert len(response.data) == 1
+
+
+def test_application_search_view(api_client, user, no_permission_user, applicant):
+    backend = Job.objects.create(
+        title="Backend Engineer", description="Python and Django", location="NYC"
+    )
+    frontend = Job.objects.create(
+        title="Frontend Developer", description="React", location="NYC"
+    )
+    ada = Applicant.objects.create(
+        user=User.objects.create_user(
+            username="ada",
+            first_name="Ada",
+            last_name="Lovelace",
+            email="ada@frontend.dev",
+        ),
+        phone_number="9172820313",
+        linkedin_url="https://www.linkedin.com/in/ada/",
+    )
+    peter_backend = Application.objects.create(applicant=applicant, job=backend)
+    peter_frontend = Application.objects.create(applicant=applicant, job=frontend)
+    ada_frontend = Application.objects.create(applicant=ada, job=frontend)
+
+    api_client.force_authenticate(user=user)
+    url = reverse("application-search")
+
+    def search(q, **params):
+        response = api_client.get(url, {"q": q, **params})
+        assert response.status_code == status.HTTP_200_OK
+        return [row["id"] for row in response.data["results"]]
+
+    assert search("engineer") == [peter_backend.id]
+    assert search("PYTHON django") == [peter_backend.id]
+    assert search("lovelace") == [ada_frontend.id]
+    assert search("petercho42@gmail") == [peter_frontend.id, peter_backend.id]
+    assert search("pet") == [peter_frontend.id, peter_backend.id]
+    assert search("nobody") == []
+    # Ada matches on both her name and the job, so she ranks first.
+    assert search("frontend") == [ada_frontend.id, peter_frontend.id]
+
+    response = api_client.get(url, {"q": "frontend", "page_size": 1})
+    assert [row["id"] for row in response.data["results"]] == [ada_frontend.id]
+    assert response.data["previous"] is None
+    response = api_client.get(response.data["next"])
+    assert [row["id"] for row in response.data["results"]] == [peter_frontend.id]
+    assert response.data["next"] is None
+
+    response = api_client.get(url, {"q": "lovelace", "fields": "id,job"})
+    assert response.data["results"] == [{"id": ada_frontend.id, "job": frontend.id}]
+
+    # The index follows job and user edits.
+    backend.title = "Staff Engineer"
+    backend.save()
+    ada.user.email = "ada@example.com"
+    ada.user.save(update_fields=["email"])
+    assert search("staff") == [peter_backend.id]
+    assert search("example") == [ada_frontend.id]
+
+    response = api_client.get(url, {"q": " ,; "})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data == {"q": ["Enter a search term."]}
+
+    # Test with user without permission
+    api_client.force_authenticate(user=no_permission_user)
+    response = api_client.get(url, {"q": "frontend"})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_archived_application_views(
+    api_client, user, no_permission_user, applicant, job
+):
+    other_applicant = Applicant.objects.create(
+        user=User.objects.create_user(username="other"),
+        phone_number="9172820313",
+        linkedin_url="https://www.linkedin.com/in/other/",
+    )
+    applications = [
+        Application.objects.create(applicant=applicant, job=job),
+        Application.objects.create(applicant=other_applicant, job=job),
+    ]
+    other_job = Job.objects.create(title="Other Job", description="", location="NYC")
+    Application.objects.create(applicant=applicant, job=other_job)
+    ApplicationNote.objects.create(
+        created_by=user, application=applications[0], note="Strong portfolio"
+    )
+    for closing in (job, other_job):
+        closing.status = Job.Status.CLOSED
+        closing.save(update_fields=["status"])
+        archive_chunk(closing.id, 10)
+
+    api_client.force_authenticate(user=user)
+    url = reverse("archived-application-list")
+    response = api_client.get(url, {"job": job.id})
+    assert response.status_code == status.HTTP_200_OK
+    assert [row["id"] for row in response.data["results"]] == [
+        applications[1].id,
+        applications[0].id,
+    ]
+    assert response.data["results"][0]["job"] == job.id
+
+    response = api_client.get(url, {"status": "submitted"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    url = reverse("archived-application-detail", args=[applications[0].id])
+    response = api_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["status"] == "submitted"
+    assert response.data["archived_at"] is not None
+    assert [note["note"] for note in response.data["notes"]] == ["Strong portfolio"]
+
+    response = api_client.get(reverse("archived-application-detail", args=[0]))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    api_client.force_authenticate(user=no_permission_user)
+    response = api_client.get(url)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
 
 
 def test_application_create_view(api_client, user, no_permission_user, applicant, job):
@@ -92,13 +455,52 @@ def test_application_create_view(api_client, user, no_permission_user, applicant
     url = reverse("application-create-list")
 
     data = {"job": job.id}
-    response = api_client.post(url, data=data, format="json")
+    JobApplicationStats.objects.create(job=job)  # as for any job with applicants
+    # permissions (2) + applicant (1) + savepoint (2) + conditional INSERT (1,
+    # plus the job on SQLite) + counters and rollups (3); nothing is re-read
+    # to serialize the new application.
+    with assert_max_queries(10):
+        response = api_client.post(url, data=data, format="json")
 
     assert response.status_code == status.HTTP_201_CREATED
     assert "id" in response.data
     assert response.data["applicant"]["phone_number"] == "9172820312"
+    assert response.data["applicant"]["user"]["email"] == user.email
     assert response.data["job"]["status"] == "open"
     assert response.data["status"] == "submitted"
+    assert response.data["version"] == 1
+    assert response.data["application_notes"] == []
+    application = Application.objects.get()
+    assert response.data["id"] == application.id
+    assert parse_datetime(response.data["created_at"]) == application.created_at
+    assert JobApplicationStats.objects.get(job=job).submitted_applications == 1
+
+    # A retried submission is a conflict, not a server error.
+    response = api_client.post(url, data=data, format="json")
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert response.data == {
+        "non_field_errors": ["The fields applicant, job must make a unique set."]
+    }
+    assert Application.objects.count() == 1
+    assert JobApplicationStats.objects.get(job=job).total_applications == 1
+
+    closed = Job.objects.create(
+        title="Closed Job", description="", location="NYC", status=Job.Status.CLOSED
+    )
+    response = api_client.post(url, data={"job": closed.id}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data == {
+        "job": ["The job is closed. Cannot create an application."]
+    }
+
+    response = api_client.post(url, data={"job": 999999}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data == {"job": ['Invalid pk "999999" - object does not exist.']}
+
+    response = api_client.post(url, data={}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "job" in response.data
+    assert Application.objects.count() == 1
 
     # Test with user without permission
     api_client.force_authenticate(user=no_permission_user)
@@ -116,14 +518,16 @@ def test_application_approval_view(api_client, user, no_permission_user, applica
         url, {"status": Application.Status.APPROVED}, format="json"
     )
     assert response.status_code == status.HTTP_200_OK
-    assert response.data == {"Success": "Application status updated successfully."}
+    assert response.data["Success"] == "Application status updated successfully."
+    assert response.data["version"] == 2
 
     # Test rejection
     response = api_client.patch(
         url, {"status": Application.Status.REJECTED}, format="json"
     )
     assert response.status_code == status.HTTP_200_OK
-    assert response.data == {"Success": "Application status updated successfully."}
+    assert response.data["Success"] == "Application status updated successfully."
+    assert response.data["version"] == 3
 
     # Test invalid status
     response = api_client.patch(url, {"status": "invalid_status"}, format="json")
@@ -137,6 +541,57 @@ def test_application_approval_view(api_client, user, no_permission_user, applica
     assert len(response.data) == 1
 
 
+def test_application_approval_view_preconditions(api_client, user, application):
+    api_client.force_authenticate(user=user)
+    url = reverse("application-approval", kwargs={"pk": application.id})
+    created = Application.objects.values_list("updated_at", flat=True).get()
+
+    # permissions (2) + savepoint (2) + conditional UPDATE (1, plus a SELECT
+    # on SQLite) + counters and rollups (3) + outbox event (1)
+    with assert_max_queries(10):
+        response = api_client.patch(
+            url, {"status": "approved", "version": 1}, format="json"
+        )
+    assert response.status_code == status.HTTP_200_OK
+    application.refresh_from_db()
+    assert (application.status, application.version) == ("approved", 2)
+    assert application.updated_at > created
+    assert response.data["updated_at"] == application.updated_at
+
+    # A decision made on a stale version loses.
+    response = api_client.patch(
+        url, {"status": "rejected", "version": 1}, format="json"
+    )
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert response.data == {
+        "Error": f"Application {application.id} is at version 2, not 1."
+    }
+    application.refresh_from_db()
+    assert application.status == "approved"
+
+    # Repeating the current decision changes nothing.
+    response = api_client.patch(url, {"status": "approved"}, format="json")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["version"] == 2
+    assert OutboxEvent.objects.count() == 1
+
+    # Nothing returns to submitted.
+    with pytest.raises(StatusConflict, match="cannot move from approved"):
+        application.update_status(Application.Status.SUBMITTED)
+    stats = JobApplicationStats.objects.get(job=application.job)
+    assert (stats.submitted_applications, stats.approved_applications) == (0, 1)
+
+    response = api_client.patch(
+        url, {"status": "rejected", "version": "x"}, format="json"
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "version" in response.data
+
+    url = reverse("application-approval", kwargs={"pk": 0})
+    response = api_client.patch(url, {"status": "approved"}, format="json")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
 def test_application_note_create_view(
     api_client, user, no_permission_user, application
 ):
@@ -171,6 +626,64 @@ def test_application_note_create_view(
     assert len(response.data) == 1
 
 
+def test_application_note_list_view(
+    api_client, user, no_permission_user, application, settings
+):
+    settings.ATS_INLINE_NOTES = 3
+    other = Application.objects.create(
+        applicant=application.applicant,
+        job=Job.objects.create(title="Other Job", description="", location="NYC"),
+    )
+    notes = [
+        ApplicationNote.objects.create(
+            created_by=user, application=application, note=f"Note {i}"
+        )
+        for i in range(7)
+    ]
+    ApplicationNote.objects.create(created_by=user, application=other, note="Other")
+    api_client.force_authenticate(user=user)
+    url = reverse("applicationnote-create", kwargs={"pk": application.id})
+
+    # permissions (2) + application exists (1) + page (1)
+    with assert_max_queries(4):
+        response = api_client.get(url, {"page_size": 4})
+    assert response.status_code == status.HTTP_200_OK
+    newest = response.data["results"][0]
+    assert set(newest) == {"id", "created_by", "note", "created_at", "updated_at"}
+    assert (newest["id"], newest["created_by"]) == (notes[-1].id, user.id)
+    assert [row["note"] for row in response.data["results"]] == [
+        "Note 6",
+        "Note 5",
+        "Note 4",
+        "Note 3",
+    ]
+    response = api_client.get(response.data["next"])
+    assert [row["note"] for row in response.data["results"]] == [
+        "Note 2",
+        "Note 1",
+        "Note 0",
+    ]
+    assert response.data["next"] is None
+
+    # The application inlines only its latest notes, with the total count.
+    response = api_client.get(reverse("application-create-list"))
+    rows = {row["id"]: row for row in response.data["results"]}
+    assert rows[application.id]["application_notes"] == [
+        {"note": "Note 6"},
+        {"note": "Note 5"},
+        {"note": "Note 4"},
+    ]
+    assert rows[application.id]["application_notes_count"] == 7
+    assert rows[other.id]["application_notes"] == [{"note": "Other"}]
+    assert rows[other.id]["application_notes_count"] == 1
+
+    url = reverse("applicationnote-create", kwargs={"pk": other.id + 1})
+    assert api_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+    api_client.force_authenticate(user=no_permission_user)
+    assert api_client.get(url).status_code == status.HTTP_403_FORBIDDEN
+
+
 def test_application_stats(api_client, user, application):
     api_client.force_authenticate(user=user)
 
@@ -191,7 +704,7 @@ def test_application_stats(api_client, user, application):
         approval_url, {"status": Application.Status.APPROVED}, format="json"
     )
     assert response.status_code == status.HTTP_200_OK
-    assert response.data == {"Success": "Application status updated successfully."}
+    assert response.data["Success"] == "Application status updated successfully."
 
     # Test Stat
     response = api_client.get(stats_url)
@@ -207,7 +720,7 @@ def test_application_stats(api_client, user, application):
         approval_url, {"status": Application.Status.REJECTED}, format="json"
     )
     assert response.status_code == status.HTTP_200_OK
-    assert response.data == {"Success": "Application status updated successfully."}
+    assert response.data["Success"] == "Application status updated successfully."
 
     # Test Stat
     response = api_client.get(stats_url)
@@ -217,3 +730,294 @@ def test_application_stats(api_client, user, application):
     assert response.data[0]["total_applications"] == 1
     assert response.data[0]["approved_applications"] == 0
     assert response.data[0]["rejected_applications"] == 1
+
+
+def test_application_stats_without_jobs(api_client, user):
+    api_client.force_authenticate(user=user)
+
+    response = api_client.get(reverse("application-stats"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == []
+
+
+def test_application_stats_is_a_single_query(api_client, user, applicant, job):
+    other_job = Job.objects.create(title="Other Job", description="", location="NYC")
+    Application.objects.create(applicant=applicant, job=job)
+    api_client.force_authenticate(user=user)
+
+    with assert_max_queries(1):
+        response = api_client.get(reverse("application-stats"))
+
+    assert [row["id"] for row in response.data] == [job.id, other_job.id]
+    assert response.data[0]["total_applications"] == 1
+    assert response.data[0]["submitted_applications"] == 1
+    assert response.data[1]["total_applications"] == 0
+
+
+def test_application_stats_series(api_client, user, no_permission_user, applicant, job):
+    other_job = Job.objects.create(title="Other Job", description="", location="NYC")
+    Application.objects.create(applicant=applicant, job=job)
+    second = Application.objects.create(applicant=applicant, job=other_job)
+    second.update_status(Application.Status.APPROVED)
+    third_job = Job.objects.create(title="Third Job", description="", location="NYC")
+    third = Application.objects.create(applicant=applicant, job=third_job)
+    third.update_status(Application.Status.REJECTED)
+    third.update_status(Application.Status.APPROVED)
+
+    api_client.force_authenticate(user=user)
+    url = reverse("application-stats-series")
+    today = localdate()
+
+    def counts(total, submitted=0, approved=0, rejected=0):
+        return {
+            "total_applications": total,
+            "submitted_applications": submitted,
+            "approved_applications": approved,
+            "rejected_applications": rejected,
+        }
+
+    with assert_max_queries(3):  # permissions (2) + rollups
+        response = api_client.get(url, {"start": today, "end": today})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "interval": "day",
+        "start": today.isoformat(),
+        "end": today.isoformat(),
+        "job": None,
+        "series": [{"period": today.isoformat(), **counts(3, 1, 2)}],
+    }
+
+    response = api_client.get(url, {"job": job.id})
+    series = response.json()["series"]
+    assert len(series) == 30
+    assert series[-1] == {"period": today.isoformat(), **counts(1, 1)}
+    assert series[0] == {
+        "period": (today - timedelta(days=29)).isoformat(),
+        **counts(0),
+    }
+
+    # Weeks run Monday to Sunday.
+    monday = today - timedelta(days=today.weekday())
+    response = api_client.get(
+        url, {"interval": "week", "start": today - timedelta(days=7), "end": today}
+    )
+    assert response.data["start"] == monday - timedelta(days=7)
+    assert response.data["end"] == monday + timedelta(days=6)
+    assert [row["period"] for row in response.json()["series"]] == [
+        (monday - timedelta(days=7)).isoformat(),
+        monday.isoformat(),
+    ]
+    assert response.data["series"][1]["total_applications"] == 3
+
+    response = api_client.get(url, {"start": today, "end": today - timedelta(1)})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert set(response.data) == {"start"}
+    response = api_client.get(url, {"start": "2020-01-01", "end": "2021-12-31"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = api_client.get(url, {"interval": "month"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = api_client.get(url, {"job": 999999})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    # Test with user without permission
+    api_client.force_authenticate(user=no_permission_user)
+    response = api_client.get(url)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_application_stats_cache(api_client, user, application):
+    api_client.force_authenticate(user=user)
+    stats_url = reverse("application-stats")
+
+    response = api_client.get(stats_url)
+    assert response["X-Cache"] == "MISS"
+
+    with assert_max_queries(0):
+        response = api_client.get(stats_url)
+    assert response["X-Cache"] == "HIT"
+    assert response.data[0]["total_applications"] == 1
+
+    # A status change bumps the stats version, so the next read recomputes.
+    application.update_status(Application.Status.APPROVED)
+    response = api_client.get(stats_url)
+    assert response["X-Cache"] == "MISS"
+    assert response.data[0]["approved_applications"] == 1
+
+    response = api_client.get(reverse("application-stats-cache"))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {"hits": 1, "misses": 2, "hit_rate": 1 / 3}
+
+    # A cached read is counted in memory and writes nothing to the cache.
+    cache = get_stats_cache()
+    with mock.patch.object(cache, "incr") as incr, mock.patch.object(
+        cache, "add"
+    ) as add, mock.patch.object(cache, "set") as set_:
+        response = api_client.get(stats_url)
+    assert response["X-Cache"] == "HIT"
+    assert not incr.called and not add.called and not set_.called
+    response = api_client.get(reverse("application-stats-cache"))
+    assert response.data == {"hits": 2, "misses": 2, "hit_rate": 0.5}
+
+
+def test_application_bulk_create_view(
+    api_client, user, no_permission_user, applicant, application, job
+):
+    other_applicant = Applicant.objects.create(
+        user=no_permission_user,
+        phone_number="9172820313",
+        linkedin_url="https://www.linkedin.com/in/other/",
+    )
+    open_job = Job.objects.create(title="Open Job", description="", location="NYC")
+    closed_job = Job.objects.create(
+        title="Closed Job", description="", location="NYC", status=Job.Status.CLOSED
+    )
+    api_client.force_authenticate(user=user)
+    url = reverse("application-bulk-create")
+
+    data = {
+        "applications": [
+            {"applicant": applicant.id, "job": open_job.id},
+            {"applicant": other_applicant.id, "job": job.id},
+            {"applicant": applicant.id, "job": job.id},  # already applied
+            {"applicant": applicant.id, "job": closed_job.id},
+            {"applicant": applicant.id, "job": open_job.id},  # repeated in batch
+            {"applicant": applicant.id, "job": 999999},
+            {"applicant": "abc", "job": job.id},
+        ]
+    }
+    # permission (2) + applicants + jobs + existing pairs + insert + counters
+    # + daily rollups
+    with assert_max_queries(12):
+        response = api_client.post(url, data=data, format="json")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert [row["index"] for row in response.data["created"]] == [0, 1]
+    assert response.data["created"][0]["job"] == open_job.id
+    assert response.data["created"][1]["applicant"] == other_applicant.id
+    errors = {row["index"]: row["errors"] for row in response.data["errors"]}
+    assert set(errors) == {2, 3, 4, 5, 6}
+    assert "non_field_errors" in errors[2]
+    assert errors[3] == {"job": ["The job is closed. Cannot create an application."]}
+    assert "non_field_errors" in errors[4]
+    assert "job" in errors[5]
+    assert "applicant" in errors[6]
+
+    assert Application.objects.count() == 3
+    stats = JobApplicationStats.objects.get(job=job)
+    assert stats.total_applications == 2
+    assert stats.submitted_applications == 2
+
+    response = api_client.post(url, data={"applications": []}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    # Test with user without permission
+    api_client.force_authenticate(user=no_permission_user)
+    response = api_client.post(url, data=data, format="json")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_application_bulk_approval_view(
+    api_client, user, no_permission_user, applicant, job
+):
+    jobs = [job] + [
+        Job.objects.create(title=f"Job {i}", description="", location="NYC")
+        for i in range(3)
+    ]
+    applications = [
+        Application.objects.create(applicant=applicant, job=job) for job in jobs
+    ]
+    applications[3].update_status(Application.Status.REJECTED)
+    api_client.force_authenticate(user=user)
+    url = reverse("application-bulk-approval")
+
+    ids = [a.id for a in applications[1:]] + [999999, "abc", -1]
+    # permission (2) + savepoint (2) + conditional update (a SELECT first on
+    # SQLite) + counters (2) + daily rollups (2) + outbox + the ids left
+    # unchanged or missing
+    with assert_max_queries(12):
+        response = api_client.patch(
+            url, {"ids": ids, "status": Application.Status.REJECTED}, format="json"
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {
+        "updated": [a.id for a in applications[1:]],
+        "missing": [999999],
+        "invalid": ["abc", -1],
+    }
+    statuses = dict(Application.objects.values_list("id", "status"))
+    assert statuses[applications[0].id] == Application.Status.SUBMITTED
+    assert all(statuses[a.id] == "rejected" for a in applications[1:])
+    assert JobApplicationStats.objects.get(job=jobs[1]).rejected_applications == 1
+    assert JobApplicationStats.objects.get(job=jobs[1]).submitted_applications == 0
+    assert JobApplicationStats.objects.get(job=jobs[3]).rejected_applications == 1
+
+    # Same validation as the single-row endpoint
+    response = api_client.patch(
+        url, {"ids": [applications[0].id], "status": "submitted"}, format="json"
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data == {"Error": "Invalid status provided."}
+
+    # Test with user without permission
+    api_client.force_authenticate(user=no_permission_user)
+    response = api_client.patch(url, {"ids": ids, "status": "approved"}, format="json")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_application_note_bulk_create_view(
+    api_client, user, no_permission_user, application
+):
+    api_client.force_authenticate(user=user)
+    url = reverse("applicationnote-bulk-create")
+
+    data = {
+        "notes": [
+            {"application": application.id, "note": "Phone screen went well"},
+            {"application": application.id, "note": "Onsite scheduled"},
+            {"application": 999999, "note": "Orphaned note"},
+            {"application": application.id, "note": "  "},
+            {"application": application.id},
+        ]
+    }
+    # permission (2) + applications lookup + savepoint (2) + insert + outbox
+    with assert_max_queries(7):
+        response = api_client.post(url, data=data, format="json")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert [row["index"] for row in response.data["created"]] == [0, 1]
+    errors = {row["index"]: row["errors"] for row in response.data["errors"]}
+    assert set(errors) == {2, 3, 4}
+    assert "application" in errors[2]
+    assert "This field may not be blank" in errors[3]["note"][0]
+    assert "This field is required" in errors[4]["note"][0]
+
+    notes = ApplicationNote.objects.filter(application=application).order_by("id")
+    assert [n.note for n in notes] == ["Phone screen went well", "Onsite scheduled"]
+    assert all(n.created_by_id == user.id for n in notes)
+
+    # A whole sync run goes in one request, inserted in batches.
+    max_notes = ApplicationNoteBulkCreateSerializer.MAX_NOTES
+    data = {
+        "notes": [
+            {"application": application.id, "note": f"Feedback {i}"}
+            for i in range(max_notes)
+        ]
+    }
+    response = api_client.post(url, data=data, format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+    assert len(response.data["created"]) == max_notes
+    assert ApplicationNote.objects.filter(application=application).count() == (
+        max_notes + 2
+    )
+
+    # Beyond that the client is told to split the batch.
+    data["notes"].append({"application": application.id, "note": "One too many"})
+    response = api_client.post(url, data=data, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "split larger syncs" in response.data["notes"][0]
+
+    # Test with user without permission
+    api_client.force_authenticate(user=no_permission_user)
+    response = api_client.post(url, data=data, format="json")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
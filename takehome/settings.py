@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,16 +45,62 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "ats.authentication.CachedTokenAuthentication",
     ],
+    "DEFAULT_PAGINATION_CLASS": "ats.pagination.KeysetCursorPagination",
+    "DEFAULT_RENDERER_CLASSES": [
+        "ats.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "PAGE_SIZE": 50,
 }
 
+# In-process token/permission cache used by CachedTokenAuthentication:
+# entries expire after ATS_AUTH_CACHE_TTL seconds, at most ATS_AUTH_CACHE_SIZE
+# tokens are kept per process.
+ATS_AUTH_CACHE_TTL = 60
+ATS_AUTH_CACHE_SIZE = 10000
+
+# Applications inline only their latest ATS_INLINE_NOTES notes, plus a count;
+# the rest are paged through /api/applications/<pk>/notes/.
+ATS_INLINE_NOTES = 5
+
+# Per-request SQL instrumentation (ats.middleware.QueryInstrumentationMiddleware):
+# adds X-SQL-* response headers, logs requests slower than ATS_SLOW_REQUEST_MS
+# with their ATS_SLOW_REQUEST_STATEMENTS slowest statements, and flags SQL run
+# ATS_SQL_REPEATED_THRESHOLD or more times in one request.
+ATS_SQL_INSTRUMENTATION = False
+ATS_SLOW_REQUEST_MS = 500
+ATS_SLOW_REQUEST_STATEMENTS = 5
+ATS_SQL_REPEATED_THRESHOLD = 3
+
+# Transactional outbox (ats.outbox): status changes and new notes queue an
+# OutboxEvent in the same transaction, and `manage.py process_outbox` delivers
+# them: a POST to ATS_WEBHOOK_URL (when set) and, for decisions, an email to the
+# applicant. Failed deliveries are retried after ATS_OUTBOX_RETRY_SECONDS,
+# doubling up to ATS_OUTBOX_MAX_RETRY_SECONDS, and marked failed after
+# ATS_OUTBOX_MAX_ATTEMPTS attempts. A worker leases its batch for
+# ATS_OUTBOX_LEASE_SECONDS and delivers outside any transaction; events it has
+# not finished by then are claimed again, by it or another worker.
+ATS_WEBHOOK_URL = os.environ.get("ATS_WEBHOOK_URL")
+ATS_WEBHOOK_TIMEOUT = 5
+ATS_OUTBOX_MAX_ATTEMPTS = 8
+ATS_OUTBOX_RETRY_SECONDS = 10
+ATS_OUTBOX_MAX_RETRY_SECONDS = 3600
+ATS_OUTBOX_LEASE_SECONDS = 300
+
+# archive_applications moves the applications and notes of jobs closed at
+# least this many days ago into the archive tables.
+ATS_ARCHIVE_AFTER_DAYS = 90
+
 MIDDLEWARE = [
+    "ats.middleware.QueryInstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "ats.middleware.ReplicaRoutingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -91,9 +138,57 @@ DATABASES = {
         # "HOST": "localhost",
         "HOST": "db",
         "PORT": "5432",
+        # Reuse connections across requests, checking them before reuse.
+        "CONN_MAX_AGE": 60,
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# Optional read replica. The list and stats endpoints read from it (see
+# ats.routers.PrimaryReplicaRouter); tests mirror it onto the default database.
+if os.environ.get("ATS_DB_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": os.environ["ATS_DB_REPLICA_HOST"],
+        "PORT": os.environ.get("ATS_DB_REPLICA_PORT", "5432"),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["ats.routers.PrimaryReplicaRouter"]
+ATS_READ_REPLICA = "replica"
+# After a successful write, the client's reads stay on the primary this long.
+# Pins are kept in the ATS_REPLICA_PIN_CACHE cache alias, which must be shared
+# by every worker (see CACHES below): a pin held in one process's local memory
+# is not seen by the worker serving the client's next read.
+ATS_REPLICA_PIN_SECONDS = 5
+ATS_REPLICA_PIN_CACHE = "default"
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+#
+# Local memory is per process. When running several workers, point the stats
+# and replica pin caches at a shared backend so invalidation and pins reach all
+# of them, e.g.
+#   "django.core.cache.backends.filebased.FileBasedCache" with "LOCATION": "/var/tmp/ats_cache"
+#   "django.core.cache.backends.db.DatabaseCache" with "LOCATION": "ats_cache"
+#   (run `python manage.py createcachetable` first)
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+# Cache alias and TTL (seconds) for /api/applications/stats/ responses. Writes
+# invalidate by bumping a version key; the TTL is only a safety net.
+ATS_STATS_CACHE = "default"
+ATS_STATS_CACHE_TIMEOUT = 60
+# Stats cache hits and misses (/api/applications/stats/cache/) are counted in
+# each worker's memory and added to the cache at most this often (seconds), so
+# stats reads don't write a counter each time.
+ATS_STATS_COUNTER_FLUSH_SECONDS = 10
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -20,4 +20,6 @@ from django.urls import path, include
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("ats.urls")),
+    # Native async views of the hot endpoints, for ASGI deployments.
+    path("api/async/", include("ats.async_urls")),
 ]